@@ -6,6 +6,13 @@
 
 # import of filter models
 from .core import LP, HP, BP, Notch
+from .bank import FilterBank
+from .cascade import Cascade
+from .discrete import Biquad
+from .params import FilterParams
+from .stream import Simulator
+from .cache import ResponseCache
+from .instrument import Recorder
 from .version import version
 
 __version__ = version
@@ -0,0 +1,121 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Asynchronous analyses for asyncio applications.
+
+The coroutines Second_Order_LTI.afreqresp, astep, aimpulse, aoutput and
+apzmap run the analysis in a bounded thread pool (NumPy and SciPy release
+the GIL in their heavy loops) instead of blocking the event loop.
+
+Concurrent requests for the same analysis of identical filters with
+identical arguments are coalesced: the first one starts the computation,
+the others await it. Every caller receives read-only views of the shared
+arrays. Cancelling a caller only cancels the computation when no other
+caller is waiting for it; a computation already running in a thread
+completes in the background.
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .cache import fingerprint
+
+_executor = None
+_owned = False
+# computations in progress: key -> [asyncio future, number of waiters]
+_inflight = {}
+
+
+def configure(max_workers=None, executor=None):
+    """set the executor running the analyses
+
+    Args:
+        max_workers (int, optional): size of the thread pool created when executor is not given. Defaults to ThreadPoolExecutor's default.
+        executor (concurrent.futures.Executor, optional): executor to use. Defaults to None.
+
+    Returns:
+        concurrent.futures.Executor: the executor in use
+    """
+    global _executor, _owned
+    previous, previous_owned = _executor, _owned
+    if executor is None:
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="SecondOrderElec"
+        )
+        _owned = True
+    else:
+        _owned = False
+    _executor = executor
+    # pools created here are shut down when replaced, pools given by the caller are theirs
+    if previous is not None and previous_owned:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def _readonly_views(result):
+    if isinstance(result, tuple):
+        return tuple(_readonly_views(item) for item in result)
+    if isinstance(result, np.ndarray):
+        view = result.view()
+        view.setflags(write=False)
+        return view
+    return result
+
+
+def _fingerprints(kwargs):
+    return tuple(sorted((name, fingerprint(value)) for name, value in kwargs.items()))
+
+
+async def run(filter_instance, analysis, **kwargs):
+    """run filter_instance.<analysis>(plot=False, **kwargs) in the executor
+
+    Args:
+        filter_instance (Second_Order_LTI): filter to analyse
+        analysis (str): "freqresp", "step", "impulse", "output" or "pzmap"
+        **kwargs: arguments of the analysis
+
+    Returns:
+        tuple: result of the analysis, as read-only arrays
+    """
+    loop = asyncio.get_running_loop()
+    # hashing large inputs would block the event loop; the default executor
+    # keeps it from queueing behind the analyses
+    arguments = await loop.run_in_executor(None, _fingerprints, kwargs)
+    key = (
+        id(loop),
+        filter_instance.type,
+        filter_instance._parameter_key(),
+        analysis,
+        arguments,
+    )
+    entry = _inflight.get(key)
+    if entry is None:
+        if _executor is None:
+            configure()
+        call = functools.partial(
+            getattr(filter_instance, analysis), plot=False, **kwargs
+        )
+        entry = _inflight[key] = [loop.run_in_executor(_executor, call), 0]
+
+        def forget(future, entry=entry):
+            if _inflight.get(key) is entry:
+                del _inflight[key]
+
+        entry[0].add_done_callback(forget)
+    entry[1] += 1
+    try:
+        result = await asyncio.shield(entry[0])
+    except asyncio.CancelledError:
+        entry[1] -= 1
+        if entry[1] == 0:
+            # forget runs later: a new caller must not join a cancelled computation
+            if _inflight.get(key) is entry:
+                del _inflight[key]
+            entry[0].cancel()
+        raise
+    entry[1] -= 1
+    return _readonly_views(result)
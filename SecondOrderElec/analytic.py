@@ -0,0 +1,632 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Closed-form evaluation of the LP, HP, BP and Notch transfer functions.
+
+Every function broadcasts the filter parameters (gain, m, w0) against the
+evaluation grid, so a scalar filter, a column of filters or a full grid of
+parameters are all evaluated in one NumPy call.
+"""
+import numpy as np
+
+FILTER_TYPES = ("LP", "HP", "BP", "Notch")
+
+
+def _check_type(filter_type):
+    if filter_type not in FILTER_TYPES:
+        raise ValueError(
+            "unknown filter type {!r}, expected one of {}".format(
+                filter_type, FILTER_TYPES
+            )
+        )
+
+
+def _real_dtype(dtype):
+    return np.finfo(dtype).dtype
+
+
+def _terms(gain, m, w0, w, dtype):
+    """return (gain, x, a, b, d) with x = w/w0, D(jw) = a + jb and d = |D(jw)|^2"""
+    gain = np.asarray(gain, dtype=dtype)
+    m = np.asarray(m, dtype=dtype)
+    x = np.asarray(w, dtype=dtype) / np.asarray(w0, dtype=dtype)
+    a = 1 - x * x
+    b = 2 * m * x
+    d = a * a + b * b
+    return gain, x, a, b, d
+
+
+def freqresp(filter_type, gain, m, w0, w, dtype=np.complex128, out=None):
+    """return the complex frequency response H(jw)
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        w (array_like): angular frequencies (rad/s)
+        dtype (dtype, optional): complex output type. Defaults to np.complex128.
+        out (ndarray, optional): complex array receiving the result. Defaults to None.
+
+    Returns:
+        ndarray: H(jw), broadcast over the parameters and w
+    """
+    _check_type(filter_type)
+    if out is not None:
+        dtype = out.dtype
+    real_dtype = _real_dtype(dtype)
+    gain = np.asarray(gain, dtype=real_dtype)
+    x = np.asarray(w, dtype=real_dtype) / np.asarray(w0, dtype=real_dtype)
+    m = np.asarray(m, dtype=real_dtype)
+    if out is None:
+        out = np.empty(np.broadcast(gain, m, x).shape, dtype=dtype)
+    # out holds D(jw) = 1 - x^2 + 2jmx, then is divided in place by N(jw)
+    out.real = 1 - x * x
+    out.imag = 2 * m * x
+    if filter_type == "LP":
+        num = gain
+    elif filter_type == "HP":
+        num = -gain * x * x
+    elif filter_type == "BP":
+        num = 1j * gain * out.imag
+    else:
+        num = gain * out.real
+    return np.divide(num, out, out=out)
+
+
+def bode(filter_type, gain, m, w0, w, deg=False, dtype=np.float64, out=None):
+    """return magnitude (dB) and unwrapped phase of H(jw)
+
+    The phase is evaluated as arg(N(jw)) - arg(D(jw)), which is continuous
+    over w > 0 (the only jump left is the genuine one of the Notch at w0).
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        w (array_like): angular frequencies (rad/s)
+        deg (bool, optional): return the phase in degrees. Defaults to False.
+        dtype (dtype, optional): float32 or float64 output. Defaults to np.float64.
+        out (tuple(ndarray, ndarray), optional): arrays receiving magnitude and phase. Defaults to None.
+
+    Returns:
+        tuple(ndarray, ndarray): (magnitude in dB, phase)
+    """
+    _check_type(filter_type)
+    if out is not None:
+        dtype = out[0].dtype
+    gain, x, a, b, d = _terms(gain, m, w0, w, _real_dtype(dtype))
+    abs_gain = np.abs(gain)
+    if filter_type == "LP":
+        num_mag, num_arg = abs_gain, np.angle(gain)
+    elif filter_type == "HP":
+        num_mag, num_arg = abs_gain * x * x, np.angle(-gain)
+    elif filter_type == "BP":
+        num_mag, num_arg = abs_gain * np.abs(b), np.angle(1j * gain * np.sign(b))
+    else:
+        num_mag, num_arg = abs_gain * np.abs(a), np.angle(gain * np.sign(a))
+    with np.errstate(divide="ignore"):
+        mag = 20 * np.log10(num_mag) - 10 * np.log10(d)
+    phase = num_arg - np.arctan2(b, a)
+    if deg:
+        phase = np.rad2deg(phase)
+    if out is None:
+        shape = np.broadcast(mag, phase).shape
+        out = (np.empty(shape, dtype=dtype), np.empty(shape, dtype=dtype))
+    out[0][...] = mag
+    out[1][...] = phase
+    return out
+
+
+def magnitude_db(filter_type, gain, m, w0, w, dtype=np.float64):
+    """return the magnitude (dB) of H(jw), without the phase computed by bode
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        w (array_like): angular frequencies (rad/s)
+        dtype (dtype, optional): float32 or float64 output. Defaults to np.float64.
+
+    Returns:
+        ndarray: 20 log10 |H(jw)|
+    """
+    _check_type(filter_type)
+    gain, x, a, b, d = _terms(gain, m, w0, w, dtype)
+    # out holds |N(jw)|^2, then is turned in place into the magnitude
+    out = np.empty(np.broadcast_shapes(gain.shape, d.shape), dtype=dtype)
+    if filter_type == "LP":
+        out[...] = gain * gain
+    else:
+        if filter_type == "HP":
+            np.multiply(x, x, out=out)
+            out *= out
+        elif filter_type == "BP":
+            np.multiply(b, b, out=out)
+        else:
+            np.multiply(a, a, out=out)
+        out *= gain * gain
+    out /= d
+    with np.errstate(divide="ignore"):
+        np.log10(out, out=out)
+    out *= 10
+    return out
+
+
+def poles(m, w0):
+    """return the poles -m w0 +/- w0 sqrt(m^2 - 1) of second order filters
+
+    For real poles, the one closest to 0 is computed from the product of
+    the poles (w0^2), which avoids the cancellation of the direct formula
+    when m is large.
+
+    Args:
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+
+    Returns:
+        ndarray: complex poles, shape broadcast(m, w0).shape + (2,)
+    """
+    m, w0 = np.broadcast_arrays(np.asarray(m, dtype=float), np.asarray(w0, dtype=float))
+    root = np.sqrt(m * m - 1 + 0j)
+    out = np.empty(m.shape + (2,), dtype=complex)
+    out[..., 0] = w0 * (-m + root)
+    out[..., 1] = w0 * (-m - root)
+    real = np.abs(m) >= 1
+    if real.any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            far = -w0 * (m + np.copysign(root.real, m))
+            near = w0 * w0 / far
+        out[..., 0] = np.where(real & (m > 0), near, out[..., 0])
+        out[..., 1] = np.where(real & (m < 0), near, out[..., 1])
+    return out
+
+
+def zeros(filter_type, w0):
+    """return the zeros of LP, HP, BP or Notch filters
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        w0 (array_like): natural frequency (rad/s)
+
+    Returns:
+        ndarray: complex zeros, shape w0.shape + (0,) for LP, (2,) for HP, (1,) for BP and (2,) for Notch
+    """
+    _check_type(filter_type)
+    w0 = np.asarray(w0, dtype=float)
+    count = {"LP": 0, "HP": 2, "BP": 1, "Notch": 2}[filter_type]
+    out = np.zeros(w0.shape + (count,), dtype=complex)
+    if filter_type == "Notch":
+        out[..., 0] = 1j * w0
+        out[..., 1] = -1j * w0
+    return out
+
+
+def _key_frequencies(filter_type, m, w0):
+    """return the frequencies where the response of a filter changes quickly"""
+    root = np.sqrt(1 + m * m)
+    # natural frequency and the two -3 dB edges of the resonance (wc of BP and Notch)
+    key = [w0, w0 * (root - m), w0 * (root + m)]
+    if filter_type in ("LP", "HP") and 2 * m * m < 1:
+        wr = w0 * np.sqrt(1 - 2 * m * m)
+        key.append(wr if filter_type == "LP" else w0 * w0 / wr)
+    return np.abs(key)
+
+
+def adaptive_grid(
+    filter_type,
+    gain,
+    m,
+    w0,
+    wmin=None,
+    wmax=None,
+    tol_db=0.1,
+    tol_deg=1.0,
+    max_points=10000,
+):
+    """return a non-uniform frequency grid refined where the Bode plot bends
+
+    The grid starts from a coarse log grid plus the key frequencies of the
+    filter (w0, resonance, band edges). Every interval whose midpoint differs
+    from the interpolation of its ends (in log w) by more than tol_db or
+    tol_deg is split, until the tolerances are met or max_points is reached.
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (float): amplification (T0, Too, Tm or T0)
+        m (float): damping coefficient
+        w0 (float): natural frequency (rad/s)
+        wmin (float, optional): lowest frequency (rad/s). Defaults to w0 / 100.
+        wmax (float, optional): highest frequency (rad/s). Defaults to 100 * w0.
+        tol_db (float, optional): magnitude tolerance (dB). Defaults to 0.1.
+        tol_deg (float, optional): phase tolerance (degrees). Defaults to 1.0.
+        max_points (int, optional): maximum size of the grid. Defaults to 10000.
+
+    Returns:
+        ndarray: increasing angular frequencies (rad/s)
+    """
+    _check_type(filter_type)
+    wmin = w0 / 100 if wmin is None else wmin
+    wmax = w0 * 100 if wmax is None else wmax
+    lmin, lmax = np.log10(wmin), np.log10(wmax)
+    key = np.log10(_key_frequencies(filter_type, m, w0))
+    lw = np.unique(
+        np.hstack((np.linspace(lmin, lmax, 4 * int(np.ceil(lmax - lmin)) + 1), key))
+    )
+    # intervals narrower than min_step are never split (jumps of the Notch at w0)
+    min_step = 1e-9 * max(1.0, lmax - lmin)
+    lw = lw[(lw >= lmin) & (lw <= lmax)]
+    lw = lw[np.hstack(([True], np.diff(lw) > min_step))]
+
+    def evaluate(lw):
+        mag, phase = bode(filter_type, gain, m, w0, 10 ** lw, deg=True)
+        # the Notch magnitude is -inf at w0
+        return np.maximum(mag, -300), phase
+
+    mag, phase = evaluate(lw)
+    while len(lw) < max_points:
+        mid = (lw[:-1] + lw[1:]) / 2
+        mag_mid, phase_mid = evaluate(mid)
+        error = np.maximum(
+            np.abs(mag_mid - (mag[:-1] + mag[1:]) / 2) / tol_db,
+            np.abs(phase_mid - (phase[:-1] + phase[1:]) / 2) / tol_deg,
+        )
+        error[np.diff(lw) < min_step] = 0
+        split = np.flatnonzero(error > 1)
+        if len(split) == 0:
+            break
+        if len(lw) + len(split) > max_points:
+            # spend the remaining budget on the worst intervals
+            worst = np.argsort(error[split])[::-1]
+            split = np.sort(split[worst[: max_points - len(lw)]])
+        lw = np.insert(lw, split + 1, mid[split])
+        mag = np.insert(mag, split + 1, mag_mid[split])
+        phase = np.insert(phase, split + 1, phase_mid[split])
+    return 10 ** lw
+
+
+def _time_basis(m, w0, t, phi, c):
+    """fill phi and c for the rows of flattened (m, w0) and return sigma = m*w0
+
+    With P(s) = 1 / (s^2 + 2 sigma s + w0^2), phi is the impulse response of
+    P and c = phi' + sigma phi. Both are evaluated with the formula matching
+    the damping regime of each row (m < 1, m == 1, m > 1) and written into
+    the preallocated arrays phi and c of shape (len(m), len(t)).
+    """
+    m = m.reshape(-1, 1)
+    w0 = w0.reshape(-1, 1)
+    sigma = m * w0
+    k = w0 * w0 * (1 - m * m)
+
+    under = k[:, 0] > 0
+    if under.any():
+        rows = slice(None) if under.all() else under
+        wd = np.sqrt(k[rows])
+        decay = np.exp(-sigma[rows] * t)
+        arg = wd * t
+        phi[rows] = decay * np.sin(arg) / wd
+        c[rows] = decay * np.cos(arg)
+
+    over = k[:, 0] < 0
+    if over.any():
+        # slow pole -s1 and fast pole -(s1 + 2r), written so that neither
+        # the cancellation of sigma - r nor exp overflow can occur
+        rows = slice(None) if over.all() else over
+        r = np.sqrt(-k[rows])
+        sigma_over = sigma[rows]
+        w0_over = w0[rows]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            s1 = np.where(
+                sigma_over > 0,
+                w0_over * w0_over / (sigma_over + r),
+                sigma_over - r,
+            )
+        slow = np.exp(-s1 * t)
+        em = np.expm1(-2 * r * t)
+        phi[rows] = -slow * em / (2 * r)
+        c[rows] = slow * (1 + em / 2)
+
+    critical = ~(under | over)
+    if critical.any():
+        decay = np.exp(-sigma[critical] * t)
+        phi[critical] = t * decay
+        c[critical] = decay
+    return sigma
+
+
+def _time_response(response, filter_type, gain, m, w0, t, out):
+    _check_type(filter_type)
+    gain, m, w0 = np.broadcast_arrays(
+        np.asarray(gain, dtype=float),
+        np.asarray(m, dtype=float),
+        np.asarray(w0, dtype=float),
+    )
+    t = np.asarray(t, dtype=float)
+    if t.ndim != 1:
+        raise ValueError("t must be a 1-D array")
+    shape = gain.shape + t.shape
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape or not out.flags.c_contiguous:
+        raise ValueError("out must be a C-contiguous array of shape {}".format(shape))
+
+    # the response is built in place in out, seeded with phi
+    phi = out.reshape(gain.size, t.size)
+    c = np.empty_like(phi)
+    sigma = _time_basis(m.ravel(), w0.ravel(), t, phi, c)
+    gain = gain.reshape(-1, 1)
+    w0 = w0.reshape(-1, 1)
+    if response == "impulse":
+        if filter_type == "LP":
+            phi *= gain * w0 * w0
+        elif filter_type == "HP":
+            phi *= -gain * (w0 * w0 - 2 * sigma * sigma)
+            c *= 2 * sigma * gain
+            phi -= c
+        else:
+            phi *= -sigma
+            phi += c
+            phi *= 2 * sigma * gain if filter_type == "BP" else -2 * sigma * gain
+    else:
+        if filter_type == "LP":
+            phi *= -sigma
+            phi -= c
+            phi += 1
+            phi *= gain
+        elif filter_type == "HP":
+            phi *= -sigma
+            phi += c
+            phi *= gain
+        elif filter_type == "BP":
+            phi *= 2 * sigma * gain
+        else:
+            phi *= -2 * sigma
+            phi += 1
+            phi *= gain
+    phi[:, t < 0] = 0
+    return out
+
+
+def impulse(filter_type, gain, m, w0, t, out=None):
+    """return the impulse response (the Dirac part of HP and Notch is dropped, as scipy does)
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        t (array_like): 1-D array of time points (s), the response is 0 for t < 0
+        out (ndarray, optional): C-contiguous float array receiving the result. Defaults to None.
+
+    Returns:
+        ndarray: impulse response of shape broadcast(gain, m, w0).shape + t.shape
+    """
+    return _time_response("impulse", filter_type, gain, m, w0, t, out)
+
+
+def step(filter_type, gain, m, w0, t, out=None):
+    """return the step response
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        t (array_like): 1-D array of time points (s), the response is 0 for t < 0
+        out (ndarray, optional): C-contiguous float array receiving the result. Defaults to None.
+
+    Returns:
+        ndarray: step response of shape broadcast(gain, m, w0).shape + t.shape
+    """
+    return _time_response("step", filter_type, gain, m, w0, t, out)
+
+
+def settling_time(filter_type, gain, m, w0, t, tol=0.02):
+    """return the time after which the step response stays within tol of its final value
+
+    The final value is the gain for LP and Notch filters and 0 for HP and BP
+    filters (the band is then tol times the peak of the response). The result
+    is resolved to the spacing of t and is NaN when the response has not
+    settled before t[-1].
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like): amplification (T0, Too, Tm or T0)
+        m (array_like): damping coefficient
+        w0 (array_like): natural frequency (rad/s)
+        t (array_like): 1-D array of increasing time points (s)
+        tol (float, optional): relative width of the settling band. Defaults to 0.02.
+
+    Returns:
+        ndarray: settling time of shape broadcast(gain, m, w0).shape
+    """
+    t = np.asarray(t, dtype=float)
+    s = step(filter_type, gain, m, w0, t)
+    if filter_type in ("LP", "Notch"):
+        final = np.broadcast_to(np.asarray(gain, dtype=float), s.shape[:-1])
+    else:
+        final = np.zeros(s.shape[:-1])
+    return _settling_time(s, final, t, tol)
+
+
+def _settling_time(s, final, t, tol):
+    """return the settling time of step responses s (modified in place) with final values 'final'
+
+    The band is tol times the final value, or tol times the peak of the
+    response when the final value is 0.
+    """
+    band = np.where(final != 0, tol * np.abs(final), tol * np.max(np.abs(s), axis=-1))
+    s -= final[..., np.newaxis]
+    outside = np.abs(s) > band[..., np.newaxis]
+    # index of the first sample after the last one outside of the band
+    first_inside = np.asarray(t.size - np.argmax(outside[..., ::-1], axis=-1))
+    first_inside[~outside.any(axis=-1)] = 0
+    settled = first_inside < t.size
+    ts = np.full(first_inside.shape, np.nan)
+    ts[settled] = t[first_inside[settled]]
+    return ts[()]
+
+
+def normalize(num, den):
+    """normalise second order transfer functions so that den[..., -1] = 1
+
+    Args:
+        num (array_like): numerator coefficients along the last axis, highest power first (at most 3)
+        den (array_like): denominator coefficients (a2, a1, a0) along the last axis
+
+    Returns:
+        tuple: (num, den, m, w0) with num and den of shape (..., 3); m and w0 are NaN when a2 / a0 <= 0 (real poles of opposite signs)
+    """
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    if num.ndim == 0:
+        num = num[np.newaxis]
+    if den.shape[-1:] != (3,) or num.shape[-1] > 3:
+        raise ValueError(
+            "a second order system has 3 denominator and at most 3 numerator coefficients"
+        )
+    if np.any(den[..., 0] == 0) or np.any(den[..., -1] == 0):
+        raise ValueError("a2 and a0 must be non-zero")
+    padding = [(0, 0)] * (num.ndim - 1) + [(3 - num.shape[-1], 0)]
+    num = np.pad(num, padding)
+    a0 = den[..., -1:]
+    num, den = np.broadcast_arrays(num / a0, den / a0)
+    m, w0 = _damping(den)
+    return num, den, m, w0
+
+
+def _damping(den):
+    """return (m, w0) of normalised denominators (NaN when a2 <= 0)"""
+    with np.errstate(invalid="ignore"):
+        w0 = 1 / np.sqrt(np.where(den[..., 0] > 0, den[..., 0], np.nan))
+    m = den[..., 1] * w0 / 2
+    return m[()], w0[()]
+
+
+def _coefficients(num, den, normalized):
+    """return (num, den, m, w0), normalising the coefficients unless they already are"""
+    if not normalized:
+        return normalize(num, den)
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    return (num, den) + _damping(den)
+
+
+def general_freqresp(num, den, w, normalized=False):
+    """return H(jw) of arbitrary second order transfer functions
+
+    Args:
+        num (array_like): numerator coefficients along the last axis, highest power first (at most 3)
+        den (array_like): denominator coefficients (a2, a1, a0) along the last axis
+        w (array_like): 1-D array of angular frequencies (rad/s)
+        normalized (bool, optional): num and den are already normalised (as returned by normalize), which skips the normalisation. Defaults to False.
+
+    Returns:
+        ndarray: H(jw) of shape broadcast(num, den).shape[:-1] + w.shape
+    """
+    num, den, _, _ = _coefficients(num, den, normalized)
+    s = 1j * np.asarray(w, dtype=float)
+    b = num[..., np.newaxis, :]
+    a = den[..., np.newaxis, :]
+    return ((b[..., 0] * s + b[..., 1]) * s + b[..., 2]) / (
+        (a[..., 0] * s + a[..., 1]) * s + 1
+    )
+
+
+def _general_time_response(response, num, den, t, out, normalized):
+    num, den, m, w0 = _coefficients(num, den, normalized)
+    if np.any(np.isnan(w0)):
+        raise ValueError("closed forms need a2 / a0 > 0 (complex or same-sign poles)")
+    t = np.asarray(t, dtype=float)
+    if t.ndim != 1:
+        raise ValueError("t must be a 1-D array")
+    shape = num.shape[:-1] + t.shape
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape or not out.flags.c_contiguous:
+        raise ValueError("out must be a C-contiguous array of shape {}".format(shape))
+
+    # H = (B2 s^2 + B1 s + B0) P with P = 1 / (s^2 + 2 sigma s + w0^2), and
+    # s^2 P = 1 - 2 sigma s P - w0^2 P, so that (dropping the Dirac part)
+    # h = (B0 - B2 w0^2) phi + (B1 - 2 sigma B2) phi'
+    phi = out.reshape(-1, t.size)
+    c = np.empty_like(phi)
+    m, w0 = np.ravel(m), np.ravel(w0)
+    sigma = _time_basis(m, w0, t, phi, c)
+    w0 = w0.reshape(-1, 1)
+    B = num.reshape(-1, 3) * (w0 * w0)
+    k_phi = B[:, 2:] - B[:, :1] * w0 * w0
+    k_dphi = B[:, 1:2] - 2 * sigma * B[:, :1]
+    if response == "impulse":
+        # phi' = c - sigma phi
+        phi *= k_phi - k_dphi * sigma
+        c *= k_dphi
+        phi += c
+    else:
+        # integral of phi = (1 - sigma phi - c) / w0^2, integral of phi' = phi
+        k_int = k_phi / (w0 * w0)
+        c *= -k_int
+        phi *= k_dphi - k_int * sigma
+        phi += c
+        phi += k_int + B[:, :1]
+    phi[:, t < 0] = 0
+    return out
+
+
+def general_impulse(num, den, t, out=None, normalized=False):
+    """return the impulse response of second order transfer functions (the Dirac part is dropped, as scipy does)
+
+    Args:
+        num (array_like): numerator coefficients along the last axis, highest power first (at most 3)
+        den (array_like): denominator coefficients (a2, a1, a0) along the last axis, with a2 / a0 > 0
+        t (array_like): 1-D array of time points (s), the response is 0 for t < 0
+        out (ndarray, optional): C-contiguous float array receiving the result. Defaults to None.
+        normalized (bool, optional): num and den are already normalised (as returned by normalize), which skips the normalisation. Defaults to False.
+
+    Returns:
+        ndarray: impulse response of shape broadcast(num, den).shape[:-1] + t.shape
+    """
+    return _general_time_response("impulse", num, den, t, out, normalized)
+
+
+def general_step(num, den, t, out=None, normalized=False):
+    """return the step response of second order transfer functions
+
+    Args:
+        num (array_like): numerator coefficients along the last axis, highest power first (at most 3)
+        den (array_like): denominator coefficients (a2, a1, a0) along the last axis, with a2 / a0 > 0
+        t (array_like): 1-D array of time points (s), the response is 0 for t < 0
+        out (ndarray, optional): C-contiguous float array receiving the result. Defaults to None.
+        normalized (bool, optional): num and den are already normalised (as returned by normalize), which skips the normalisation. Defaults to False.
+
+    Returns:
+        ndarray: step response of shape broadcast(num, den).shape[:-1] + t.shape
+    """
+    return _general_time_response("step", num, den, t, out, normalized)
+
+
+def general_settling_time(num, den, t, tol=0.02, normalized=False):
+    """return the time after which the step response of second order transfer functions stays within tol of its final value
+
+    The final value is the static gain num[-1] / den[-1] (the band is tol
+    times the peak of the response when it is 0), as in settling_time.
+
+    Args:
+        num (array_like): numerator coefficients along the last axis, highest power first (at most 3)
+        den (array_like): denominator coefficients (a2, a1, a0) along the last axis, with a2 / a0 > 0
+        t (array_like): 1-D array of increasing time points (s)
+        tol (float, optional): relative width of the settling band. Defaults to 0.02.
+        normalized (bool, optional): num and den are already normalised (as returned by normalize), which skips the normalisation. Defaults to False.
+
+    Returns:
+        ndarray: settling time of shape broadcast(num, den).shape[:-1]
+    """
+    num, den, m, w0 = _coefficients(num, den, normalized)
+    t = np.asarray(t, dtype=float)
+    s = general_step(num, den, t, normalized=True)
+    final = np.broadcast_to(num[..., -1], s.shape[:-1])
+    return _settling_time(s, final, t, tol)
@@ -0,0 +1,268 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+import numpy as np
+from . import analytic, metrics
+from .core import LP, HP, BP, Notch
+from .plot import plot_pzmap
+
+FILTER_CLASSES = {"LP": LP, "HP": HP, "BP": BP, "Notch": Notch}
+
+
+def _column(values):
+    """return 'values' as a 1-D array: a view of 1-D inputs, a contiguous copy of broadcast ones"""
+    if values.ndim == 1 and (len(values) < 2 or values.strides[0] != 0):
+        return values
+    return np.ascontiguousarray(values).ravel()
+
+
+class FilterBank:
+    """
+    Batch of second order filters of the same type
+
+    The parameters are stored as 1-D arrays (views of the arguments when
+    they already are 1-D float arrays, for instance the fields of a
+    structured array) and every analysis is computed for the whole batch
+    at once. Results have one row per filter.
+    Metrics that are undefined for a filter (for instance wp when m >= 1)
+    are NaN instead of None.
+    """
+
+    def __init__(self, filter_type, gain, m, w0):
+        """
+        Filter bank constructor
+
+        Args:
+            filter_type (str): one of "LP", "HP", "BP" or "Notch"
+            gain (array_like): amplification of each filter
+            m (array_like): damping coefficient of each filter
+            w0 (array_like): natural frequency of each filter
+        """
+        analytic._check_type(filter_type)
+        gain, m, w0 = np.broadcast_arrays(
+            np.asarray(gain, dtype=float),
+            np.asarray(m, dtype=float),
+            np.asarray(w0, dtype=float),
+        )
+        self.type = filter_type
+        self.gain = _column(gain)
+        self.m = _column(m)
+        self.w0 = _column(w0)
+
+    @classmethod
+    def from_filters(cls, filters):
+        """build a bank from filter instances
+
+        Args:
+            filters (iterable): LP, HP, BP or Notch instances, all of the same type
+
+        Returns:
+            FilterBank: bank holding the parameters of 'filters'
+        """
+        filters = list(filters)
+        types = set(filter_instance.type for filter_instance in filters)
+        if len(types) != 1:
+            raise ValueError(
+                "filters must all be of the same type, got {}".format(types)
+            )
+        return cls(
+            types.pop(),
+            [filter_instance.gain for filter_instance in filters],
+            [filter_instance.m for filter_instance in filters],
+            [filter_instance.w0 for filter_instance in filters],
+        )
+
+    @classmethod
+    def from_records(cls, records):
+        """build a bank viewing the fields of a structured array (see params.DTYPE), without copy
+
+        Args:
+            records (ndarray): structured array with the fields type, gain, m and w0, all rows of the same type
+
+        Returns:
+            FilterBank: bank whose parameter arrays are views of the fields of 'records'
+        """
+        records = np.asarray(records)
+        types = np.unique(records["type"])
+        if len(types) != 1:
+            raise ValueError(
+                "records must all be of the same type, got {}".format(list(types))
+            )
+        return cls(str(types[0]), records["gain"], records["m"], records["w0"])
+
+    def to_records(self):
+        """return the parameters as a structured array of dtype params.DTYPE
+
+        Returns:
+            ndarray: one row (type, gain, m, w0) per filter
+        """
+        from .params import DTYPE
+
+        records = np.empty(len(self), dtype=DTYPE)
+        records["type"] = self.type
+        records["gain"] = self.gain
+        records["m"] = self.m
+        records["w0"] = self.w0
+        return records
+
+    def __len__(self):
+        return len(self.m)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            return FILTER_CLASSES[self.type](
+                float(self.gain[index]), float(self.m[index]), float(self.w0[index])
+            )
+        return FilterBank(self.type, self.gain[index], self.m[index], self.w0[index])
+
+    def __repr__(self):
+        return "FilterBank({!r}, {} filters)".format(self.type, len(self))
+
+    def _require(self, *filter_types):
+        if self.type not in filter_types:
+            raise AttributeError(
+                "not defined for {} filters (only {})".format(self.type, filter_types)
+            )
+
+    def _default_times(self, N):
+        # 7 time constants of the slowest pole of the bank, as scipy does
+        m = self.m
+        rate = np.where(m < 1, m * self.w0, self.w0 / (m + np.sqrt(np.abs(m * m - 1))))
+        rate = rate[rate > 0]
+        tmax = 7 / rate.min() if len(rate) else 7 / self.w0.min()
+        return np.linspace(0, tmax, N)
+
+    @property
+    def R(self):
+        return metrics.R(self.m)
+
+    @property
+    def wp(self):
+        return metrics.wp(self.m, self.w0)
+
+    @property
+    def Tp(self):
+        return metrics.Tp(self.m, self.w0)
+
+    @property
+    def Q(self):
+        return metrics.Q(self.m)
+
+    @property
+    def wr(self):
+        self._require("LP", "HP")
+        return metrics.wr(self.type, self.m, self.w0)
+
+    @property
+    def MdB(self):
+        self._require("LP", "HP")
+        return metrics.MdB(self.m)
+
+    @property
+    def wc(self):
+        """Pass band (BP) or rejected band (Notch)
+
+        Returns:
+            ndarray: array of shape (N, 2) with the start and stop frequencies
+        """
+        self._require("BP", "Notch")
+        return metrics.wc(self.m, self.w0)
+
+    @property
+    def delta_w(self):
+        self._require("BP", "Notch")
+        return metrics.delta_w(self.m, self.w0)
+
+    def metrics(self, names=None, records=False):
+        """return several design figures at once (see metrics.compute)
+
+        Args:
+            names (tuple, optional): figures to compute. Defaults to all the figures defined for the filter type.
+            records (bool, optional): return a structured array instead of a dict. Defaults to False.
+
+        Returns:
+            dict or ndarray: one column per figure, NaN where a figure is undefined
+        """
+        return metrics.compute(self.type, self.m, self.w0, names=names, records=records)
+
+    def pzmap(self, plot=False, locus=False, budget=None):
+        """return poles and zeros of every filter, in closed form
+
+        Args:
+            plot (bool, optional): plot poles and zeros. Defaults to False.
+            locus (bool, optional): plot the poles as root locus branches (filters sorted by the swept parameter). Defaults to False.
+            budget (int, optional): resolution the plotted markers or branches are thinned to (see plot.plot_pzmap). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple(ndarray, ndarray): poles of shape (N, 2) and zeros of shape (N, number of zeros)
+        """
+        poles = analytic.poles(self.m, self.w0)
+        zeros = analytic.zeros(self.type, self.w0)
+        if plot == True:
+            plot_pzmap(poles, zeros, budget=budget, locus=locus)
+        return poles, zeros
+
+    def freqresp(self, w=None, n=1000):
+        """return the frequency response of every filter
+
+        Args:
+            w (array_like, optional): angular frequencies (rad/s). Defaults to n points spanning two decades around the w0 of the bank.
+            n (int, optional): number of frequency points if w is not given. Defaults to 1000.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (frequency array [rad/s], H(jw) of shape (N, len(w)))
+        """
+        if w is None:
+            w = np.logspace(np.log10(self.w0.min()) - 2, np.log10(self.w0.max()) + 2, n)
+        else:
+            w = np.asarray(w, dtype=float)
+        Tjw = analytic.freqresp(
+            self.type,
+            self.gain[:, np.newaxis],
+            self.m[:, np.newaxis],
+            self.w0[:, np.newaxis],
+            w,
+        )
+        return w, Tjw
+
+    def impulse(self, T=None, N=100):
+        """return the impulse response of every filter
+
+        Args:
+            T (array_like, optional): time points. Defaults to N points covering the slowest filter.
+            N (int, optional): number of time points if T is not given. Defaults to 100.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (time array, responses of shape (N filters, len(T)))
+        """
+        T = self._default_times(N) if T is None else np.asarray(T, dtype=float)
+        return T, analytic.impulse(self.type, self.gain, self.m, self.w0, T)
+
+    def step(self, T=None, N=100):
+        """return the step response of every filter
+
+        Args:
+            T (array_like, optional): time points. Defaults to N points covering the slowest filter.
+            N (int, optional): number of time points if T is not given. Defaults to 100.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (time array, responses of shape (N filters, len(T)))
+        """
+        T = self._default_times(N) if T is None else np.asarray(T, dtype=float)
+        return T, analytic.step(self.type, self.gain, self.m, self.w0, T)
+
+    def settling_time(self, tol=0.02, T=None, N=10000):
+        """return the settling time of the step response of every filter
+
+        Args:
+            tol (float, optional): relative width of the settling band. Defaults to 0.02.
+            T (array_like, optional): time points used to resolve the settling time. Defaults to N points covering the slowest filter.
+            N (int, optional): number of time points if T is not given. Defaults to 10000.
+
+        Returns:
+            ndarray: settling times (NaN where the response has not settled before T[-1])
+        """
+        T = self._default_times(N) if T is None else np.asarray(T, dtype=float)
+        return analytic.settling_time(self.type, self.gain, self.m, self.w0, T, tol)
@@ -0,0 +1,205 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Opt-in memoization of filter responses.
+
+When a ResponseCache is enabled, Second_Order_LTI.freqresp, step and
+impulse look their result up under the key (filter type, parameters,
+analysis, grid) before computing it. Grids given as arrays are keyed by a
+digest of their content, so equal arrays share an entry. Cached arrays are
+read-only: they are shared by every caller.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import instrument
+
+_active = None
+
+
+def fingerprint(value):
+    """return a hashable summary of a parameter or grid (a digest for arrays)"""
+    if value is None:
+        return None
+    array = np.asarray(value)
+    if array.ndim == 0:
+        return array.item()
+    digest = hashlib.sha1(np.ascontiguousarray(array).tobytes()).hexdigest()
+    return (array.dtype.str, array.shape, digest)
+
+
+def _readonly(arrays):
+    arrays = tuple(np.array(array) for array in arrays)
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+class ResponseCache:
+    """
+    Least recently used cache of responses, bounded by the memory of the arrays it holds
+
+    With a directory, every entry is also written there as a ``.npz`` file
+    and entries missing from memory are looked up on disk before being
+    computed, so the cache survives the process.
+    """
+
+    def __init__(self, max_bytes=64 * 2 ** 20, directory=None):
+        """
+        ResponseCache constructor
+
+        Args:
+            max_bytes (int, optional): memory bound of the cached arrays (bytes). Defaults to 64 MiB.
+            directory (str, optional): directory where entries are persisted. Defaults to None.
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __enter__(self):
+        self._previous = _swap(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        _swap(self._previous)
+
+    @property
+    def stats(self):
+        """Cache statistics
+
+        Returns:
+            dict: hits (memory and disk), misses, disk_hits, evictions, entries and nbytes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "entries": len(self),
+            "nbytes": self.nbytes,
+        }
+
+    def _path(self, key):
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, name + ".npz")
+
+    def _load(self, key):
+        if self.directory is None or not os.path.exists(self._path(key)):
+            return None
+        with np.load(self._path(key)) as data:
+            return _readonly(data["arr_{}".format(i)] for i in range(len(data.files)))
+
+    def _save(self, key, value):
+        path = self._path(key)
+        # write then rename, so that a concurrent reader never sees a partial file
+        temporary = "{}.{}.{}.tmp.npz".format(
+            path[:-4], os.getpid(), threading.get_ident()
+        )
+        np.savez(temporary, *value)
+        os.replace(temporary, path)
+
+    def _store(self, key, value):
+        size = sum(array.nbytes for array in value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= sum(array.nbytes for array in evicted)
+                self.evictions += 1
+
+    def get(self, key, compute):
+        """return the arrays cached under 'key', computing them on a miss
+
+        Args:
+            key (tuple): hashable key
+            compute (callable): function without argument returning a tuple of arrays
+
+        Returns:
+            tuple: read-only arrays
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if value is not None:
+            instrument.event("cache.hit")
+            return value
+        value = self._load(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+            instrument.event("cache.disk_hit")
+        else:
+            value = _readonly(compute())
+            with self._lock:
+                self.misses += 1
+            instrument.event("cache.miss")
+            if self.directory is not None:
+                self._save(key, value)
+        self._store(key, value)
+        return value
+
+    def clear(self):
+        """drop every entry held in memory (persisted entries are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+def _swap(cache):
+    global _active
+    previous, _active = _active, cache
+    return previous
+
+
+def enable(cache=None, **kwargs):
+    """make 'cache' the cache used by every filter
+
+    Args:
+        cache (ResponseCache, optional): cache to use, a new ResponseCache(**kwargs) if not given. Defaults to None.
+
+    Returns:
+        ResponseCache: the enabled cache
+    """
+    if cache is None:
+        cache = ResponseCache(**kwargs)
+    _swap(cache)
+    return cache
+
+
+def disable():
+    """stop caching responses
+
+    Returns:
+        ResponseCache: the previously enabled cache (None if there was none)
+    """
+    return _swap(None)
+
+
+def active():
+    """return the enabled cache, or None"""
+    return _active
@@ -0,0 +1,638 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Higher-order filters as cascades of second order sections.
+
+A Cascade chains sections (LP, HP, BP, Notch, General_Second_Order and, for
+odd orders, one First_Order section) without ever expanding their product
+into a high-order polynomial:
+
+* the frequency response is the product of the closed-form responses of
+  the sections;
+* the step and impulse responses propagate the state of the series
+  connection of the sections (a block triangular state-space built from
+  the sections) with its exact transition matrix over the time step, so
+  they are exact at the sample times whatever the spacing;
+* output and stream filter the input by the sections one at a time, each
+  of them discretised with the first order hold of scipy.signal.lsim.
+
+Cascade.from_prototype builds Butterworth, Chebyshev (type I) and Bessel
+low-pass or high-pass filters from the normalised analog prototypes.
+"""
+import numpy as np
+from scipy.linalg import expm
+from scipy.signal import besselap, buttap, cheb1ap, lti
+
+from .bank import FilterBank
+from .core import HP, LP
+from .plot import plot_bode, plot_pzmap, plot_time
+from .stream import Simulator, _uniform_step
+
+PROTOTYPES = ("butterworth", "chebyshev", "bessel")
+
+
+def prototype(family, order, ripple_db=1.0):
+    """return the sections of a normalised low-pass prototype (cutoff 1 rad/s)
+
+    The cutoff is the -3 dB frequency for "butterworth" and "bessel" and the
+    edge of the ripple band for "chebyshev". Sections are sorted by
+    increasing quality factor.
+
+    Args:
+        family (str): "butterworth", "chebyshev" or "bessel"
+        order (int): order of the filter (>= 1)
+        ripple_db (float, optional): pass band ripple of "chebyshev" filters (dB). Defaults to 1.0.
+
+    Returns:
+        tuple(float, list, float): (DC gain, [(m, w0) of every second order section], w0 of the first order section or None for even orders)
+    """
+    if order < 1:
+        raise ValueError("order must be at least 1, got {}".format(order))
+    if family == "butterworth":
+        _, poles, k = buttap(order)
+    elif family == "chebyshev":
+        _, poles, k = cheb1ap(order, ripple_db)
+    elif family == "bessel":
+        _, poles, k = besselap(order, norm="mag")
+    else:
+        raise ValueError(
+            "unknown prototype {!r}, expected one of {}".format(family, PROTOTYPES)
+        )
+    gain = float(np.real(k / np.prod(-poles)))
+    real = poles[np.abs(poles.imag) < 1e-12 * np.abs(poles)]
+    upper = poles[poles.imag > 1e-12 * np.abs(poles)]
+    w0 = np.abs(upper)
+    m = -upper.real / w0
+    order_by_q = np.argsort(-m)
+    sections = [(float(m[i]), float(w0[i])) for i in order_by_q]
+    first_order = float(-real[0].real) if len(real) else None
+    return gain, sections, first_order
+
+
+def _first_order_freqresp(kind, gain, w0, w):
+    s = 1j * np.asarray(w, dtype=float)
+    if kind == "LP":
+        return gain * w0 / (s + w0)
+    return gain * s / (s + w0)
+
+
+def _first_order_time(response, kind, gain, w0, t, out=None):
+    t = np.asarray(t, dtype=float)
+    decay = np.exp(-w0 * np.maximum(t, 0))
+    if response == "impulse":
+        # the Dirac of the high-pass section is not included, as in scipy
+        value = gain * w0 * decay if kind == "LP" else -gain * w0 * decay
+    elif kind == "LP":
+        value = gain * (1 - decay)
+    else:
+        value = gain * decay
+    value = np.where(t >= 0, value, 0.0)
+    if out is None:
+        return value
+    out[...] = value
+    return out
+
+
+class First_Order:
+    """
+    First order low-pass or high-pass section (the real pole of odd-order filters)
+
+    LP: H(s) = gain / (1 + s / w0), HP: H(s) = gain (s / w0) / (1 + s / w0)
+    """
+
+    _closed_form = True
+
+    def __init__(self, kind, gain, w0):
+        """
+        First order section constructor
+
+        Args:
+            kind (str): "LP" or "HP"
+            gain (float): DC gain (LP) or high frequency gain (HP)
+            w0 (float): cutoff frequency (rad/s)
+        """
+        if kind not in ("LP", "HP"):
+            raise ValueError("kind must be 'LP' or 'HP', got {!r}".format(kind))
+        self.type = kind
+        self.gain = gain
+        self.w0 = w0
+
+    def __repr__(self):
+        return "First_Order({!r}, gain={}, w0={})".format(self.type, self.gain, self.w0)
+
+    @property
+    def num(self):
+        """System numerator
+
+        Returns:
+            ndarray: numerator coefficients
+        """
+        if self.type == "LP":
+            return np.array([self.gain])
+        return np.array([self.gain / self.w0, 0])
+
+    @property
+    def den(self):
+        """System denominator
+
+        Returns:
+            ndarray: denominator coefficients
+        """
+        return np.array([1 / self.w0, 1])
+
+    @property
+    def lti(self):
+        """Continuous-time linear time invariant system
+
+        Returns:
+            scipy.signal.lti: lti object
+        """
+        return lti(self.num, self.den)
+
+    @property
+    def ss(self):
+        """State-space form of the system
+
+        Returns:
+            scipy.signal.StateSpace: state-space object
+        """
+        return self.lti.to_ss()
+
+    @property
+    def poles(self):
+        return np.array([-self.w0], dtype=complex)
+
+    @property
+    def zeros(self):
+        if self.type == "LP":
+            return np.empty(0, dtype=complex)
+        return np.zeros(1, dtype=complex)
+
+    def _closed_form_freqresp(self, w):
+        return _first_order_freqresp(self.type, self.gain, self.w0, w)
+
+    def _closed_form_time(self, response, t, out=None):
+        return _first_order_time(response, self.type, self.gain, self.w0, t, out)
+
+
+def _section_freqresp(section, w):
+    if section._closed_form:
+        return section._closed_form_freqresp(w)
+    return section.lti.freqresp(w=w)[1]
+
+
+def _series(sections):
+    """return (A, B, C, D) of the series connection of single input, single output sections
+
+    The state of each section is appended to the state vector and driven by
+    the output of the previous sections, so A is block lower triangular with
+    the matrices of the sections on its diagonal.
+    """
+    ss = sections[0].ss
+    A, B, C, D = ss.A, ss.B, ss.C, ss.D
+    for section in sections[1:]:
+        ss = section.ss
+        n, k = len(A), len(ss.A)
+        A = np.block([[A, np.zeros((n, k))], [ss.B @ C, ss.A]])
+        B = np.vstack((B, ss.B @ D))
+        C = np.hstack((ss.D @ C, ss.C))
+        D = ss.D @ D
+    return A, B, C, D
+
+
+def _propagate(transition, x0, n):
+    """return the states x[k] = transition^k x0 for k < n, as columns
+
+    The known columns are advanced by the squared transition matrix, so
+    only log2(n) matrix products are needed.
+    """
+    X = np.empty((len(x0), n))
+    if n == 0:
+        return X
+    X[:, 0] = x0
+    known, power = 1, transition
+    while known < n:
+        count = min(known, n - known)
+        X[:, known : known + count] = power @ X[:, :count]
+        known += count
+        power = power @ power
+    return X
+
+
+def _simulator(section, dt):
+    """return a Simulator of the section starting from a zero state"""
+    return Simulator(section, dt)
+
+
+class Cascade:
+    """
+    Cascade of second order (and first order) sections
+
+    The response of the cascade is the product of the responses of the
+    sections, which are never multiplied into a single polynomial.
+    """
+
+    def __init__(self, sections):
+        """
+        Cascade constructor
+
+        Args:
+            sections (iterable): sections, from input to output (LP, HP, BP, Notch, General_Second_Order or First_Order instances)
+        """
+        self.sections = tuple(sections)
+        if not self.sections:
+            raise ValueError("a cascade needs at least one section")
+
+    @classmethod
+    def from_prototype(cls, family, order, wc, gain=1.0, kind="LP", ripple_db=1.0):
+        """build a Butterworth, Chebyshev or Bessel filter
+
+        Args:
+            family (str): "butterworth", "chebyshev" or "bessel"
+            order (int): order of the filter
+            wc (float): cutoff frequency (rad/s), see prototype
+            gain (float, optional): pass band gain (top of the ripple band for "chebyshev"). Defaults to 1.0.
+            kind (str, optional): "LP" or "HP". Defaults to "LP".
+            ripple_db (float, optional): pass band ripple of "chebyshev" filters (dB). Defaults to 1.0.
+
+        Returns:
+            Cascade: the filter, first order section first, then second order sections by increasing quality factor
+        """
+        if kind not in ("LP", "HP"):
+            raise ValueError("kind must be 'LP' or 'HP', got {!r}".format(kind))
+        prototype_gain, pairs, first_order = prototype(family, order, ripple_db)
+        gains = [1.0] * (len(pairs) + (first_order is not None))
+        gains[0] = gain * prototype_gain
+        sections = []
+        if first_order is not None:
+            w0 = wc * first_order if kind == "LP" else wc / first_order
+            sections.append(First_Order(kind, gains[len(sections)], w0))
+        for m, w0 in pairs:
+            if kind == "LP":
+                sections.append(LP(gains[len(sections)], m, wc * w0))
+            else:
+                sections.append(HP(gains[len(sections)], m, wc / w0))
+        return cls(sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __repr__(self):
+        return "Cascade({!r})".format(list(self.sections))
+
+    @property
+    def order(self):
+        """Order of the cascade
+
+        Returns:
+            int: number of poles
+        """
+        return sum(len(section.poles) for section in self.sections)
+
+    @property
+    def poles(self):
+        """System poles
+
+        Returns:
+            ndarray: poles of every section
+        """
+        return np.concatenate([section.poles for section in self.sections])
+
+    @property
+    def zeros(self):
+        """System zeros
+
+        Returns:
+            ndarray: zeros of every section
+        """
+        return np.concatenate([section.zeros for section in self.sections])
+
+    def pzmap(self, plot=True, budget=None):
+        """return poles and zeros.
+
+        Args:
+            plot (bool, optional): plot poles and zeros. Defaults to True.
+            budget (int, optional): resolution the plotted markers are thinned to (see plot.thin_points). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple: (poles,zeros)
+        """
+        poles, zeros = self.poles, self.zeros
+        if plot == True:
+            plot_pzmap(poles, zeros, budget=budget)
+        return poles, zeros
+
+    def freqresp(self, w=None, n=10000, plot=True, budget=None):
+        """return the frequency response, product of the responses of the sections
+
+        Args:
+            w (array_like, optional): angular frequencies (rad/s). Defaults to n points spanning two decades around the sections.
+            n (int, optional): number of frequency points if w is not given. Defaults to 10000.
+            plot (bool, optional): plot the bode diagram. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple: (frequency array [rad/s], H(jw))
+        """
+        if w is None:
+            r = np.abs(self.poles)
+            w = np.logspace(np.log10(r.min()) - 2, np.log10(r.max()) + 2, n)
+        else:
+            w = np.asarray(w, dtype=float)
+        Tjw = _section_freqresp(self.sections[0], w)
+        for section in self.sections[1:]:
+            Tjw = Tjw * _section_freqresp(section, w)
+        if plot == True:
+            plot_bode(w, Tjw, budget=budget)
+        return w, Tjw
+
+    def _time_points(self, T=None, N=None):
+        """return T as an array, or N points over 7 time constants of the slowest pole"""
+        if T is not None:
+            return np.asarray(T, dtype=float)
+        if N is None:
+            N = 1000
+        r = np.min(np.abs(self.poles.real))
+        if r == 0:
+            r = 1.0
+        return np.linspace(0, 7 / r, N)
+
+    def _response(self, response, T, N):
+        t = self._time_points(T, N)
+        if len(t) and t[0] != 0:
+            raise ValueError("time points must start at 0")
+        dt = _uniform_step(t)
+        A, B, C, D = _series(self.sections)
+        if response == "step":
+            # the unit input is held in an extra state, so the transition is exact
+            n = len(A)
+            M = np.zeros((n + 1, n + 1))
+            M[:n, :n], M[:n, n:] = A, B
+            x0 = np.zeros(n + 1)
+            x0[n] = 1.0
+            C = np.hstack((C, D))
+        else:
+            # the Dirac part D of the response is dropped, as scipy does
+            M, x0 = A, B[:, 0]
+        X = _propagate(expm(M * dt), x0, len(t))
+        return t, C[0] @ X
+
+    def step(self, T=None, N=None, plot=True, budget=None):
+        """return step response
+
+        The state of the cascade is propagated with its exact transition
+        matrix over the time step, so T must be equally spaced but the
+        samples are exact for any spacing.
+
+        Args:
+            T (array_like, optional): equally spaced time points starting at 0. Defaults to N points over 7 time constants of the slowest pole.
+            N (int, optional): number of time points if T is not given. Defaults to 1000.
+            plot (bool, optional): plot the step reponse. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple(ndarray, ndarray): Time values for step response, step response
+        """
+        t, s = self._response("step", T, N)
+        if plot == True:
+            plot_time(t, s, budget=budget)
+        return t, s
+
+    def impulse(self, T=None, N=None, plot=True, budget=None):
+        """return impulse response (see step for the time points)
+
+        Args:
+            T (array_like, optional): equally spaced time points starting at 0. Defaults to N points over 7 time constants of the slowest pole.
+            N (int, optional): number of time points if T is not given. Defaults to 1000.
+            plot (bool, optional): plot the impulse response. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple: (array t: time (x-axis),
+                    array s: impulse response (y-axis)
+        """
+        t, s = self._response("impulse", T, N)
+        if plot == True:
+            plot_time(t, s, budget=budget)
+        return t, s
+
+    def output(self, U, T, plot=True, budget=None):
+        """return output of the cascade for the input U (interpolated linearly between samples, as in scipy.signal.lsim)
+
+        Args:
+            U (array_like): input at each time T
+            T (array_like): equally spaced time points, the simulation starts at T[0] from a zero state
+            plot (bool, optional): plot output. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple(1D ndarray, 1D ndarray): Time values for the output, system output
+        """
+        t = np.asarray(T, dtype=float)
+        U = np.broadcast_to(np.asarray(U, dtype=float), t.shape)
+        y = self.stream(_uniform_step(t)).process(U)
+        if plot == True:
+            plot_time(t, y, budget=budget)
+        return t, y
+
+    def stream(self, dt):
+        """return a streaming simulator of the cascade for inputs sampled every dt
+
+        Args:
+            dt (float): sampling period of the input (s)
+
+        Returns:
+            CascadeSimulator: streaming simulator
+        """
+        return CascadeSimulator(self, dt)
+
+
+class CascadeSimulator:
+    """
+    Streaming simulation of a cascade driven by a uniformly sampled input
+
+    Every section has its own Simulator (first order hold), the output of
+    one section being the input of the next one. The states are carried
+    between calls of process, so splitting a signal in blocks gives the
+    same samples as Cascade.output.
+    """
+
+    def __init__(self, cascade, dt):
+        """
+        CascadeSimulator constructor
+
+        Args:
+            cascade (Cascade): filter to simulate
+            dt (float): sampling period of the input (s)
+        """
+        self.dt = dt
+        self.simulators = [_simulator(section, dt) for section in cascade.sections]
+        self.n_samples = 0
+
+    def reset(self):
+        """restart the simulation from a zero state"""
+        for simulator in self.simulators:
+            simulator.reset(np.zeros(simulator.order))
+        self.n_samples = 0
+
+    def process(self, U):
+        """filter the next block of input samples
+
+        Args:
+            U (array_like): 1-D block of input samples
+
+        Returns:
+            ndarray: output block
+        """
+        y = np.asarray(U, dtype=float)
+        for simulator in self.simulators:
+            y = simulator.process(y)
+        self.n_samples += len(y)
+        return y
+
+
+class CascadeBank:
+    """
+    Batch of cascades with the same structure (for instance the same prototype with different cutoffs)
+
+    Section i of every cascade is held in the FilterBank sections[i], and
+    the first order sections (odd orders) as arrays. The frequency
+    response is computed for the whole batch at once; time responses are
+    computed cascade by cascade.
+    """
+
+    def __init__(self, sections, first_order=None):
+        """
+        Cascade bank constructor
+
+        Args:
+            sections (list): FilterBank of every second order section, all of the same length
+            first_order (tuple, optional): (kind, gain, w0) of the first order sections, gain and w0 being arrays. Defaults to None.
+        """
+        self.sections = list(sections)
+        sizes = set(len(bank) for bank in self.sections)
+        if first_order is not None:
+            kind, gain, w0 = first_order
+            gain, w0 = np.broadcast_arrays(
+                np.asarray(gain, dtype=float), np.asarray(w0, dtype=float)
+            )
+            first_order = (kind, gain.ravel(), w0.ravel())
+            sizes.add(len(first_order[2]))
+        if len(sizes) != 1:
+            raise ValueError("sections must all have the same length")
+        self.first_order = first_order
+
+    @classmethod
+    def from_prototype(cls, family, order, wc, gain=1.0, kind="LP", ripple_db=1.0):
+        """build a batch of Butterworth, Chebyshev or Bessel filters (see Cascade.from_prototype)
+
+        Args:
+            family (str): "butterworth", "chebyshev" or "bessel"
+            order (int): order of the filters
+            wc (array_like): cutoff frequency of every filter (rad/s)
+            gain (array_like, optional): pass band gain of every filter. Defaults to 1.0.
+            kind (str, optional): "LP" or "HP". Defaults to "LP".
+            ripple_db (float, optional): pass band ripple of "chebyshev" filters (dB). Defaults to 1.0.
+
+        Returns:
+            CascadeBank: the filters
+        """
+        if kind not in ("LP", "HP"):
+            raise ValueError("kind must be 'LP' or 'HP', got {!r}".format(kind))
+        prototype_gain, pairs, first_order = prototype(family, order, ripple_db)
+        wc, gain = np.broadcast_arrays(
+            np.asarray(wc, dtype=float), np.asarray(gain, dtype=float)
+        )
+        wc, gain = wc.ravel(), gain.ravel() * prototype_gain
+        sections = []
+        for i, (m, w0) in enumerate(pairs):
+            w0 = wc * w0 if kind == "LP" else wc / w0
+            section_gain = gain if i == 0 and first_order is None else 1.0
+            sections.append(FilterBank(kind, section_gain, m, w0))
+        if first_order is not None:
+            w0 = wc * first_order if kind == "LP" else wc / first_order
+            first_order = (kind, gain, w0)
+        return cls(sections, first_order)
+
+    def __len__(self):
+        if self.first_order is not None:
+            return len(self.first_order[2])
+        return len(self.sections[0])
+
+    def __getitem__(self, index):
+        sections = []
+        if self.first_order is not None:
+            kind, gain, w0 = self.first_order
+            sections.append(First_Order(kind, float(gain[index]), float(w0[index])))
+        sections.extend(bank[index] for bank in self.sections)
+        return Cascade(sections)
+
+    def __repr__(self):
+        return "CascadeBank({} cascades of {} sections)".format(
+            len(self), len(self.sections) + (self.first_order is not None)
+        )
+
+    def freqresp(self, w=None, n=1000):
+        """return the frequency response of every cascade
+
+        Args:
+            w (array_like, optional): angular frequencies (rad/s). Defaults to n points spanning two decades around the sections.
+            n (int, optional): number of frequency points if w is not given. Defaults to 1000.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (frequency array [rad/s], H(jw) of shape (N, len(w)))
+        """
+        if w is None:
+            w0 = [bank.w0 for bank in self.sections]
+            if self.first_order is not None:
+                w0.append(self.first_order[2])
+            w0 = np.concatenate(w0)
+            w = np.logspace(np.log10(w0.min()) - 2, np.log10(w0.max()) + 2, n)
+        else:
+            w = np.asarray(w, dtype=float)
+        Tjw = np.ones((len(self), len(w)), dtype=complex)
+        for bank in self.sections:
+            Tjw *= bank.freqresp(w=w)[1]
+        if self.first_order is not None:
+            kind, gain, w0 = self.first_order
+            Tjw *= _first_order_freqresp(
+                kind, gain[:, np.newaxis], w0[:, np.newaxis], w
+            )
+        return w, Tjw
+
+    def _time_responses(self, response, T, N):
+        if T is None:
+            # common grid covering the slowest cascade
+            r = min(np.min(np.abs(self[i].poles.real)) for i in range(len(self)))
+            T = np.linspace(0, 7 / r, 1000 if N is None else N)
+        T = np.asarray(T, dtype=float)
+        out = np.empty((len(self), len(T)))
+        for i in range(len(self)):
+            out[i] = self[i]._response(response, T, None)[1]
+        return T, out
+
+    def step(self, T=None, N=None):
+        """return the step response of every cascade
+
+        Args:
+            T (array_like, optional): equally spaced time points starting at 0. Defaults to N points covering the slowest cascade.
+            N (int, optional): number of time points if T is not given. Defaults to 1000.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (time array, responses of shape (N cascades, len(T)))
+        """
+        return self._time_responses("step", T, N)
+
+    def impulse(self, T=None, N=None):
+        """return the impulse response of every cascade
+
+        Args:
+            T (array_like, optional): equally spaced time points starting at 0. Defaults to N points covering the slowest cascade.
+            N (int, optional): number of time points if T is not given. Defaults to 1000.
+
+        Returns:
+            tuple(1D ndarray, 2D ndarray): (time array, responses of shape (N cascades, len(T)))
+        """
+        return self._time_responses("impulse", T, N)
@@ -4,18 +4,137 @@
 # @authors: vincentchoqueuse, slashformotion
 ##
 import numpy as np
-from scipy.signal import lti
+from scipy.signal import lti, findfreqs
+from . import aio, analytic
+from . import cache as response_cache
+from . import instrument
+from .discrete import discretize
+from .fftfilter import FFTFilter
+from .stream import Simulator, _uniform_step, filter_channels, foh_coefficients
 from .plot import plot_time, plot_bode, plot_pzmap
 
 
+def _readonly(array):
+    """return 'array' as a read-only ndarray (cached arrays are shared)"""
+    array = np.asarray(array)
+    array.setflags(write=False)
+    return array
+
+
 class Second_Order_LTI:
 
-    """ General Class for Second order LTI systems"""
+    """ General Class for Second order LTI systems
+
+    The objects derived from the parameters (``num``, ``den``, ``lti``,
+    ``poles``, ``zeros`` and ``ss``) are built once and cached on the
+    instance. Setting one of the attributes listed in ``_parameters``
+    invalidates the cache.
+    """
+
+    _parameters = ()
+
+    def __setattr__(self, name, value):
+        if name in self._parameters:
+            self.__dict__.pop("_cache", None)
+        object.__setattr__(self, name, value)
+
+    def _cached(self, key, compute):
+        """return the cached value stored under 'key', computing it on first access
+
+        Args:
+            key (str): cache key
+            compute (callable): function without argument returning the value
+
+        Returns:
+            object: cached value
+        """
+        cache = self.__dict__.setdefault("_cache", {})
+        try:
+            return cache[key]
+        except KeyError:
+            with instrument.stage("build." + key):
+                value = cache[key] = compute()
+            return value
+
+    def clear_cache(self):
+        """drop every cached object (they will be rebuilt on next access)"""
+        self.__dict__.pop("_cache", None)
+
+    def _parameter_key(self):
+        """return a hashable summary of the parameters listed in ``_parameters``"""
+        return tuple(
+            response_cache.fingerprint(getattr(self, name)) for name in self._parameters
+        )
+
+    def _memoized(self, analysis, grid, compute):
+        """return compute(), looked up in the response cache when one is enabled
+
+        Args:
+            analysis (str): name of the analysis
+            grid (tuple): fingerprints of the arguments defining the result
+            compute (callable): function without argument returning a tuple of arrays
+
+        Returns:
+            tuple: arrays returned by compute (read-only when cached)
+        """
+        cache = response_cache.active()
+        if cache is None:
+            return compute()
+        return cache.get((self.type, self._parameter_key(), analysis) + grid, compute)
+
+    @property
+    def lti(self):
+        """Continuous-time linear time invariant system
+
+        Returns:
+            scipy.signal.lti: lti object
+        """
+        return self._cached("lti", lambda: lti(self.num, self.den))
+
+    @property
+    def ss(self):
+        """State-space form of the system
+
+        Returns:
+            scipy.signal.StateSpace: state-space object
+        """
+        return self._cached("ss", lambda: self.lti.to_ss())
+
+    @property
+    def poles(self):
+        """System poles
+
+        Returns:
+            ndarray: poles of the transfer function (closed form, see analytic.poles)
+        """
+
+        def build():
+            if self._closed_form:
+                return _readonly(analytic.poles(self.m, self.w0))
+            return _readonly(self.lti.poles)
+
+        return self._cached("poles", build)
+
+    @property
+    def zeros(self):
+        """System zeros
+
+        Returns:
+            ndarray: zeros of the transfer function
+        """
+
+        def build():
+            if self.type in analytic.FILTER_TYPES:
+                return _readonly(analytic.zeros(self.type, self.w0))
+            return _readonly(self.lti.zeros)
+
+        return self._cached("zeros", build)
 
     @property
     def R(self):
+        """Relative overshoot of the step response of a LP filter (0 when m >= 1)"""
         if self.m < 1:
-            R = np.exp(2 * np.pi * self.m / np.sqrt(1 - self.m ** 2))
+            R = np.exp(-np.pi * self.m / np.sqrt(1 - self.m ** 2))
         else:
             R = 0
         return R
@@ -41,23 +160,63 @@ class Second_Order_LTI:
     def Q(self):
         return 1 / (2 * self.m)
 
-    def pzmap(self, plot=True):
+    @property
+    def _closed_form(self):
+        """True when the responses can be computed with the closed forms of the analytic module"""
+        return self.type in analytic.FILTER_TYPES
+
+    def _closed_form_freqresp(self, w):
+        return analytic.freqresp(self.type, self.gain, self.m, self.w0, w)
+
+    def _closed_form_time(self, response, t, out=None):
+        compute = getattr(analytic, response)
+        return compute(self.type, self.gain, self.m, self.w0, t, out=out)
+
+    def _time_points(self, T=None, N=None):
+        """return T as an array, or the default time grid used by scipy (7 time constants of the slowest pole)"""
+        if T is not None:
+            return np.asarray(T, dtype=float)
+        if N is None:
+            N = 100
+        r = np.min(np.abs(self.poles.real))
+        if r == 0:
+            r = 1.0
+        return np.linspace(0, 7 / r, N)
+
+    def settling_time(self, tol=0.02, T=None, N=10000):
+        """return the settling time of the step response
+
+        Args:
+            tol (float, optional): relative width of the settling band. Defaults to 0.02.
+            T (array_like, optional): Time points used to resolve the settling time. Defaults to None.
+            N (int, optional): Number of time points if T is not given. Defaults to 10000.
+
+        Returns:
+            float: settling time (NaN if the response has not settled before T[-1])
+        """
+        t = self._time_points(T, N)
+        return analytic.settling_time(self.type, self.gain, self.m, self.w0, t, tol)
+
+    def pzmap(self, plot=True, budget=None):
         """return poles and zeros.
 
 
         Args:
             plot (bool, optional): plot poles and zeros. Defaults to True.
+            budget (int, optional): resolution the plotted markers are thinned to (see plot.thin_points). Defaults to plot.PIXEL_BUDGET.
 
         Returns:
             tuple: (poles,zeros)
         """
-        poles = self.lti.poles
-        zeros = self.lti.zeros
+        with instrument.stage("pzmap"):
+            poles = self.poles
+            zeros = self.zeros
         if plot == True:
-            plot_pzmap(poles, zeros)
+            with instrument.stage("pzmap.plot"):
+                plot_pzmap(poles, zeros, budget=budget)
         return poles, zeros
 
-    def impulse(self, X0=None, T=None, N=None, plot=True):
+    def impulse(self, X0=None, T=None, N=None, plot=True, budget=None):
         """return impulse response from continuous-time system. (in this case, self)
 
         Args:
@@ -65,17 +224,32 @@ class Second_Order_LTI:
             T (array, optional): Time points. Computed if not given.. Defaults to None.
             N (int, optional): The number of time points to compute (if T is not given). Defaults to None.
             plot (bool, optional): plot the impulse response. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
 
         Returns:
             tuple: (array t: time (x-axis),
                     array s: impulse response (y-axis)
         """
-        t, s = self.lti.impulse(X0=X0, T=T, N=N)
+        with instrument.stage("impulse") as record:
+            t, s = self._memoized(
+                "impulse",
+                (response_cache.fingerprint(X0), response_cache.fingerprint(T), N),
+                lambda: self._impulse(X0, T, N),
+            )
+            record.size = len(t)
         if plot == True:
-            plot_time(t, s)
+            with instrument.stage("impulse.plot", len(t)):
+                plot_time(t, s, budget=budget)
         return t, s
 
-    def step(self, X0=None, T=None, N=None, plot=True):
+    def _impulse(self, X0, T, N):
+        with instrument.stage("impulse.solve"):
+            if X0 is not None or not self._closed_form:
+                return self.ss.impulse(X0=X0, T=T, N=N)
+            t = self._time_points(T, N)
+            return t, self._closed_form_time("impulse", t)
+
+    def step(self, X0=None, T=None, N=None, plot=True, budget=None):
         """return step response
 
         Args:
@@ -83,20 +257,44 @@ class Second_Order_LTI:
             T (array_like, optional): Time points. Defaults to None.
             N (int, optional): Number of time points to compute if T is not given. Defaults to None.
             plot (bool, optional): plot the step reponse. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
 
         Returns:
             tuple(ndarray, ndarray): Time values for step response, step response
         """
-        t, s = self.lti.step(X0=X0, T=T, N=N)
-        t = np.hstack(([-0.001, -0.00001, 0], t))
-        s = np.hstack(([0, 0, 0], s))
+        with instrument.stage("step") as record:
+            t, s = self._memoized(
+                "step",
+                (response_cache.fingerprint(X0), response_cache.fingerprint(T), N),
+                lambda: self._step(X0, T, N),
+            )
+            record.size = len(t)
         step = t >= 0
         if plot == True:
-            plot_time(t, s, step)
+            with instrument.stage("step.plot", len(t)):
+                plot_time(t, s, step, budget=budget)
+
+        return t, s
 
+    def _step(self, X0, T, N):
+        with instrument.stage("step.solve"):
+            if X0 is not None or not self._closed_form:
+                t_pos, s_pos = self.ss.step(X0=X0, T=T, N=N)
+            else:
+                t_pos, s_pos = self._time_points(T, N), None
+            # the response is prefixed by a few samples at t <= 0 (input still off)
+            t = np.empty(len(t_pos) + 3)
+            t[:3] = (-0.001, -0.00001, 0)
+            t[3:] = t_pos
+            s = np.empty(len(t))
+            s[:3] = 0
+            if s_pos is None:
+                self._closed_form_time("step", t_pos, out=s[3:])
+            else:
+                s[3:] = s_pos
         return t, s
 
-    def output(self, U, T, X0=None, plot=True):
+    def output(self, U, T, X0=None, plot=True, budget=None):
         """return output of a continuous-time linear system.
 
         Args:
@@ -104,31 +302,228 @@ class Second_Order_LTI:
             T (array_like): The time steps at which the input is defined and at which the output is desired. Must be nonnegative, increasing, and equally spaced.
             X0 (array_like, optional): The initial conditions on the state vector (zero by default). Defaults to None.
             plot (bool, optional): plot output. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
 
         Returns:
             tuple(1D ndarray, 1D ndarray, ndarray): Time values for the output, system output, time evolution of the state vector
         """
-        t, s, x = self.lti.output(U, T, X0=X0)
+        with instrument.stage("output") as record:
+            t, s, x = self.ss.output(U, T, X0=X0)
+            record.size = len(t)
         if plot == True:
-            plot_time(t, s)
+            with instrument.stage("output.plot", len(t)):
+                plot_time(t, s, budget=budget)
         return t, s, x
 
-    def freqresp(self, w=None, n=10000, plot=True):
+    def output_channels(self, U, T, axis=-1, max_workers=0, plot=True, budget=None):
+        """return the outputs of many independent input channels (zero initial state)
+
+        Unlike output, where the columns of a 2-D U are the inputs of one
+        system, every channel here is a separate signal filtered by the
+        system. The discretisation for the time step of T is computed once
+        and cached on the instance (last time step only), and all the channels are filtered in a
+        single pass (see stream.filter_channels). The outputs are the ones
+        of output, with the same interpolation of the input.
+
+        Args:
+            U (array_like): inputs of shape (channels, samples) with axis=-1, or (samples, channels) with axis=0
+            T (array_like): equally spaced time points, the simulation starts at T[0]
+            axis (int, optional): time axis of U. Defaults to -1.
+            max_workers (int, optional): number of threads filtering blocks of channels, 0 to filter in this thread. Defaults to 0.
+            plot (bool, optional): plot the outputs. Defaults to True.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+
+        Returns:
+            tuple(1D ndarray, ndarray): time values, outputs with the layout of U
+        """
+        t = np.asarray(T, dtype=float)
+        if np.shape(U)[axis] != len(t):
+            raise ValueError("U and T have different numbers of samples")
+        with instrument.stage("output.channels", np.size(U)):
+            coefficients = self._foh(float(_uniform_step(t)))
+            y = filter_channels(coefficients, U, axis=axis, max_workers=max_workers)
+        if plot == True:
+            with instrument.stage("output.plot", len(t)):
+                plot_time(t, np.moveaxis(y, axis, 0), budget=budget)
+        return t, y
+
+    def _foh(self, dt):
+        """return the FOH coefficients for the time step dt
+
+        Only the coefficients of the last time step are kept in the cache, so
+        sweeping dt does not grow it.
+        """
+        entry = self._cached("foh", lambda: (dt, foh_coefficients(self, dt)))
+        if entry[0] != dt:
+            del self._cache["foh"]
+            entry = self._cached("foh", lambda: (dt, foh_coefficients(self, dt)))
+        return entry[1]
+
+    def stream(self, dt, X0=None, return_state=False):
+        """return a streaming simulator of the system for inputs sampled every dt
+
+        Successive blocks given to Simulator.process are filtered as one
+        continuous signal, the state being carried between calls.
+
+        Args:
+            dt (float): sampling period of the input (s)
+            X0 (array_like, optional): initial state vector (zero by default). Defaults to None.
+            return_state (bool, optional): also return the state trajectory. Defaults to False.
+
+        Returns:
+            Simulator: streaming simulator
+        """
+        return Simulator(self, dt, X0=X0, return_state=return_state)
+
+    def fft_filter(self, fs, block_size=None, method="overlap-add", model="foh"):
+        """return a block FFT filter of the system for long signals sampled at fs
+
+        The impulse response is truncated where it has decayed below 1e-10
+        and its FFT is cached on the instance per (block size, sampling
+        frequency), see fftfilter.FFTFilter.
+
+        Args:
+            fs (float): sampling frequency (Hz)
+            block_size (int, optional): number of samples per FFT. Defaults to None.
+            method (str, optional): "overlap-add" or "overlap-save". Defaults to "overlap-add".
+            model (str, optional): "foh" (same samples as output) or "bandlimited" (sampled H(jw)). Defaults to "foh".
+
+        Returns:
+            FFTFilter: streaming FFT filter
+        """
+        return FFTFilter(self, fs, block_size=block_size, method=method, model=model)
+
+    def to_biquad(self, fs, method="zoh", prewarp=False):
+        """return the discrete-time biquad equivalent to the system
+
+        Args:
+            fs (float): sampling frequency (Hz)
+            method (str, optional): "zoh", "foh", "bilinear" or "matched". Defaults to "zoh".
+            prewarp (bool, optional): for "bilinear", match the response exactly at w0. Defaults to False.
+
+        Returns:
+            Biquad: discrete-time second order section (see Biquad.filter to run it)
+        """
+        return discretize(self, fs, method=method, prewarp=prewarp)
+
+    def freqresp(
+        self,
+        w=None,
+        n=10000,
+        plot=True,
+        adaptive=False,
+        tol_db=0.1,
+        tol_deg=1.0,
+        budget=None,
+    ):
         """return frequency response. (This method can plot it too)
 
         Args:
             w (array_like, optional): Array of frequencies (in rad/s). Magnitude and phase data is calculated for every value in this array. If not given, a reasonable set will be calculated.. Defaults to None.
             n (int, optional): Number of frequency points to compute if w is not given. The n frequencies are logarithmically spaced in an interval chosen to include the influence of the poles and zeros of the system.. Defaults to 10000.
             plot (bool, optional): plot the frequency response. Defaults to True.
+            adaptive (bool, optional): if w is not given, use a non-uniform grid over the same interval, refined around the resonance until tol_db and tol_deg are met (at most n points). Defaults to False.
+            tol_db (float, optional): magnitude tolerance of the adaptive grid (dB). Defaults to 0.1.
+            tol_deg (float, optional): phase tolerance of the adaptive grid (degrees). Defaults to 1.0.
+            budget (int, optional): number of pixel columns the plot is decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
 
         Returns:
             tuple(1D ndarray, 1D ndarray): (frequency array [rad/s], array of complex magnitude values)
         """
-        w, Tjw = self.lti.freqresp(w=w, n=n)
+        if w is not None:
+            grid = (response_cache.fingerprint(w),)
+        else:
+            grid = (None, n, adaptive, tol_db, tol_deg)
+        with instrument.stage("freqresp") as record:
+            w, Tjw = self._memoized(
+                "freqresp",
+                grid,
+                lambda: self._freqresp(w, n, adaptive, tol_db, tol_deg),
+            )
+            record.size = len(w)
         if plot == True:
-            plot_bode(w, Tjw)
+            with instrument.stage("freqresp.plot", len(w)):
+                plot_bode(w, Tjw, budget=budget)
         return w, Tjw
 
+    def _freqresp(self, w, n, adaptive, tol_db, tol_deg):
+        if not self._closed_form:
+            with instrument.stage("freqresp.solve"):
+                return self.lti.freqresp(w=w, n=n)
+        with instrument.stage("freqresp.grid"):
+            w = self._frequency_points(w, n, adaptive, tol_db, tol_deg)
+        with instrument.stage("freqresp.solve", len(w)):
+            return w, self._closed_form_freqresp(w)
+
+    def _frequency_points(self, w, n, adaptive, tol_db, tol_deg):
+        """return w as an array, or the default (or adaptive, for the named filters) grid"""
+        if w is None and adaptive and self.type in analytic.FILTER_TYPES:
+            wmin, wmax = findfreqs(np.atleast_1d(self.num), self.den, 2)
+            w = analytic.adaptive_grid(
+                self.type,
+                self.gain,
+                self.m,
+                self.w0,
+                wmin=wmin,
+                wmax=wmax,
+                tol_db=tol_db,
+                tol_deg=tol_deg,
+                max_points=n,
+            )
+        elif w is None:
+            w = findfreqs(np.atleast_1d(self.num), self.den, n)
+        else:
+            w = np.asarray(w, dtype=float)
+        return w
+
+    async def afreqresp(self, w=None, n=10000, adaptive=False, tol_db=0.1, tol_deg=1.0):
+        """asynchronous freqresp, computed in the executor of the aio module (no plot)
+
+        Returns:
+            tuple(1D ndarray, 1D ndarray): (frequency array [rad/s], array of complex magnitude values), read-only
+        """
+        return await aio.run(
+            self,
+            "freqresp",
+            w=w,
+            n=n,
+            adaptive=adaptive,
+            tol_db=tol_db,
+            tol_deg=tol_deg,
+        )
+
+    async def astep(self, X0=None, T=None, N=None):
+        """asynchronous step, computed in the executor of the aio module (no plot)
+
+        Returns:
+            tuple(ndarray, ndarray): Time values for step response, step response, read-only
+        """
+        return await aio.run(self, "step", X0=X0, T=T, N=N)
+
+    async def aimpulse(self, X0=None, T=None, N=None):
+        """asynchronous impulse, computed in the executor of the aio module (no plot)
+
+        Returns:
+            tuple: (time, impulse response), read-only
+        """
+        return await aio.run(self, "impulse", X0=X0, T=T, N=N)
+
+    async def aoutput(self, U, T, X0=None):
+        """asynchronous output, computed in the executor of the aio module (no plot)
+
+        Returns:
+            tuple(1D ndarray, 1D ndarray, ndarray): Time values for the output, system output, time evolution of the state vector, read-only
+        """
+        return await aio.run(self, "output", U=U, T=T, X0=X0)
+
+    async def apzmap(self):
+        """asynchronous pzmap, computed in the executor of the aio module (no plot)
+
+        Returns:
+            tuple: (poles,zeros)
+        """
+        return await aio.run(self, "pzmap")
+
     def discontinuities(self, var_input, var_diff_input):
         # TODO: understand wtf this is
         b2, b1, b0 = self.den
@@ -144,32 +539,62 @@ class General_Second_Order(Second_Order_LTI):
     """ Class for Second order LTI systems"""
 
     type = "second_order"
+    _parameters = ("num", "den")
 
-    def __init__(self, m, w0):
+    def __init__(self, num, den):
         """
-        General Second Order filter instance constructor
+        General Second Order system instance constructor
+
+        The coefficients are normalised once so that den[-1] = 1. The
+        responses use the closed forms of the analytic module when the poles
+        are complex or of the same sign (a2 / a0 > 0).
 
         Args:
-            m (float): damping coefficient
-            w0 (float): caracteristic frequency
+            num (array_like): numerator coefficients, highest power first (at most 3)
+            den (array_like): denominator coefficients a2, a1, a0 (a2 and a0 non-zero)
         """
-
+        self.num = num
+        self.den = den
         self.normalize()
 
-    @property
-    def lti(self):
-        return lti(self.num, self.den)
+    @classmethod
+    def batch(cls, num, den):
+        """build many systems from stacked coefficients, normalised in one array operation
+
+        The result is a list of independent instances, not a batched
+        evaluator like FilterBank: the responses of many systems at once are
+        computed by the analytic.general_* functions on the stacked
+        coefficients.
+
+        Args:
+            num (array_like): numerators of shape (N, k) with k <= 3
+            den (array_like): denominators of shape (N, 3)
+
+        Returns:
+            list: General_Second_Order instances
+        """
+        num, den, m, w0 = analytic.normalize(num, den)
+        num, den = num.reshape(-1, 3), den.reshape(-1, 3)
+        m, w0 = np.ravel(m), np.ravel(w0)
+        systems = []
+        for i in range(len(num)):
+            system = cls.__new__(cls)
+            system.num = _readonly(num[i])
+            system.den = _readonly(den[i])
+            system._cache = {"m": float(m[i]), "w0": float(w0[i])}
+            systems.append(system)
+        return systems
 
     @property
     def w0(self):
         """Natural frequency
 
         Returns:
-            float: natural frequency (commonly known as w0)
+            float: natural frequency (commonly known as w0), NaN when a2 / a0 <= 0
         """
-        a_2_norm = self.den[0]  # a_2_norm = 1/(w0**2)
-        w0 = 1 / np.sqrt(a_2_norm)
-        return w0
+        return self._cached(
+            "w0", lambda: float(analytic.normalize(self.num, self.den)[3])
+        )
 
     @property
     def m(self):
@@ -178,15 +603,63 @@ class General_Second_Order(Second_Order_LTI):
         Returns:
             float: damping factor, or damping coefficient
         """
-        a_1_norm = self.den[1]  # a_1_norm = 2m/(w0) ->m = a_1_norm *w0/2
-        w0 = self.w0
-        m = a_1_norm * w0 / 2
-        return m
+        return self._cached(
+            "m", lambda: float(analytic.normalize(self.num, self.den)[2])
+        )
+
+    @property
+    def lti(self):
+        """Continuous-time linear time invariant system
+
+        Returns:
+            scipy.signal.lti: lti object
+        """
+
+        def build():
+            # num is padded to 3 coefficients, scipy warns about leading zeros
+            num = np.trim_zeros(self.num, "f")
+            return lti(num if len(num) else [0.0], self.den)
+
+        return self._cached("lti", build)
+
+    @property
+    def _closed_form(self):
+        return not np.isnan(self.w0)
+
+    def _closed_form_freqresp(self, w):
+        return analytic.general_freqresp(self.num, self.den, w, normalized=True)
+
+    def _closed_form_time(self, response, t, out=None):
+        compute = getattr(analytic, "general_" + response)
+        return compute(self.num, self.den, t, out=out, normalized=True)
+
+    def settling_time(self, tol=0.02, T=None, N=10000):
+        """return the settling time of the step response
+
+        The final value is the static gain num[-1] (den[-1] = 1).
+
+        Args:
+            tol (float, optional): relative width of the settling band. Defaults to 0.02.
+            T (array_like, optional): Time points used to resolve the settling time. Defaults to None.
+            N (int, optional): Number of time points if T is not given. Defaults to 10000.
+
+        Returns:
+            float: settling time (NaN if the response has not settled before T[-1], or if the system has real poles of opposite signs)
+        """
+        if not self._closed_form:
+            return np.nan
+        t = self._time_points(T, N)
+        return analytic.general_settling_time(
+            self.num, self.den, t, tol, normalized=True
+        )
 
     def normalize(self):
         """normalize the linear system"""
-        self.num = self.num / self.den[-1]
-        self.den = self.den / self.den[-1]
+        num, den, m, w0 = analytic.normalize(self.num, self.den)
+        self.clear_cache()
+        self.num = _readonly(num)
+        self.den = _readonly(den)
+        self._cache = {"m": float(m), "w0": float(w0)}
 
 
 class LP(Second_Order_LTI):
@@ -199,6 +672,7 @@ class LP(Second_Order_LTI):
     """
 
     type = "LP"
+    _parameters = ("T0", "m", "w0")
 
     def __init__(self, T0, m, w0):
         """
@@ -213,6 +687,15 @@ class LP(Second_Order_LTI):
         self.m = m
         self.w0 = w0
 
+    @property
+    def gain(self):
+        """Filter amplification
+
+        Returns:
+            float: amplification (here T0)
+        """
+        return self.T0
+
     @property
     def num(self):
         """System numerator
@@ -229,11 +712,9 @@ class LP(Second_Order_LTI):
         Returns:
             array_like: denominator
         """
-        return np.array([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
-
-    @property
-    def lti(self):
-        return lti(self.num, self.den)
+        return self._cached(
+            "den", lambda: _readonly([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
+        )
 
     @property
     def wr(self):
@@ -241,7 +722,12 @@ class LP(Second_Order_LTI):
 
     @property
     def MdB(self):
-        return 1 / (2 * self.m * np.sqrt(1 * self.m ** 2))
+        """Resonance peak |H(jwr)| / gain in dB (0 when m >= 1 / sqrt(2), without resonance)"""
+        if self.m < 1 / np.sqrt(2):
+            MdB = 20 * np.log10(1 / (2 * self.m * np.sqrt(1 - self.m ** 2)))
+        else:
+            MdB = 0.0
+        return MdB
 
 
 class BP(Second_Order_LTI):
@@ -254,6 +740,7 @@ class BP(Second_Order_LTI):
     """
 
     type = "BP"
+    _parameters = ("Tm", "m", "w0")
 
     def __init__(self, Tm, m, w0):
         """
@@ -268,6 +755,15 @@ class BP(Second_Order_LTI):
         self.m = m
         self.w0 = w0
 
+    @property
+    def gain(self):
+        """Filter amplification
+
+        Returns:
+            float: amplification (here Tm)
+        """
+        return self.Tm
+
     @property
     def num(self):
         """System Numerator
@@ -275,7 +771,9 @@ class BP(Second_Order_LTI):
         Returns:
             array_like: system's numerator
         """
-        return np.array([2 * self.m * self.Tm / (self.w0), 0])
+        return self._cached(
+            "num", lambda: _readonly([2 * self.m * self.Tm / (self.w0), 0])
+        )
 
     @property
     def den(self):
@@ -284,16 +782,9 @@ class BP(Second_Order_LTI):
         Returns:
             array_like: system's denominator
         """
-        return np.array([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
-
-    @property
-    def lti(self):
-        """Continuous-time linear time invariant system
-
-        Returns:
-            scipy.signal.lti: lti object
-        """
-        return lti(self.num, self.den)
+        return self._cached(
+            "den", lambda: _readonly([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
+        )
 
     @property
     def wc(self):
@@ -326,6 +817,7 @@ class HP(Second_Order_LTI):
     """
 
     type = "HP"
+    _parameters = ("Too", "m", "w0")
 
     def __init__(self, Too, m, w0):
         """
@@ -340,6 +832,15 @@ class HP(Second_Order_LTI):
         self.m = m
         self.w0 = w0
 
+    @property
+    def gain(self):
+        """Filter amplification
+
+        Returns:
+            float: amplification (here Too)
+        """
+        return self.Too
+
     @property
     def num(self):
         """System Numerator
@@ -347,7 +848,7 @@ class HP(Second_Order_LTI):
         Returns:
             array_like: system's numerator
         """
-        return np.array([self.Too / (self.w0 ** 2), 0, 0])
+        return self._cached("num", lambda: _readonly([self.Too / (self.w0 ** 2), 0, 0]))
 
     @property
     def den(self):
@@ -356,16 +857,9 @@ class HP(Second_Order_LTI):
         Returns:
             array_like: system's denominator
         """
-        return np.array([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
-
-    @property
-    def lti(self):
-        """Continuous-time linear time invariant system
-
-        Returns:
-            scipy.signal.lti: lti object
-        """
-        return lti(self.num, self.den)
+        return self._cached(
+            "den", lambda: _readonly([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
+        )
 
     @property
     def wr(self):
@@ -373,7 +867,12 @@ class HP(Second_Order_LTI):
 
     @property
     def MdB(self):
-        return 1 / (2 * self.m * np.sqrt(1 * self.m ** 2))
+        """Resonance peak |H(jwr)| / gain in dB (0 when m >= 1 / sqrt(2), without resonance)"""
+        if self.m < 1 / np.sqrt(2):
+            MdB = 20 * np.log10(1 / (2 * self.m * np.sqrt(1 - self.m ** 2)))
+        else:
+            MdB = 0.0
+        return MdB
 
 
 class Notch(Second_Order_LTI):
@@ -386,6 +885,7 @@ class Notch(Second_Order_LTI):
     """
 
     type = "Notch"
+    _parameters = ("T0", "m", "w0")
 
     def __init__(self, T0, m, w0):
         """
@@ -401,21 +901,25 @@ class Notch(Second_Order_LTI):
         self.w0 = w0
 
     @property
-    def num(self):
-        return np.array([self.T0 / (self.w0 ** 2), 0, self.T0])
+    def gain(self):
+        """Filter amplification
 
-    @property
-    def den(self):
-        return np.array([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
+        Returns:
+            float: amplification (here T0)
+        """
+        return self.T0
 
     @property
-    def lti(self):
-        """Continuous-time linear time invariant system
+    def num(self):
+        return self._cached(
+            "num", lambda: _readonly([self.T0 / (self.w0 ** 2), 0, self.T0])
+        )
 
-        Returns:
-            scipy.signal.lti: lti object
-        """
-        return lti(self.num, self.den)
+    @property
+    def den(self):
+        return self._cached(
+            "den", lambda: _readonly([1 / (self.w0 ** 2), 2 * self.m / self.w0, 1])
+        )
 
     @property
     def wc(self):
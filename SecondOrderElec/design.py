@@ -0,0 +1,224 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Inverse design: from specifications to (gain, m, w0), then to components.
+
+solve() inverts the closed-form figures of the filters. search() looks for
+the best realisations of (m, w0) with components taken from E-series
+tables: one component per free degree of freedom is enumerated, the others
+are computed exactly and snapped to their neighbouring table values with a
+binary search, so the cost grows with the table size instead of its power.
+"""
+import numpy as np
+
+from . import analytic
+
+E12 = (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2)
+E24 = (
+    1.0, 1.1, 1.2, 1.3, 1.5, 1.6, 1.8, 2.0, 2.2, 2.4, 2.7, 3.0,
+    3.3, 3.6, 3.9, 4.3, 4.7, 5.1, 5.6, 6.2, 6.8, 7.5, 8.2, 9.1,
+)  # fmt: skip
+E96 = (
+    1.00, 1.02, 1.05, 1.07, 1.10, 1.13, 1.15, 1.18, 1.21, 1.24, 1.27, 1.30,
+    1.33, 1.37, 1.40, 1.43, 1.47, 1.50, 1.54, 1.58, 1.62, 1.65, 1.69, 1.74,
+    1.78, 1.82, 1.87, 1.91, 1.96, 2.00, 2.05, 2.10, 2.15, 2.21, 2.26, 2.32,
+    2.37, 2.43, 2.49, 2.55, 2.61, 2.67, 2.74, 2.80, 2.87, 2.94, 3.01, 3.09,
+    3.16, 3.24, 3.32, 3.40, 3.48, 3.57, 3.65, 3.74, 3.83, 3.92, 4.02, 4.12,
+    4.22, 4.32, 4.42, 4.53, 4.64, 4.75, 4.87, 4.99, 5.11, 5.23, 5.36, 5.49,
+    5.62, 5.76, 5.90, 6.04, 6.19, 6.34, 6.49, 6.65, 6.81, 6.98, 7.15, 7.32,
+    7.50, 7.68, 7.87, 8.06, 8.25, 8.45, 8.66, 8.87, 9.09, 9.31, 9.53, 9.76,
+)  # fmt: skip
+SERIES = {"E12": E12, "E24": E24, "E96": E96}
+
+
+def series(name, decades):
+    """return the values of an E-series over several decades
+
+    Args:
+        name (str): "E12", "E24" or "E96"
+        decades (iterable): powers of ten, for instance range(3, 6) for 1k to 976k
+
+    Returns:
+        ndarray: sorted values
+    """
+    base = np.asarray(SERIES[name])
+    return np.sort(np.hstack([base * 10.0 ** decade for decade in decades]))
+
+
+def m_from_overshoot(overshoot):
+    """damping giving a relative step overshoot of a LP filter (0 < overshoot < 1)"""
+    log = np.log(np.asarray(overshoot, dtype=float))
+    return -log / np.sqrt(np.pi ** 2 + log ** 2)
+
+
+def m_from_peak(peak):
+    """damping giving a resonance peak |H(jwr)| / gain of a LP or HP filter (peak >= 1)"""
+    peak = np.asarray(peak, dtype=float)
+    if np.any(peak < 1):
+        raise ValueError("a resonance peak is at least 1 (0 dB)")
+    return np.sqrt((1 - np.sqrt(1 - 1 / peak ** 2)) / 2)
+
+
+def cutoff_ratio(m):
+    """return wc / w0 of a LP filter, wc being its -3 dB frequency (w0 / wc for a HP filter)"""
+    b = 4 * np.asarray(m, dtype=float) ** 2 - 2
+    return np.sqrt((-b + np.sqrt(b * b + 4)) / 2)
+
+
+def solve(
+    filter_type,
+    gain=1,
+    m=None,
+    w0=None,
+    wc=None,
+    delta_w=None,
+    overshoot=None,
+    peak=None,
+):
+    """return the parameters (gain, m, w0) of a filter meeting the specifications
+
+    The damping is given by m, overshoot (LP only), peak (LP and HP),
+    delta_w (BP and Notch, with w0) or the band edges wc = (wc1, wc2) (BP and
+    Notch). The frequency is given by w0 or by the -3 dB cutoff wc (LP and
+    HP). All specifications may be arrays.
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        gain (array_like, optional): amplification. Defaults to 1.
+        m (array_like, optional): damping coefficient. Defaults to None.
+        w0 (array_like, optional): natural frequency (rad/s). Defaults to None.
+        wc (array_like, optional): -3 dB cutoff (LP, HP) or band edges along the last axis (BP, Notch). Defaults to None.
+        delta_w (array_like, optional): bandwidth (BP, Notch). Defaults to None.
+        overshoot (array_like, optional): relative step overshoot (LP). Defaults to None.
+        peak (array_like, optional): resonance peak |H(jwr)| / gain (LP, HP). Defaults to None.
+
+    Returns:
+        tuple: (gain, m, w0)
+    """
+    analytic._check_type(filter_type)
+    band = filter_type in ("BP", "Notch")
+    if overshoot is not None and filter_type != "LP":
+        raise ValueError("overshoot is only a specification of LP filters")
+    if peak is not None and band:
+        raise ValueError("peak is only a specification of LP and HP filters")
+    if delta_w is not None and not band:
+        raise ValueError("delta_w is only a specification of BP and Notch filters")
+
+    if band and wc is not None:
+        if w0 is not None or m is not None or delta_w is not None:
+            raise ValueError("wc = (wc1, wc2) already sets both m and w0")
+        wc = np.asarray(wc, dtype=float)
+        w0 = np.sqrt(wc[..., 0] * wc[..., 1])
+        return gain, (wc[..., 1] - wc[..., 0]) / (2 * w0), w0
+
+    damping = [spec for spec in (m, overshoot, peak, delta_w) if spec is not None]
+    if len(damping) != 1:
+        raise ValueError("exactly one of m, overshoot, peak or delta_w is required")
+    if (w0 is None) == (wc is None):
+        raise ValueError("exactly one of w0 or wc is required")
+
+    if overshoot is not None:
+        m = m_from_overshoot(overshoot)
+    elif peak is not None:
+        m = m_from_peak(peak)
+    elif delta_w is not None:
+        if w0 is None:
+            raise ValueError("delta_w requires w0")
+        m = np.asarray(delta_w, dtype=float) / (2 * np.asarray(w0, dtype=float))
+    if wc is not None:
+        ratio = cutoff_ratio(m)
+        wc = np.asarray(wc, dtype=float)
+        w0 = wc / ratio if filter_type == "LP" else wc * ratio
+    return gain, m, w0
+
+
+def rlc(R, L, C):
+    """(m, w0) of a series RLC circuit (LP across C, HP across L, BP across R, Notch across LC)"""
+    w0 = 1 / np.sqrt(L * C)
+    return R / 2 * np.sqrt(C / L), w0
+
+
+def sallen_key(R1, R2, C1, C2):
+    """(m, w0) of a unity-gain Sallen-Key LP cell (C1 in the feedback path, C2 to ground)"""
+    w0 = 1 / np.sqrt(R1 * R2 * C1 * C2)
+    return C2 * (R1 + R2) * w0 / 2, w0
+
+
+def _neighbours(values, targets):
+    """return the table values just below and just above each target (shape targets.shape + (2,))"""
+    index = np.searchsorted(values, targets)
+    lower = values[np.clip(index - 1, 0, len(values) - 1)]
+    upper = values[np.clip(index, 0, len(values) - 1)]
+    return np.stack((lower, upper), axis=-1)
+
+
+def _best(candidates, m, w0, n_best):
+    """keep the n_best candidates, sorted by relative error on (m, w0)"""
+    error = np.hypot(candidates["m"] / m - 1, candidates["w0"] / w0 - 1)
+    keep = np.argsort(error, kind="stable")[:n_best]
+    result = np.empty(len(keep), dtype=candidates.dtype.descr + [("error", float)])
+    for name in candidates.dtype.names:
+        result[name] = candidates[name][keep]
+    result["error"] = error[keep]
+    return result
+
+
+def _records(names, *columns):
+    records = np.empty(columns[0].size, dtype=[(name, float) for name in names])
+    for name, column in zip(names, columns):
+        records[name] = column.ravel()
+    return records
+
+
+def search(topology, m, w0, resistors, capacitors, inductors=None, n_best=10):
+    """return the best component combinations realising (m, w0)
+
+    Args:
+        topology (str): "rlc" or "sallen_key"
+        m (float): target damping coefficient
+        w0 (float): target natural frequency (rad/s)
+        resistors (array_like): available resistor values (see series)
+        capacitors (array_like): available capacitor values
+        inductors (array_like, optional): available inductor values ("rlc" only). Defaults to None.
+        n_best (int, optional): number of combinations returned. Defaults to 10.
+
+    Returns:
+        ndarray: structured array sorted by increasing error, with the component values, the realised m and w0, and the relative error
+    """
+    resistors = np.sort(np.asarray(resistors, dtype=float))
+    capacitors = np.sort(np.asarray(capacitors, dtype=float))
+    if topology == "rlc":
+        if inductors is None:
+            raise ValueError("the rlc topology requires inductors")
+        inductors = np.sort(np.asarray(inductors, dtype=float))
+        # enumerate C, snap the ideal L, then the ideal R for each L
+        C = capacitors[:, np.newaxis]
+        L = _neighbours(inductors, 1 / (w0 ** 2 * capacitors))
+        R = _neighbours(resistors, 2 * m * np.sqrt(L / C))
+        C, L = (np.broadcast_to(a[..., np.newaxis], R.shape) for a in (C, L))
+        m_real, w0_real = rlc(R, L, C)
+        candidates = _records(("R", "L", "C", "m", "w0"), R, L, C, m_real, w0_real)
+    elif topology == "sallen_key":
+        # enumerate (C1, C2) pairs; R1 + R2 = S and R1 R2 = P are then fixed and
+        # have real solutions only if S^2 >= 4P, that is C2 <= m^2 C1
+        C1, C2 = np.meshgrid(capacitors, capacitors, indexing="ij")
+        feasible = C2 <= m * m * C1
+        C1, C2 = C1[feasible], C2[feasible]
+        S = 2 * m / (w0 * C2)
+        P = 1 / (w0 ** 2 * C1 * C2)
+        root = np.sqrt(np.maximum(S * S - 4 * P, 0))
+        R1 = _neighbours(resistors, (S + root) / 2)[:, :, np.newaxis]
+        R2 = _neighbours(resistors, (S - root) / 2)[:, np.newaxis, :]
+        shape = np.broadcast(R1, R2).shape
+        R1, R2 = np.broadcast_to(R1, shape), np.broadcast_to(R2, shape)
+        C1 = np.broadcast_to(C1[:, np.newaxis, np.newaxis], shape)
+        C2 = np.broadcast_to(C2[:, np.newaxis, np.newaxis], shape)
+        m_real, w0_real = sallen_key(R1, R2, C1, C2)
+        candidates = _records(
+            ("R1", "R2", "C1", "C2", "m", "w0"), R1, R2, C1, C2, m_real, w0_real
+        )
+    else:
+        raise ValueError("unknown topology {!r}".format(topology))
+    return _best(candidates, m, w0, n_best)
@@ -0,0 +1,154 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+import numpy as np
+from scipy.signal import bilinear, cont2discrete, freqz, lfilter, ss2tf
+
+METHODS = ("zoh", "foh", "bilinear", "matched")
+
+
+class Biquad:
+    """
+    Discrete-time second order section
+
+    H(z) = (b0 + b1 z^-1 + b2 z^-2) / (1 + a1 z^-1 + a2 z^-2)
+
+    Biquad.filter runs the section over arrays of any shape along one axis
+    (one channel per position on the other axes) and keeps the state of
+    every channel between calls.
+    """
+
+    def __init__(self, b, a, fs, method=None):
+        """
+        Biquad constructor
+
+        Args:
+            b (array_like): numerator coefficients (in powers of z^-1)
+            a (array_like): denominator coefficients (in powers of z^-1)
+            fs (float): sampling frequency (Hz)
+            method (str, optional): discretization method used to obtain the section. Defaults to None.
+        """
+        b = np.trim_zeros(np.atleast_1d(np.asarray(b, dtype=float)).ravel(), "b")
+        a = np.trim_zeros(np.atleast_1d(np.asarray(a, dtype=float)).ravel(), "b")
+        if len(b) > 3 or len(a) > 3:
+            raise ValueError("a biquad has at most 3 coefficients per polynomial")
+        self.b = np.zeros(3)
+        self.a = np.zeros(3)
+        self.b[: len(b)] = b / a[0]
+        self.a[: len(a)] = a / a[0]
+        self.fs = fs
+        self.method = method
+        self._zi = None
+
+    def __repr__(self):
+        return "Biquad(b={}, a={}, fs={})".format(list(self.b), list(self.a), self.fs)
+
+    @property
+    def sos(self):
+        """Second order section in scipy's sos format
+
+        Returns:
+            ndarray: array of shape (1, 6)
+        """
+        return np.hstack((self.b, self.a))[np.newaxis, :]
+
+    def freqresp(self, w):
+        """return the frequency response at angular frequencies w (rad/s)
+
+        Args:
+            w (array_like): angular frequencies (rad/s)
+
+        Returns:
+            ndarray: H(exp(j w / fs))
+        """
+        w = np.asarray(w, dtype=float)
+        _, Hz = freqz(self.b, self.a, worN=w / self.fs)
+        return Hz
+
+    def reset(self):
+        """clear the state of every channel"""
+        self._zi = None
+
+    def filter(self, x, axis=-1):
+        """filter the next block of samples, continuing from the previous call
+
+        Args:
+            x (array_like): input block, samples along 'axis' and channels along the other axes
+            axis (int, optional): time axis of x. Defaults to -1.
+
+        Returns:
+            ndarray: output block, same shape as x
+        """
+        x = np.asarray(x, dtype=float)
+        zi_shape = list(x.shape)
+        zi_shape[axis] = 2
+        zi_shape = tuple(zi_shape)
+        if self._zi is None:
+            self._zi = np.zeros(zi_shape)
+        elif self._zi.shape != zi_shape:
+            raise ValueError(
+                "block has a channel layout {} different from the previous one {}, "
+                "call reset() first".format(zi_shape, self._zi.shape)
+            )
+        y, self._zi = lfilter(self.b, self.a, x, axis=axis, zi=self._zi)
+        return y
+
+
+def _matched(filter_instance, fs):
+    """matched-z transform: s-plane roots mapped by z = exp(s/fs), zeros at infinity sent to z = -1"""
+    poles = np.asarray(filter_instance.poles)
+    zeros = np.asarray(filter_instance.zeros)
+    zeros_z = np.hstack((np.exp(zeros / fs), -np.ones(len(poles) - len(zeros))))
+    b = np.real(np.poly(zeros_z))
+    a = np.real(np.poly(np.exp(poles / fs)))
+    # match the gain at DC, or at w0 when the filter blocks DC
+    w_ref = 0.0 if np.all(np.abs(zeros) > 0) else filter_instance.w0
+    _, H = filter_instance.lti.freqresp(w=[w_ref])
+    _, Hz = freqz(b, a, worN=[w_ref / fs])
+    return b * _real_gain(H[0] / Hz[0]), a
+
+
+def _real_gain(ratio):
+    """return the real gain closest in magnitude to the complex gain ratio
+
+    Its sign is the one of the real part, + when the ratio is purely
+    imaginary (np.sign would cancel the numerator).
+    """
+    return np.abs(ratio) * np.where(ratio.real < 0, -1.0, 1.0)
+
+
+def discretize(filter_instance, fs, method="zoh", prewarp=False):
+    """return the discrete-time biquad equivalent to a filter
+
+    Args:
+        filter_instance (Second_Order_LTI): continuous-time filter
+        fs (float): sampling frequency (Hz)
+        method (str, optional): "zoh" (zero-order hold), "foh" (input linearly interpolated, as lsim), "bilinear" (Tustin) or "matched" (matched-z). Defaults to "zoh".
+        prewarp (bool, optional): for "bilinear", match the response exactly at w0. Defaults to False.
+
+    Returns:
+        Biquad: discrete-time second order section
+    """
+    if method not in METHODS:
+        raise ValueError(
+            "unknown method {!r}, expected one of {}".format(method, METHODS)
+        )
+    if method in ("zoh", "foh"):
+        ss = filter_instance.ss
+        Ad, Bd, Cd, Dd, _ = cont2discrete(
+            (ss.A, ss.B, ss.C, ss.D), 1 / fs, method=method
+        )
+        b, a = ss2tf(Ad, Bd, Cd, Dd)
+    elif method == "bilinear":
+        # s = K (z - 1) / (z + 1) with K = 2 fs, or K = w0 / tan(w0 / 2fs) when prewarping
+        fs_warped = fs
+        if prewarp:
+            fs_warped = filter_instance.w0 / (2 * np.tan(filter_instance.w0 / (2 * fs)))
+        b, a = bilinear(
+            np.atleast_1d(filter_instance.num), filter_instance.den, fs_warped
+        )
+    else:
+        b, a = _matched(filter_instance, fs)
+    return Biquad(b, a, fs, method=method)
@@ -0,0 +1,247 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Frequency-domain filtering of long, uniformly sampled signals.
+
+The filter is turned into a finite impulse response, truncated where the
+impulse response of the slowest pole has decayed below a tolerance, whose
+FFT is computed once. Signals are then filtered block by block with
+overlap-add or overlap-save, so the memory used only depends on the block
+size and the cost per sample is the one of an FFT.
+
+Two models of the sampled input are available:
+
+* "foh" (default): the input is interpolated linearly between samples, as
+  in output (scipy.signal.lsim) and Simulator. The impulse response is the
+  one of the first order hold discretisation, and the result matches the
+  time-domain simulation up to the truncation tolerance.
+* "bandlimited": the input is band-limited to the Nyquist frequency and
+  the impulse response is the inverse FFT of the closed-form H(jw) sampled
+  on an FFT grid. It is exact for low-pass filters of well sampled
+  signals, but filters whose response does not vanish at the Nyquist
+  frequency (HP, BP, Notch) get a truncated non-causal part.
+
+crosscheck compares both paths on a segment of a signal.
+"""
+import numpy as np
+from numpy.lib.format import open_memmap
+from scipy.fft import irfft, next_fast_len, rfft
+from scipy.signal import lfilter
+
+from .stream import foh_coefficients
+
+METHODS = ("overlap-add", "overlap-save")
+MODELS = ("foh", "bandlimited")
+
+
+def kernel_length(filter_instance, fs, tol=1e-10):
+    """return the number of samples after which the impulse response is below tol (relative)
+
+    Args:
+        filter_instance (Second_Order_LTI): stable filter
+        fs (float): sampling frequency (Hz)
+        tol (float, optional): relative amplitude of the truncated tail. Defaults to 1e-10.
+
+    Returns:
+        int: length of the impulse response kept
+    """
+    decay = np.min(-filter_instance.poles.real)
+    if not decay > 0:
+        raise ValueError("FFT filtering requires a stable filter")
+    return int(np.ceil(np.log(1 / tol) / decay * fs)) + 1
+
+
+def _kernels(filter_instance, fs, tol, model):
+    """return the impulse response and the start-up correction (None for "bandlimited")"""
+    if model not in MODELS:
+        raise ValueError("unknown model {!r}, expected one of {}".format(model, MODELS))
+    length = kernel_length(filter_instance, fs, tol)
+    if model == "foh":
+        num, den, zi = foh_coefficients(filter_instance, 1 / fs)
+        impulse = np.zeros(length)
+        impulse[0] = 1
+        # response to the first input sample when the input starts at it (see stream.Simulator)
+        start = lfilter(num, den, np.zeros(length), zi=zi)[0]
+        return lfilter(num, den, impulse), start
+    if not filter_instance._closed_form:
+        raise ValueError("the bandlimited model requires a closed-form response")
+    n_grid = next_fast_len(2 * length, real=True)
+    w = 2 * np.pi * fs * np.arange(n_grid // 2 + 1) / n_grid
+    Hjw = filter_instance._closed_form_freqresp(w)
+    return irfft(Hjw, n_grid)[:length], None
+
+
+def kernel(filter_instance, fs, tol=1e-10, model="foh"):
+    """return the finite impulse response of a filter sampled at fs
+
+    Args:
+        filter_instance (Second_Order_LTI): stable filter
+        fs (float): sampling frequency (Hz)
+        tol (float, optional): relative amplitude of the truncated tail. Defaults to 1e-10.
+        model (str, optional): "foh" or "bandlimited" (see the module documentation). Defaults to "foh".
+
+    Returns:
+        ndarray: impulse response h, of kernel_length samples
+    """
+    return _kernels(filter_instance, fs, tol, model)[0]
+
+
+class FFTFilter:
+    """
+    Streaming FFT filtering of a signal sampled at fs
+
+    Blocks given to process are filtered as one continuous signal, the
+    overlap between blocks being carried between calls, so splitting a
+    signal gives the same samples as filtering it in one call. The FFT of
+    the impulse response is cached on the filter instance per (block size,
+    sampling frequency, tolerance, model).
+    """
+
+    def __init__(
+        self,
+        filter_instance,
+        fs,
+        block_size=None,
+        method="overlap-add",
+        tol=1e-10,
+        model="foh",
+    ):
+        """
+        FFTFilter constructor
+
+        Args:
+            filter_instance (Second_Order_LTI): stable filter
+            fs (float): sampling frequency (Hz)
+            block_size (int, optional): number of input samples per FFT. Defaults to max(65536, 4 times the kernel length).
+            method (str, optional): "overlap-add" or "overlap-save". Defaults to "overlap-add".
+            tol (float, optional): relative amplitude of the truncated impulse response tail. Defaults to 1e-10.
+            model (str, optional): "foh" or "bandlimited" (see the module documentation). Defaults to "foh".
+        """
+        if method not in METHODS:
+            raise ValueError(
+                "unknown method {!r}, expected one of {}".format(method, METHODS)
+            )
+        if block_size is None:
+            block_size = max(65536, 4 * kernel_length(filter_instance, fs, tol))
+        self.fs = fs
+        self.block_size = int(block_size)
+        self.method = method
+        self.model = model
+
+        def build():
+            h, start = _kernels(filter_instance, fs, tol, model)
+            n_fft = next_fast_len(self.block_size + len(h) - 1, real=True)
+            return h, start, n_fft, rfft(h, n_fft)
+
+        key = "fft.{}.{!r}.{!r}.{}".format(
+            self.block_size, float(fs), float(tol), model
+        )
+        self.kernel, self._start, self.n_fft, self._spectrum = filter_instance._cached(
+            key, build
+        )
+        self.reset()
+
+    def reset(self):
+        """restart from a zero input history"""
+        # overlap-add: tail of the previous outputs, overlap-save: last inputs
+        self._overlap = np.zeros(len(self.kernel) - 1)
+        # output correction still to be added (model "foh", see _kernels)
+        self._pending = np.zeros(0)
+        self.n_samples = 0
+
+    def _block(self, x):
+        n, overlap = len(x), len(self._overlap)
+        if self.method == "overlap-add":
+            y = irfft(rfft(x, self.n_fft) * self._spectrum, self.n_fft)[: n + overlap]
+            y[:overlap] += self._overlap
+            self._overlap = y[n:].copy()
+            return y[:n]
+        frame = np.concatenate((self._overlap, x))
+        y = irfft(rfft(frame, self.n_fft) * self._spectrum, self.n_fft)
+        if overlap:
+            self._overlap = frame[-overlap:]
+        return y[overlap : overlap + n]
+
+    def process(self, U, out=None):
+        """filter the next samples of the signal
+
+        Args:
+            U (array_like): 1-D block of input samples (a memory-mapped array is read block by block)
+            out (ndarray, optional): array of len(U) receiving the output, for instance a memory-mapped file. Defaults to None.
+
+        Returns:
+            ndarray: output samples
+        """
+        if out is None:
+            out = np.empty(len(U))
+        for start in range(0, len(U), self.block_size):
+            stop = min(start + self.block_size, len(U))
+            x = np.asarray(U[start:stop], dtype=float)
+            if self.n_samples == 0 and self._start is not None:
+                # the signal starts at its first sample, not after a ramp from 0
+                self._pending = x[0] * self._start
+            y = self._block(x)
+            if len(self._pending):
+                m = min(len(x), len(self._pending))
+                y[:m] += self._pending[:m]
+                self._pending = self._pending[m:]
+            out[start:stop] = y
+            self.n_samples += len(x)
+        return out
+
+
+def filter_file(
+    filter_instance,
+    source,
+    destination,
+    fs,
+    block_size=None,
+    method="overlap-add",
+    tol=1e-10,
+    model="foh",
+):
+    """filter a signal stored in a .npy file into another .npy file, with bounded memory
+
+    Args:
+        filter_instance (Second_Order_LTI): stable filter
+        source (str): .npy file holding the 1-D input signal
+        destination (str): .npy file receiving the output (float64)
+        fs (float): sampling frequency (Hz)
+        block_size (int, optional): number of samples per FFT (see FFTFilter). Defaults to None.
+        method (str, optional): "overlap-add" or "overlap-save". Defaults to "overlap-add".
+        tol (float, optional): relative amplitude of the truncated impulse response tail. Defaults to 1e-10.
+        model (str, optional): "foh" or "bandlimited" (see the module documentation). Defaults to "foh".
+
+    Returns:
+        numpy.memmap: the output, memory-mapped read-only
+    """
+    U = np.load(source, mmap_mode="r")
+    if U.ndim != 1:
+        raise ValueError("the input signal must be 1-D, got shape {}".format(U.shape))
+    out = open_memmap(destination, mode="w+", dtype=np.float64, shape=U.shape)
+    engine = FFTFilter(filter_instance, fs, block_size, method, tol, model)
+    engine.process(U, out=out)
+    out.flush()
+    del out
+    return np.load(destination, mmap_mode="r")
+
+
+def crosscheck(filter_instance, U, fs, **kwargs):
+    """compare the FFT filtering of a signal with the time-domain simulation (output)
+
+    Args:
+        filter_instance (Second_Order_LTI): stable filter
+        U (array_like): 1-D input segment (a few periods of its slowest content)
+        fs (float): sampling frequency (Hz)
+        **kwargs: arguments of FFTFilter (block_size, method, tol, model)
+
+    Returns:
+        float: maximum difference between the two outputs, relative to the maximum of the time-domain output
+    """
+    U = np.asarray(U, dtype=float)
+    T = np.arange(len(U)) / fs
+    _, expected, _ = filter_instance.output(U, T, plot=False)
+    y = FFTFilter(filter_instance, fs, **kwargs).process(U)
+    return float(np.max(np.abs(y - expected)) / np.max(np.abs(expected)))
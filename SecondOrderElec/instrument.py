@@ -0,0 +1,297 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Instrumentation of the analysis methods.
+
+The methods of Second_Order_LTI wrap their stages (construction of the lti
+and state-space objects, grid computation, solver, plotting, cache lookups)
+in ``stage`` blocks. Each block produces a Record handed to every
+registered hook; without hooks, ``stage`` returns a shared no-op object and
+nothing is measured.
+
+A Recorder is a hook aggregating the records per stage::
+
+    with Recorder() as recorder:
+        LP(1, 0.2, 6000).freqresp(plot=False)
+    print(recorder.report())
+"""
+import threading
+import time
+import tracemalloc
+
+_hooks = []
+# stages currently open in each thread, innermost last
+_local = threading.local()
+# stages measuring memory in any thread: the tracemalloc peak is shared by
+# all threads, so it is handed to all of them before being reset
+_tracing = set()
+_tracing_lock = threading.Lock()
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+# allocations of the instrumentation itself are not counted
+_IGNORED = (tracemalloc.__file__, __file__)
+
+
+def _open_stages():
+    """return the stack of the stages open in the calling thread"""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class Record:
+    """Measurement of one stage
+
+    Attributes:
+        stage (str): name of the stage
+        seconds (float): wall-clock duration (None for events)
+        size (int): number of points processed (None if unknown)
+        peak_bytes (int): memory allocated at the peak of the stage, when tracemalloc is tracing (None otherwise)
+        allocations (int): number of memory blocks allocated by the stage and still alive at its end, when tracemalloc is tracing (None otherwise)
+    """
+
+    __slots__ = ("stage", "seconds", "size", "peak_bytes", "allocations")
+
+    def __init__(
+        self, stage, seconds=None, size=None, peak_bytes=None, allocations=None
+    ):
+        self.stage = stage
+        self.seconds = seconds
+        self.size = size
+        self.peak_bytes = peak_bytes
+        self.allocations = allocations
+
+    def __repr__(self):
+        return (
+            "Record(stage={!r}, seconds={}, size={}, peak_bytes={}, allocations={})"
+        ).format(self.stage, self.seconds, self.size, self.peak_bytes, self.allocations)
+
+
+class _NullStage:
+    """stage returned when instrumentation is disabled
+
+    The object is shared by all the callers, so the size they set is dropped.
+    """
+
+    __slots__ = ()
+
+    @property
+    def size(self):
+        return None
+
+    @size.setter
+    def size(self, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return None
+
+
+_NULL = _NullStage()
+
+
+class _Stage:
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __enter__(self):
+        self.memory = tracemalloc.is_tracing()
+        if self.memory:
+            with _tracing_lock:
+                current, peak = tracemalloc.get_traced_memory()
+                for stage in _tracing:
+                    stage.peak = max(stage.peak, peak)
+                if _reset_peak is not None:
+                    _reset_peak()
+                self.base = self.peak = current
+                _tracing.add(self)
+            _open_stages().append(self)
+            self.snapshot = tracemalloc.take_snapshot()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        peak_bytes = allocations = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            allocations = _new_blocks(self.snapshot, snapshot)
+            self.snapshot = None
+            with _tracing_lock:
+                self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+                _tracing.discard(self)
+            stack = _open_stages()
+            if stack and stack[-1] is self:
+                stack.pop()
+            for stage in stack:
+                stage.peak = max(stage.peak, self.peak)
+            peak_bytes = self.peak - self.base
+        _emit(Record(self.name, seconds, self.size, peak_bytes, allocations))
+
+
+def _new_blocks(before, after):
+    """return the number of blocks allocated between two snapshots and still alive
+
+    Blocks are compared per line of allocation: a line freeing as many
+    blocks as it allocates counts for nothing.
+    """
+    return sum(
+        max(statistic.count_diff, 0)
+        for statistic in after.compare_to(before, "lineno")
+        if statistic.traceback[0].filename not in _IGNORED
+    )
+
+
+def _emit(record):
+    for hook in list(_hooks):
+        hook(record)
+
+
+def stage(name, size=None):
+    """return a context manager measuring the block it wraps
+
+    Args:
+        name (str): name of the stage
+        size (int, optional): number of points processed, may also be set on the returned object. Defaults to None.
+
+    Returns:
+        context manager: its ``size`` attribute can be set inside the block
+    """
+    if not _hooks:
+        return _NULL
+    return _Stage(name, size)
+
+
+def event(name, size=None):
+    """record an event without duration (for instance a cache hit)"""
+    if _hooks:
+        _emit(Record(name, size=size))
+
+
+def add_hook(hook):
+    """register a callable called with every Record"""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """unregister a hook registered with add_hook"""
+    _hooks.remove(hook)
+
+
+def enabled():
+    """return True when at least one hook is registered"""
+    return bool(_hooks)
+
+
+class Recorder:
+    """
+    Hook aggregating the records per stage
+
+    Used as a context manager, the recorder is registered on entry and
+    unregistered on exit. With memory=True, tracemalloc is started for the
+    duration of the block (if it is not tracing already) and the peak
+    allocation and the number of allocated blocks of each stage are
+    recorded; this slows the stages down, as every stage takes two
+    tracemalloc snapshots.
+    """
+
+    def __init__(self, memory=False, callback=None):
+        """
+        Recorder constructor
+
+        Args:
+            memory (bool, optional): record the peak allocation of each stage. Defaults to False.
+            callback (callable, optional): also called with every Record. Defaults to None.
+        """
+        self.memory = memory
+        self.callback = callback
+        self.stages = {}
+        self._lock = threading.Lock()
+        self._started_tracing = False
+
+    def __call__(self, record):
+        with self._lock:
+            counters = self.stages.get(record.stage)
+            if counters is None:
+                counters = self.stages[record.stage] = {
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "size": 0,
+                    "peak_bytes": None,
+                    "allocations": None,
+                }
+            counters["calls"] += 1
+            if record.seconds is not None:
+                counters["seconds"] += record.seconds
+                counters["max_seconds"] = max(counters["max_seconds"], record.seconds)
+            if record.size is not None:
+                counters["size"] += record.size
+            if record.peak_bytes is not None:
+                counters["peak_bytes"] = max(
+                    counters["peak_bytes"] or 0, record.peak_bytes
+                )
+            if record.allocations is not None:
+                counters["allocations"] = (
+                    counters["allocations"] or 0
+                ) + record.allocations
+        if self.callback is not None:
+            self.callback(record)
+
+    def __enter__(self):
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        add_hook(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        remove_hook(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self):
+        """clear the counters"""
+        with self._lock:
+            self.stages = {}
+
+    def report(self):
+        """return the counters as a text table, slowest stages first
+
+        Returns:
+            str: one line per stage with calls, total and mean time, points, peak memory and allocated blocks
+        """
+        lines = [
+            "{:<24} {:>8} {:>12} {:>12} {:>12} {:>12} {:>12}".format(
+                "stage",
+                "calls",
+                "total",
+                "mean",
+                "points",
+                "peak memory",
+                "allocations",
+            )
+        ]
+        stages = sorted(self.stages.items(), key=lambda item: -item[1]["seconds"])
+        for name, counters in stages:
+            peak = counters["peak_bytes"]
+            allocations = counters["allocations"]
+            lines.append(
+                "{:<24} {:>8} {:>10.3f}ms {:>10.3f}ms {:>12} {:>12} {:>12}".format(
+                    name,
+                    counters["calls"],
+                    counters["seconds"] * 1e3,
+                    counters["seconds"] * 1e3 / counters["calls"],
+                    counters["size"],
+                    "" if peak is None else "{:.1f}kB".format(peak / 1024),
+                    "" if allocations is None else allocations,
+                )
+            )
+        return "\n".join(lines)
@@ -0,0 +1,125 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Design figures of second order filters evaluated on whole arrays.
+
+The formulas are the ones of the LP, HP, BP and Notch classes, without
+Python branching: a figure that is not defined for some parameters (for
+instance wp when m >= 1) is NaN there instead of None.
+"""
+import numpy as np
+
+from . import analytic
+
+NAMES = {
+    "LP": ("wp", "Tp", "R", "Q", "wr", "MdB"),
+    "HP": ("wp", "Tp", "R", "Q", "wr", "MdB"),
+    "BP": ("wp", "Tp", "R", "Q", "wc1", "wc2", "delta_w"),
+    "Notch": ("wp", "Tp", "R", "Q", "wc1", "wc2", "delta_w"),
+}
+
+
+def R(m):
+    """Relative overshoot of the step response of a LP filter (0 when m >= 1)"""
+    m = np.asarray(m, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(m < 1, np.exp(-np.pi * m / np.sqrt(1 - m ** 2)), 0.0)
+
+
+def wp(m, w0):
+    """Pseudo-angular frequency of the oscillations (NaN when m >= 1)"""
+    m = np.asarray(m, dtype=float)
+    with np.errstate(invalid="ignore"):
+        return np.where(m < 1, w0 * np.sqrt(1 - m ** 2), np.nan)
+
+
+def Tp(m, w0):
+    """Pseudo-period of the oscillations (NaN when m >= 1)"""
+    with np.errstate(divide="ignore"):
+        return 2 * np.pi / wp(m, w0)
+
+
+def Q(m):
+    """Quality factor"""
+    with np.errstate(divide="ignore"):
+        return 1 / (2 * np.asarray(m, dtype=float))
+
+
+def wr(filter_type, m, w0):
+    """Resonance frequency of LP and HP filters (NaN when there is no resonance)"""
+    if filter_type not in ("LP", "HP"):
+        raise ValueError("wr is only defined for LP and HP filters")
+    m = np.asarray(m, dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        root = np.sqrt(1 - 2 * m ** 2)
+        if filter_type == "LP":
+            return w0 * root
+        return w0 / root
+
+
+def MdB(m):
+    """Resonance peak |H(jwr)| / gain of LP and HP filters in dB (0 when m >= 1 / sqrt(2))"""
+    m = np.asarray(m, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        peak = 20 * np.log10(1 / (2 * m * np.sqrt(1 - m ** 2)))
+        return np.where(m < 1 / np.sqrt(2), peak, 0.0)
+
+
+def wc(m, w0):
+    """Pass band of BP filters, rejected band of Notch filters
+
+    Returns:
+        ndarray: start and stop frequencies along the last axis (shape broadcast(m, w0).shape + (2,))
+    """
+    m, w0 = np.broadcast_arrays(np.asarray(m, dtype=float), np.asarray(w0, dtype=float))
+    root = np.sqrt(1 + m ** 2)
+    return np.stack((w0 * (-m + root), w0 * (m + root)), axis=-1)
+
+
+def delta_w(m, w0):
+    """Bandwidth of BP and Notch filters"""
+    return 2 * np.asarray(m, dtype=float) * w0
+
+
+def compute(filter_type, m, w0, names=None, records=False):
+    """return the design figures of filters of one type
+
+    Args:
+        filter_type (str): one of "LP", "HP", "BP" or "Notch"
+        m (array_like): damping coefficients
+        w0 (array_like): natural frequencies (rad/s)
+        names (tuple, optional): figures to compute, among NAMES[filter_type]. Defaults to all of them.
+        records (bool, optional): return a structured array instead of a dict. Defaults to False.
+
+    Returns:
+        dict or ndarray: {name: array} (or structured array with one field per name), broadcast over m and w0
+    """
+    analytic._check_type(filter_type)
+    if names is None:
+        names = NAMES[filter_type]
+    unknown = set(names) - set(NAMES[filter_type])
+    if unknown:
+        raise ValueError(
+            "{} not defined for {} filters".format(sorted(unknown), filter_type)
+        )
+    m, w0 = np.broadcast_arrays(np.asarray(m, dtype=float), np.asarray(w0, dtype=float))
+    functions = {
+        "wp": lambda: wp(m, w0),
+        "Tp": lambda: Tp(m, w0),
+        "R": lambda: R(m),
+        "Q": lambda: Q(m),
+        "wr": lambda: wr(filter_type, m, w0),
+        "MdB": lambda: MdB(m),
+        "wc1": lambda: wc(m, w0)[..., 0],
+        "wc2": lambda: wc(m, w0)[..., 1],
+        "delta_w": lambda: delta_w(m, w0),
+    }
+    columns = {name: functions[name]() for name in names}
+    if not records:
+        return columns
+    table = np.empty(m.shape, dtype=[(name, float) for name in names])
+    for name in names:
+        table[name] = columns[name]
+    return table
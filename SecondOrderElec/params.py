@@ -0,0 +1,120 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Immutable filter parameters, for storing, hashing and exchanging many filters.
+
+A FilterParams holds (type, gain, m, w0) in four slots: it has no
+``__dict__``, compares and hashes by value (so it can be a dict key or be
+deduplicated in a set) and pickles as a plain tuple. Large collections are
+better kept as structured arrays of dtype DTYPE (to_records,
+from_records), which FilterBank.from_records wraps without copying.
+"""
+import numpy as np
+
+from . import analytic
+from .bank import FILTER_CLASSES
+
+DTYPE = np.dtype([("type", "U5"), ("gain", "f8"), ("m", "f8"), ("w0", "f8")])
+
+
+class FilterParams:
+    """
+    Immutable parameters (type, gain, m, w0) of a LP, HP, BP or Notch filter
+    """
+
+    __slots__ = ("type", "gain", "m", "w0")
+
+    def __init__(self, filter_type, gain, m, w0):
+        """
+        FilterParams constructor
+
+        Args:
+            filter_type (str): one of "LP", "HP", "BP" or "Notch"
+            gain (float): amplification (T0, Tm, Too or T0 of the filter class)
+            m (float): damping coefficient
+            w0 (float): natural frequency (rad/s)
+        """
+        analytic._check_type(filter_type)
+        object.__setattr__(self, "type", str(filter_type))
+        object.__setattr__(self, "gain", float(gain))
+        object.__setattr__(self, "m", float(m))
+        object.__setattr__(self, "w0", float(w0))
+
+    @classmethod
+    def from_filter(cls, filter_instance):
+        """return the parameters of a LP, HP, BP or Notch instance"""
+        return cls(
+            filter_instance.type,
+            filter_instance.gain,
+            filter_instance.m,
+            filter_instance.w0,
+        )
+
+    def to_filter(self):
+        """return a new LP, HP, BP or Notch instance with these parameters"""
+        return FILTER_CLASSES[self.type](self.gain, self.m, self.w0)
+
+    def astuple(self):
+        """return (type, gain, m, w0)"""
+        return (self.type, self.gain, self.m, self.w0)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FilterParams is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FilterParams is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, FilterParams):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __hash__(self):
+        return hash(self.astuple())
+
+    def __reduce__(self):
+        return (FilterParams, self.astuple())
+
+    def __repr__(self):
+        return "FilterParams({!r}, gain={!r}, m={!r}, w0={!r})".format(*self.astuple())
+
+
+def to_records(params):
+    """return filter parameters as a structured array
+
+    Args:
+        params (iterable): FilterParams (or filter instances)
+
+    Returns:
+        ndarray: array of dtype DTYPE, one row per filter
+    """
+    rows = [
+        p.astuple()
+        if isinstance(p, FilterParams)
+        else FilterParams.from_filter(p).astuple()
+        for p in params
+    ]
+    return np.array(rows, dtype=DTYPE)
+
+
+def from_records(records):
+    """return the FilterParams of every row of a structured array of dtype DTYPE
+
+    Args:
+        records (ndarray): structured array with the fields type, gain, m and w0
+
+    Returns:
+        list: FilterParams instances
+    """
+    records = np.asarray(records)
+    return [
+        FilterParams(*row)
+        for row in zip(
+            records["type"].tolist(),
+            records["gain"].tolist(),
+            records["m"].tolist(),
+            records["w0"].tolist(),
+        )
+    ]
@@ -3,49 +3,163 @@
 #
 # @authors: vincentchoqueuse, slashformotion
 ##
-import matplotlib.pyplot as plt
 import numpy as np
 
+# default number of pixel columns the plotted curves are reduced to; the
+# plotting methods take a budget argument (0 to plot every point)
+PIXEL_BUDGET = 2000
 
-def plot_time(t, s, *args):
+
+def decimate(n, ys, budget=None):
+    """return the indices of the points kept to draw curves of n points on 'budget' pixel columns
+
+    The points are split in 'budget' consecutive buckets, and the first,
+    last, smallest and largest points of every bucket are kept (M4
+    decimation), so peaks such as a resonance or an overshoot are drawn
+    exactly. Buckets hold the same number of points, which matches pixel
+    columns for uniform grids on linear axes and logspace grids on log
+    axes.
+
+    Args:
+        n (int): number of points of the curves
+        ys (iterable): curves sharing the x-axis, each of length n (2-D arrays have one curve per column)
+        budget (int, optional): number of pixel columns. Defaults to PIXEL_BUDGET.
+
+    Returns:
+        ndarray or None: sorted indices of the kept points, None when every point is kept
+    """
+    if budget is None:
+        budget = PIXEL_BUDGET
+    if not budget or n <= 4 * budget:
+        return None
+    size = -(-n // budget)
+    count = -(-n // size)
+    starts = np.arange(count) * size
+    keep = [starts, np.minimum(starts + size, n) - 1]
+    padded = np.empty(count * size)
+    for y in ys:
+        y = np.asarray(y)
+        for column in y.reshape(n, -1).T:
+            # the last bucket is padded with its last value
+            padded[:n] = column
+            padded[n:] = column[-1]
+            blocks = padded.reshape(count, size)
+            keep.append(np.minimum(starts + np.argmin(blocks, axis=1), n - 1))
+            keep.append(np.minimum(starts + np.argmax(blocks, axis=1), n - 1))
+    return np.unique(np.concatenate(keep))
+
+
+def _pyplot():
+    """return matplotlib.pyplot, imported on first use
+
+    pyplot is heavy to import and selects a backend, so it is only loaded
+    when something is actually plotted.
+    """
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def plot_time(t, s, *args, budget=None):
     """plot 's' function of 't'
 
     Args:
         t (array_like): time or variable x-axis
         s (array_like): y-axis variable
+        budget (int, optional): number of pixel columns the curves are decimated to (see decimate). Defaults to PIXEL_BUDGET.
     """
+    plt = _pyplot()
+    keep = decimate(len(t), (s,) + args, budget)
+    if keep is not None:
+        t, s = np.asarray(t)[keep], np.asarray(s)[keep]
+        args = tuple(np.asarray(arg)[keep] for arg in args)
     plt.plot(t, s)
     for arg in args:
         plt.plot(t, arg)
     plt.xlabel("time (s)")
 
 
-def plot_bode(w, Tjw):
+def plot_bode(w, Tjw, budget=None):
     """plot the frequency reponse
 
     Args:
         w (array_like): angular velocity (rad/s)
         Tjw (array_like): frequency response
+        budget (int, optional): number of pixel columns the curves are decimated to (see decimate). Defaults to PIXEL_BUDGET.
     """
+    plt = _pyplot()
+    mag, phase = np.abs(Tjw), np.angle(Tjw, deg=True)
+    keep = decimate(len(w), (mag, phase), budget)
+    if keep is not None:
+        w, mag, phase = np.asarray(w)[keep], mag[keep], phase[keep]
     plt.figure("mag")
-    plt.loglog(w, np.abs(Tjw))
+    plt.loglog(w, mag)
     plt.ylabel("Modulus")
     plt.xlabel("Angular Frequency (rad/s)")
 
     plt.figure("phase")
-    plt.semilogx(w, np.angle(Tjw, deg=True))
+    plt.semilogx(w, phase)
     plt.ylabel("Argument")
     plt.xlabel("Angular Frequency (rad/s)")
 
 
-def plot_pzmap(poles, zeros):
+def thin_points(z, budget=None):
+    """return the indices of the complex points kept to draw a cloud of markers
+
+    The bounding box of the points is split in budget x budget cells and
+    one point is kept per occupied cell: overlapping markers are drawn
+    once, isolated points are all kept.
+
+    Args:
+        z (array_like): complex points
+        budget (int, optional): number of cells along each axis. Defaults to PIXEL_BUDGET.
+
+    Returns:
+        ndarray or None: sorted indices of the kept points, None when every point is kept
+    """
+    if budget is None:
+        budget = PIXEL_BUDGET
+    z = np.asarray(z).ravel()
+    if not budget or len(z) <= budget:
+        return None
+    cells = []
+    for x in (z.real, z.imag):
+        finite = x[np.isfinite(x)]
+        if len(finite) == 0:
+            return None
+        low, span = finite.min(), np.ptp(finite)
+        scale = (budget - 1) / span if span > 0 else 0.0
+        cells.append(np.nan_to_num((x - low) * scale).astype(np.int64))
+    _, keep = np.unique(cells[0] * budget + cells[1], return_index=True)
+    return np.sort(keep)
+
+
+def plot_pzmap(poles, zeros, budget=None, locus=False):
     """plot poles and zeros
 
     Args:
-        poles (array_like: poles
+        poles (array_like): poles, of shape (N, 2) for N filters
         zeros (array_like): zeros
+        budget (int, optional): resolution the markers (or locus branches) are thinned to, see thin_points and decimate. Defaults to PIXEL_BUDGET.
+        locus (bool, optional): draw each column of poles as a line (root locus of filters sorted by a parameter). Defaults to False.
     """
-    plt.plot(poles.real, poles.imag, "x", markersize=5)
+    plt = _pyplot()
+    poles, zeros = np.asarray(poles), np.asarray(zeros).ravel()
+    if locus:
+        poles = poles.reshape(len(poles), -1)
+        keep = decimate(len(poles), (poles.real, poles.imag), budget)
+        if keep is not None:
+            poles = poles[keep]
+        plt.plot(poles.real, poles.imag, "-")
+    else:
+        poles = poles.ravel()
+        keep = thin_points(poles, budget)
+        if keep is not None:
+            poles = poles[keep]
+        plt.plot(poles.real, poles.imag, "x", markersize=5)
+    keep = thin_points(zeros, budget)
+    if keep is not None:
+        zeros = zeros[keep]
     plt.plot(zeros.real, zeros.imag, "o", markersize=5)
 
     plt.axis("scaled")
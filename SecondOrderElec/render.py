@@ -0,0 +1,219 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Non-interactive rendering of responses to image files.
+
+Unlike the functions of plot.py, which draw through pyplot's global state,
+a Renderer owns one matplotlib Figure attached to an Agg canvas. The axes,
+labels and lines are created once; rendering a filter only replaces the
+data of the lines, rescales the axes and writes the file. render_batch
+spreads a list of filters over worker processes, each of them reusing its
+own Renderer.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .cache import fingerprint
+from .plot import decimate
+
+KINDS = ("bode", "step", "impulse", "pzmap")
+
+
+class Renderer:
+    """
+    Figure template for one kind of plot ("bode", "step", "impulse" or "pzmap")
+    """
+
+    def __init__(
+        self, kind="bode", figsize=(6.4, 4.8), dpi=100, budget=None, **options
+    ):
+        """
+        Renderer constructor
+
+        Args:
+            kind (str, optional): "bode", "step", "impulse" or "pzmap". Defaults to "bode".
+            figsize (tuple, optional): figure size (inches). Defaults to (6.4, 4.8).
+            dpi (int, optional): resolution of raster images. Defaults to 100.
+            budget (int, optional): number of pixel columns the curves are decimated to (see plot.decimate). Defaults to plot.PIXEL_BUDGET.
+            **options: arguments of the analysis method (w or n for "bode", T or N for "step" and "impulse")
+        """
+        if kind not in KINDS:
+            raise ValueError(
+                "unknown kind {!r}, expected one of {}".format(kind, KINDS)
+            )
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        self.kind = kind
+        self.budget = budget
+        self.options = options
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.figure)
+        self.axes = []
+        self.lines = []
+        getattr(self, "_template_" + kind)()
+
+    def _template_bode(self):
+        mag, phase = self.figure.subplots(2, 1, sharex=True)
+        mag.set_xscale("log")
+        mag.set_yscale("log")
+        mag.set_ylabel("Modulus")
+        phase.set_ylabel("Argument")
+        phase.set_xlabel("Angular Frequency (rad/s)")
+        self.axes = [mag, phase]
+        self.lines = [mag.plot([], [])[0], phase.plot([], [])[0]]
+
+    def _template_step(self):
+        ax = self.figure.subplots()
+        ax.set_xlabel("time (s)")
+        self.axes = [ax]
+        self.lines = [ax.plot([], [])[0], ax.plot([], [])[0]]
+
+    def _template_impulse(self):
+        ax = self.figure.subplots()
+        ax.set_xlabel("time (s)")
+        self.axes = [ax]
+        self.lines = [ax.plot([], [])[0]]
+
+    def _template_pzmap(self):
+        ax = self.figure.subplots()
+        ax.set_aspect("equal", adjustable="datalim")
+        ax.grid()
+        ax.set_xlabel("Real Part")
+        ax.set_ylabel("Imag Part")
+        self.axes = [ax]
+        self.lines = [
+            ax.plot([], [], "x", markersize=5)[0],
+            ax.plot([], [], "o", markersize=5)[0],
+        ]
+
+    def _data(self, filter_instance):
+        """return the (x, y) data of every line of the template"""
+        if self.kind == "bode":
+            w, Tjw = filter_instance.freqresp(plot=False, **self.options)
+            return [(w, np.abs(Tjw)), (w, np.angle(Tjw, deg=True))]
+        if self.kind == "step":
+            t, s = filter_instance.step(plot=False, **self.options)
+            return [(t, s), (t, t >= 0)]
+        if self.kind == "impulse":
+            return [filter_instance.impulse(plot=False, **self.options)]
+        poles, zeros = filter_instance.pzmap(plot=False)
+        return [(poles.real, poles.imag), (zeros.real, zeros.imag)]
+
+    def draw(self, filter_instance):
+        """update the figure with the response of a filter
+
+        Args:
+            filter_instance (Second_Order_LTI): filter to draw
+
+        Returns:
+            matplotlib.figure.Figure: the figure of the renderer
+        """
+        data = self._data(filter_instance)
+        keep = None
+        if self.kind != "pzmap":
+            keep = decimate(len(data[0][0]), [y for _, y in data], self.budget)
+        for line, (x, y) in zip(self.lines, data):
+            if keep is not None:
+                x, y = x[keep], y[keep]
+            line.set_data(x, y)
+        for ax in self.axes:
+            ax.relim()
+            ax.autoscale_view()
+        return self.figure
+
+    def render(self, filter_instance, filename, format=None):
+        """draw a filter and write the figure to a file
+
+        Args:
+            filter_instance (Second_Order_LTI): filter to draw
+            filename (str): output file
+            format (str, optional): "png", "svg", "pdf"... Defaults to the extension of filename.
+
+        Returns:
+            str: filename
+        """
+        self.draw(filter_instance)
+        self.figure.savefig(filename, format=format)
+        return filename
+
+
+# renderers of a worker process, reused from one chunk to the next
+_renderers = {}
+
+
+def _render_chunk(kind, figsize, dpi, budget, options, items):
+    key = (
+        kind,
+        figsize,
+        dpi,
+        budget,
+        tuple(sorted((name, fingerprint(value)) for name, value in options.items())),
+    )
+    renderer = _renderers.get(key)
+    if renderer is None:
+        renderer = _renderers[key] = Renderer(kind, figsize, dpi, budget, **options)
+    return [
+        renderer.render(filter_instance, filename)
+        for filter_instance, filename in items
+    ]
+
+
+def render_batch(
+    filters,
+    directory,
+    kind="bode",
+    fmt="png",
+    filenames=None,
+    max_workers=None,
+    chunk_size=50,
+    figsize=(6.4, 4.8),
+    dpi=100,
+    budget=None,
+    **options
+):
+    """render a list of filters to image files
+
+    Args:
+        filters (iterable): filters to render
+        directory (str): output directory (created if needed)
+        kind (str, optional): "bode", "step", "impulse" or "pzmap". Defaults to "bode".
+        fmt (str, optional): image format, "png" or "svg" for instance. Defaults to "png".
+        filenames (list, optional): file names, relative to directory. Defaults to "<index>_<type>.<fmt>".
+        max_workers (int, optional): number of worker processes, 0 to render in this process. Defaults to the number of CPUs.
+        chunk_size (int, optional): number of images rendered per task. Defaults to 50.
+        figsize (tuple, optional): figure size (inches). Defaults to (6.4, 4.8).
+        dpi (int, optional): resolution of raster images. Defaults to 100.
+        budget (int, optional): number of pixel columns the curves are decimated to. Defaults to plot.PIXEL_BUDGET.
+        **options: arguments of the analysis method (see Renderer)
+
+    Returns:
+        list: paths of the written files, in the order of filters
+    """
+    filters = list(filters)
+    if filenames is None:
+        width = len(str(max(len(filters) - 1, 0)))
+        filenames = [
+            "{:0{}d}_{}.{}".format(i, width, filter_instance.type, fmt)
+            for i, filter_instance in enumerate(filters)
+        ]
+    if len(filenames) != len(filters):
+        raise ValueError("filenames and filters have different lengths")
+    os.makedirs(directory, exist_ok=True)
+    items = [
+        (filter_instance, os.path.join(directory, name))
+        for filter_instance, name in zip(filters, filenames)
+    ]
+    chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+    args = (kind, tuple(figsize), dpi, budget, options)
+    if max_workers == 0:
+        results = [_render_chunk(*args, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_render_chunk, *args, chunk) for chunk in chunks]
+            results = [future.result() for future in futures]
+    return [path for chunk in results for path in chunk]
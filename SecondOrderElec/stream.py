@@ -0,0 +1,178 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.signal import cont2discrete, lfilter, ss2tf
+
+
+class Simulator:
+    """
+    Streaming simulation of a filter driven by a uniformly sampled input
+
+    The continuous system is discretised once with the same model as
+    scipy.signal.lsim (input linearly interpolated between samples). The
+    input is then filtered block by block and the filter state is carried
+    between calls, so splitting a signal in blocks gives exactly the same
+    samples as processing it in one call.
+    """
+
+    def __init__(self, filter_instance, dt, X0=None, return_state=False):
+        """
+        Simulator constructor
+
+        Args:
+            filter_instance (Second_Order_LTI): filter to simulate
+            dt (float): sampling period of the input (s)
+            X0 (array_like, optional): initial state vector (zero by default). Defaults to None.
+            return_state (bool, optional): also return the state trajectory. Defaults to False.
+        """
+        ss = filter_instance.ss
+        self.dt = dt
+        self.return_state = return_state
+        self.order = ss.A.shape[0]
+
+        # outputs: y, then each component of the state vector
+        C = np.vstack((ss.C, np.eye(self.order)))
+        D = np.vstack((ss.D, np.zeros((self.order, ss.D.shape[1]))))
+        Ad, Bd, Cd, Dd, _ = cont2discrete((ss.A, ss.B, C, D), dt, method="foh")
+        nums, den = ss2tf(Ad, Bd, Cd, Dd)
+        # without state trajectory, only the output filter is run
+        rows = len(C) if return_state else 1
+        self._Ad = Ad
+        self._Cd = Cd[:rows]
+        self._Bd1 = Dd[-self.order :, 0]
+        self._nums = nums[:rows]
+        self._den = den
+        self.reset(X0)
+
+    def reset(self, X0=None):
+        """restart the simulation from the initial state X0
+
+        Args:
+            X0 (array_like, optional): initial state vector (zero by default). Defaults to None.
+        """
+        self._X0 = np.zeros(self.order) if X0 is None else np.asarray(X0, dtype=float)
+        self._zi = None
+        self.n_samples = 0
+
+    def _initial_conditions(self, u0):
+        """return the lfilter states of every output for the initial state X0"""
+        n = self.order
+        zi = np.zeros((len(self._nums), n))
+        # discrete state of the foh model: xi[0] = x[0] - Bd1 u[0]
+        xi = self._X0 - self._Bd1 * u0
+        # zero-input response of each output over the first n samples
+        y = np.empty((len(self._nums), n))
+        for k in range(n):
+            y[:, k] = self._Cd @ xi
+            xi = self._Ad @ xi
+        a = self._den
+        for k in range(n):
+            zi[:, k] = y[:, k::-1] @ a[: k + 1]
+        return zi
+
+    def process(self, U):
+        """filter the next block of input samples
+
+        Args:
+            U (array_like): 1-D block of input samples
+
+        Returns:
+            ndarray or tuple(ndarray, ndarray): output block, and the state trajectory of shape (len(U), order) if return_state is True
+        """
+        U = np.asarray(U, dtype=float)
+        if self._zi is None:
+            if len(U) == 0:
+                return self._empty()
+            self._zi = self._initial_conditions(U[0])
+        outputs = np.empty((len(self._nums), len(U)))
+        for i, num in enumerate(self._nums):
+            outputs[i], self._zi[i] = lfilter(num, self._den, U, zi=self._zi[i])
+        self.n_samples += len(U)
+        if self.return_state:
+            return outputs[0], outputs[1:].T
+        return outputs[0]
+
+    def _empty(self):
+        if self.return_state:
+            return np.empty(0), np.empty((0, self.order))
+        return np.empty(0)
+
+
+def _uniform_step(t):
+    """return the sampling period of equally spaced time points"""
+    if len(t) < 2:
+        return 1.0
+    dt = t[1] - t[0]
+    if dt <= 0 or not np.allclose(np.diff(t), dt, rtol=1e-6, atol=0):
+        raise ValueError("time points must be increasing and equally spaced")
+    return dt
+
+
+def foh_coefficients(filter_instance, dt):
+    """return the first order hold discretisation of a filter, as used by filter_channels
+
+    Args:
+        filter_instance (Second_Order_LTI): filter to discretise
+        dt (float): sampling period (s)
+
+    Returns:
+        tuple(ndarray, ndarray, ndarray): (numerator, denominator, lfilter state for a zero initial state and a first input sample of 1)
+    """
+    simulator = Simulator(filter_instance, dt)
+    # from a zero state, the initial lfilter state is proportional to the first input sample
+    zi = simulator._initial_conditions(1.0)[0]
+    return simulator._nums[0], simulator._den, zi
+
+
+def filter_channels(coefficients, U, axis=-1, max_workers=0):
+    """filter independent channels through one discretised filter
+
+    Every channel starts from a zero state, its input being interpolated
+    linearly between samples as in scipy.signal.lsim. The channels are
+    filtered by a single lfilter call (or one call per block of channels
+    with max_workers != 0).
+
+    Args:
+        coefficients (tuple): result of foh_coefficients
+        U (array_like): input samples, time along 'axis' and channels along the other axes
+        axis (int, optional): time axis of U. Defaults to -1.
+        max_workers (int, optional): number of threads, each filtering a block of channels, 0 to filter in this thread, None for the number of CPUs. Defaults to 0.
+
+    Returns:
+        ndarray: outputs, with the layout of U
+    """
+    num, den, zi = coefficients
+    U = np.asarray(U, dtype=float)
+    axis = axis % U.ndim
+    if U.shape[axis] == 0:
+        return np.empty(U.shape)
+    shape = [1] * U.ndim
+    shape[axis] = len(zi)
+    zi = zi.reshape(shape) * np.take(U, [0], axis=axis)
+    channel_axes = [i for i in range(U.ndim) if i != axis and U.shape[i] > 1]
+    if max_workers == 0 or not channel_axes:
+        return lfilter(num, den, U, axis=axis, zi=zi)[0]
+    split = channel_axes[0]
+    out = np.empty(U.shape)
+    blocks = min(U.shape[split], max_workers or os.cpu_count() or 1)
+    bounds = np.linspace(0, U.shape[split], blocks + 1).astype(int)
+
+    def run(start, stop):
+        index = [slice(None)] * U.ndim
+        index[split] = slice(start, stop)
+        index = tuple(index)
+        out[index] = lfilter(num, den, U[index], axis=axis, zi=zi[index])[0]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [
+            executor.submit(run, start, stop)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+        ]:
+            future.result()
+    return out
@@ -0,0 +1,262 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Parameter sweeps over (gain, m, w0) grids spread over a process pool.
+
+Results are written by the workers directly into memory-mapped ``.npy``
+files of the sweep directory, so nothing but chunk indices travels between
+processes. Completed chunks are recorded in the directory: running the same
+sweep again only computes the chunks that are missing.
+"""
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from numpy.lib.format import open_memmap
+
+from . import analytic, metrics
+from .bank import FilterBank
+
+ANALYSES = ("freqresp", "step", "impulse", "pzmap", "metrics")
+
+
+def _outputs(spec):
+    """return {name: (shape, dtype)} of every result array of a sweep"""
+    n = int(np.prod(spec["shape"]))
+    outputs = {}
+    for analysis in spec["analyses"]:
+        if analysis == "freqresp":
+            outputs["freqresp"] = ((n, len(spec["w"])), "complex128")
+        elif analysis in ("step", "impulse"):
+            outputs[analysis] = ((n, len(spec["T"])), "float64")
+        elif analysis == "pzmap":
+            outputs["poles"] = ((n, 2), "complex128")
+        else:
+            for metric in metrics.NAMES[spec["filter_type"]]:
+                outputs[metric] = ((n,), "float64")
+    return outputs
+
+
+def _bank(spec, start, stop):
+    index = np.unravel_index(np.arange(start, stop), spec["shape"])
+    return FilterBank(
+        spec["filter_type"],
+        np.asarray(spec["gain"])[index[0]],
+        np.asarray(spec["m"])[index[1]],
+        np.asarray(spec["w0"])[index[2]],
+    )
+
+
+def _run_chunk(spec, directory, chunk):
+    """compute one chunk of a sweep and write it into the result files"""
+    start = chunk * spec["chunk_size"]
+    stop = min(start + spec["chunk_size"], int(np.prod(spec["shape"])))
+    bank = _bank(spec, start, stop)
+    figures = None
+    for name in _outputs(spec):
+        result = open_memmap(os.path.join(directory, name + ".npy"), mode="r+")
+        if name == "freqresp":
+            analytic.freqresp(
+                bank.type,
+                bank.gain[:, np.newaxis],
+                bank.m[:, np.newaxis],
+                bank.w0[:, np.newaxis],
+                np.asarray(spec["w"]),
+                out=result[start:stop],
+            )
+        elif name in ("step", "impulse"):
+            response = getattr(analytic, name)
+            T = np.asarray(spec["T"])
+            result[start:stop] = response(bank.type, bank.gain, bank.m, bank.w0, T)
+        elif name == "poles":
+            result[start:stop] = bank.pzmap()[0]
+        else:
+            if figures is None:
+                figures = bank.metrics()
+            result[start:stop] = figures[name]
+        result.flush()
+        del result
+    return chunk
+
+
+class Sweep:
+    """
+    Sweep of one filter type over the cartesian grid gain x m x w0
+
+    Row i of every result corresponds to the parameters
+    (Sweep.parameters[0][i], Sweep.parameters[1][i], Sweep.parameters[2][i]),
+    the grid being flattened in C order (w0 varying fastest).
+    """
+
+    def __init__(
+        self,
+        filter_type,
+        gain,
+        m,
+        w0,
+        analyses=("freqresp",),
+        w=None,
+        T=None,
+        directory=None,
+        chunk_size=10000,
+    ):
+        """
+        Sweep constructor
+
+        Args:
+            filter_type (str): one of "LP", "HP", "BP" or "Notch"
+            gain (array_like): gain values
+            m (array_like): damping coefficient values
+            w0 (array_like): natural frequency values
+            analyses (tuple, optional): analyses among "freqresp", "step", "impulse", "pzmap" and "metrics". Defaults to ("freqresp",).
+            w (array_like, optional): angular frequencies for "freqresp". Defaults to None.
+            T (array_like, optional): time points for "step" and "impulse". Defaults to None.
+            directory (str, optional): directory of the result files, a temporary one if not given. Defaults to None.
+            chunk_size (int, optional): number of filters computed per task. Defaults to 10000.
+        """
+        analytic._check_type(filter_type)
+        for analysis in analyses:
+            if analysis not in ANALYSES:
+                raise ValueError(
+                    "unknown analysis {!r}, expected one of {}".format(
+                        analysis, ANALYSES
+                    )
+                )
+        if "freqresp" in analyses and w is None:
+            raise ValueError("w is required for the freqresp analysis")
+        if ("step" in analyses or "impulse" in analyses) and T is None:
+            raise ValueError("T is required for the step and impulse analyses")
+        grids = [
+            np.atleast_1d(np.asarray(v, dtype=float)).ravel() for v in (gain, m, w0)
+        ]
+        self.spec = {
+            "filter_type": filter_type,
+            "gain": grids[0].tolist(),
+            "m": grids[1].tolist(),
+            "w0": grids[2].tolist(),
+            "shape": [len(grid) for grid in grids],
+            "analyses": list(analyses),
+            "w": None if w is None else np.asarray(w, dtype=float).tolist(),
+            "T": None if T is None else np.asarray(T, dtype=float).tolist(),
+            "chunk_size": int(chunk_size),
+        }
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="secondorderelec-sweep-")
+        self.directory = directory
+        self._open()
+
+    def __len__(self):
+        return int(np.prod(self.spec["shape"]))
+
+    @property
+    def n_chunks(self):
+        return -(-len(self) // self.spec["chunk_size"])
+
+    @property
+    def parameters(self):
+        """Flattened grid
+
+        Returns:
+            tuple(ndarray, ndarray, ndarray): (gain, m, w0) of every row of the results
+        """
+        bank = _bank(self.spec, 0, len(self))
+        return bank.gain, bank.m, bank.w0
+
+    def _open(self):
+        """create the result files, or check that the existing ones belong to the same sweep"""
+        os.makedirs(self.directory, exist_ok=True)
+        manifest = os.path.join(self.directory, "sweep.json")
+        if os.path.exists(manifest):
+            with open(manifest) as f:
+                if json.load(f) != self.spec:
+                    raise ValueError(
+                        "{} holds the results of a different sweep".format(
+                            self.directory
+                        )
+                    )
+            return
+        for name, (shape, dtype) in _outputs(self.spec).items():
+            open_memmap(
+                os.path.join(self.directory, name + ".npy"),
+                mode="w+",
+                dtype=dtype,
+                shape=shape,
+            )
+        open_memmap(
+            os.path.join(self.directory, "done.npy"),
+            mode="w+",
+            dtype=bool,
+            shape=(self.n_chunks,),
+        )
+        # the manifest is written last: its presence means the files are complete
+        with open(manifest, "w") as f:
+            json.dump(self.spec, f)
+
+    @property
+    def done(self):
+        """Completion flag of every chunk
+
+        Returns:
+            ndarray: boolean array of length n_chunks
+        """
+        return np.load(os.path.join(self.directory, "done.npy"))
+
+    def run(self, max_workers=None, progress=None):
+        """compute every chunk not completed yet
+
+        Args:
+            max_workers (int, optional): number of worker processes, 0 to compute in this process. Defaults to the number of CPUs.
+            progress (callable, optional): called as progress(done_filters, total_filters) after each chunk. Defaults to None.
+
+        Returns:
+            dict: result arrays (see Sweep.results)
+        """
+        done = open_memmap(os.path.join(self.directory, "done.npy"), mode="r+")
+        pending = np.flatnonzero(~done).tolist()
+        completed = len(self) - sum(self._chunk_length(chunk) for chunk in pending)
+
+        def mark(chunk):
+            done[chunk] = True
+            done.flush()
+            if progress is not None:
+                progress(completed, len(self))
+
+        if max_workers == 0:
+            for chunk in pending:
+                _run_chunk(self.spec, self.directory, chunk)
+                completed += self._chunk_length(chunk)
+                mark(chunk)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(_run_chunk, self.spec, self.directory, chunk)
+                    for chunk in pending
+                ]
+                for future in as_completed(futures):
+                    chunk = future.result()
+                    completed += self._chunk_length(chunk)
+                    mark(chunk)
+        del done
+        return self.results()
+
+    def _chunk_length(self, chunk):
+        start = chunk * self.spec["chunk_size"]
+        return min(self.spec["chunk_size"], len(self) - start)
+
+    def results(self, mode="r"):
+        """return the result arrays, memory-mapped from the sweep directory
+
+        Args:
+            mode (str, optional): memory-map mode. Defaults to "r".
+
+        Returns:
+            dict: {name: array} with "freqresp", "step", "impulse", "poles" and one entry per metric, depending on the analyses
+        """
+        return {
+            name: np.load(os.path.join(self.directory, name + ".npy"), mmap_mode=mode)
+            for name in _outputs(self.spec)
+        }
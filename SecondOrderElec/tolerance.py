@@ -0,0 +1,402 @@
+##
+# This file is subject to the terms and conditions defined in file 'LICENSE', which is part of this source code package.
+#
+# @authors: vincentchoqueuse, slashformotion
+##
+"""Monte Carlo tolerance and yield analysis.
+
+The filter parameters (gain, m, w0), or the component values of a topology
+of the design module, are drawn from Uniform or Normal distributions,
+possibly correlated (Gaussian copula). The samples are generated and
+evaluated as arrays, one chunk at a time, so the memory used does not
+depend on the number of samples::
+
+    analysis = MonteCarlo(
+        "LP",
+        {"R": Normal(1e3, 0.01), "L": 10e-3, "C": Uniform(100e-9, 0.05)},
+        specs={"m": (0.4, 0.6)},
+        topology="rlc",
+    )
+    result = analysis.run(10 ** 6, seed=0)
+    print(result.yield_)
+
+Chunks have their own random stream (spawned from the seed), so the
+results do not depend on the number of worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy.special import ndtr
+
+from . import analytic, design, metrics
+
+TOPOLOGIES = {"rlc": design.rlc, "sallen_key": design.sallen_key}
+
+
+class Uniform:
+    """
+    Value uniformly distributed in nominal * [1 - tol, 1 + tol]
+    """
+
+    def __init__(self, nominal, tol):
+        """
+        Uniform constructor
+
+        Args:
+            nominal (float): nominal value
+            tol (float): relative tolerance (0.05 for 5 %)
+        """
+        self.nominal = float(nominal)
+        self.tol = float(tol)
+
+    def __repr__(self):
+        return "Uniform({}, tol={})".format(self.nominal, self.tol)
+
+    def transform(self, z):
+        """map standard normal samples to the distribution"""
+        return self.nominal * (1 + self.tol * (2 * ndtr(z) - 1))
+
+
+class Normal:
+    """
+    Normally distributed value, nominal * (1 + N(0, tol / sigmas))
+    """
+
+    def __init__(self, nominal, tol, sigmas=3):
+        """
+        Normal constructor
+
+        Args:
+            nominal (float): nominal value
+            tol (float): relative tolerance (0.05 for 5 %)
+            sigmas (float, optional): number of standard deviations covered by tol. Defaults to 3.
+        """
+        self.nominal = float(nominal)
+        self.tol = float(tol)
+        self.sigmas = float(sigmas)
+
+    def __repr__(self):
+        return "Normal({}, tol={}, sigmas={})".format(
+            self.nominal, self.tol, self.sigmas
+        )
+
+    def transform(self, z):
+        """map standard normal samples to the distribution"""
+        return self.nominal * (1 + self.tol / self.sigmas * z)
+
+
+class Mask:
+    """
+    Frequency mask: bounds (dB) on the magnitude of the frequency response
+    """
+
+    def __init__(self, w, low=None, high=None):
+        """
+        Mask constructor
+
+        Args:
+            w (array_like): angular frequencies (rad/s)
+            low (array_like, optional): lower bound at each frequency (dB). Defaults to None.
+            high (array_like, optional): upper bound at each frequency (dB). Defaults to None.
+        """
+        self.w = np.atleast_1d(np.asarray(w, dtype=float))
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        self.low = np.broadcast_to(np.asarray(low, dtype=float), self.w.shape)
+        self.high = np.broadcast_to(np.asarray(high, dtype=float), self.w.shape)
+
+    def margin(self, filter_type, gain, m, w0):
+        """return the smallest distance (dB) to the bounds of every filter, negative when the mask is violated"""
+        mag = analytic.magnitude_db(
+            filter_type,
+            gain[:, np.newaxis],
+            m[:, np.newaxis],
+            w0[:, np.newaxis],
+            self.w,
+        )
+        margin = np.min(self.high - mag, axis=1)
+        if np.isfinite(self.low).any():
+            margin = np.minimum(margin, np.min(mag - self.low, axis=1))
+        return margin
+
+
+class ToleranceResult:
+    """
+    Summary of a Monte Carlo run
+
+    Attributes:
+        n (int): number of samples
+        passed (int): number of samples meeting every spec and mask
+        yield_ (float): passed / n
+        spec_yield (dict): {spec name: fraction of the samples meeting it}
+        histograms (dict): {name: (counts, edges)} of every spec value (samples beyond the edges are counted in the outer bins)
+        worst (dict): {spec name: structured array of the samples closest to (or furthest beyond) the spec, worst first}
+    """
+
+    def __init__(self, n, passed, spec_passed, histograms, worst):
+        self.n = n
+        self.passed = passed
+        self.yield_ = passed / n if n else float("nan")
+        self.spec_yield = {
+            name: count / n if n else float("nan")
+            for name, count in spec_passed.items()
+        }
+        self.histograms = histograms
+        self.worst = worst
+
+    def __repr__(self):
+        return "ToleranceResult(n={}, yield_={:.4%})".format(self.n, self.yield_)
+
+
+def _margin(values, low, high):
+    """return the distance to the closest bound, negative outside [low, high] and NaN for NaN values"""
+    low = -np.inf if low is None else low
+    high = np.inf if high is None else high
+    return np.minimum(values - low, high - values)
+
+
+def _keep_worst(rows, n_worst):
+    order = np.argsort(rows["margin"], kind="stable")
+    return rows[order[:n_worst]]
+
+
+def _run_chunk(analysis, seed, size, edges, bins, n_worst):
+    """evaluate one chunk of samples and return its partial summary"""
+    values = analysis.sample(size, seed)
+    margins = analysis.evaluate(values)
+    passed = np.ones(size, dtype=bool)
+    spec_passed = {}
+    for name, margin in margins.items():
+        # NaN (undefined metric) fails the spec
+        ok = margin >= 0
+        spec_passed[name] = int(np.count_nonzero(ok))
+        passed &= ok
+    # spec values are histogrammed, masks are represented by their margin
+    columns = {name: values.get(name, margin) for name, margin in margins.items()}
+    if edges is None:
+        edges = {}
+        for name, column in columns.items():
+            finite = column[np.isfinite(column)]
+            if len(finite) == 0:
+                finite = np.zeros(1)
+            low, high = finite.min(), finite.max()
+            if low == high:
+                low, high = low - 0.5, high + 0.5
+            edges[name] = np.linspace(low, high, bins + 1)
+    counts = {}
+    for name, column in columns.items():
+        column = np.clip(column[np.isfinite(column)], edges[name][0], edges[name][-1])
+        counts[name] = np.histogram(column, bins=edges[name])[0]
+    fields = list(analysis.variables)
+    worst = {}
+    for name, margin in margins.items():
+        # NaN margins (undefined metric) are the worst of all
+        key = np.where(np.isnan(margin), -np.inf, margin)
+        keep = np.arange(size)
+        if size > n_worst:
+            keep = np.argpartition(key, n_worst - 1)[:n_worst]
+        keep = keep[np.argsort(key[keep], kind="stable")]
+        dtype = [(field, float) for field in fields]
+        if name not in fields:
+            dtype.append((name, float))
+        dtype.append(("margin", float))
+        rows = np.empty(len(keep), dtype=dtype)
+        for field in fields:
+            rows[field] = values[field][keep]
+        if name not in fields:
+            rows[name] = columns[name][keep]
+        rows["margin"] = key[keep]
+        worst[name] = rows
+    return int(np.count_nonzero(passed)), spec_passed, edges, counts, worst
+
+
+class MonteCarlo:
+    """
+    Monte Carlo analysis of one filter type
+
+    A variable is a Uniform, a Normal or a constant. Without topology, the
+    variables are the filter parameters "m", "w0" and optionally "gain"
+    (1 by default). With a topology ("rlc", "sallen_key" or a function
+    returning (m, w0) from keyword arguments), the variables are its
+    component values, plus an optional "gain".
+
+    Specs bound the parameters (gain, m, w0) and the design figures of
+    the metrics module (wc1, wc2, delta_w, R, MdB...). A sample passes when
+    it meets every spec and every mask; an undefined figure (NaN) fails.
+    """
+
+    def __init__(
+        self,
+        filter_type,
+        variables,
+        specs=None,
+        masks=(),
+        topology=None,
+        correlation=None,
+    ):
+        """
+        MonteCarlo constructor
+
+        Args:
+            filter_type (str): one of "LP", "HP", "BP" or "Notch"
+            variables (dict): {name: Uniform, Normal or float}
+            specs (dict, optional): {name: (low, high)}, None for an unbounded side. Defaults to None.
+            masks (iterable, optional): Mask instances, reported as "mask0", "mask1"... Defaults to ().
+            topology (str or callable, optional): "rlc", "sallen_key" or function(**components) returning (m, w0). Defaults to None.
+            correlation (dict, optional): {(name1, name2): correlation coefficient} between random variables. Defaults to None.
+        """
+        analytic._check_type(filter_type)
+        self.filter_type = filter_type
+        self.variables = dict(variables)
+        if isinstance(topology, str):
+            if topology not in TOPOLOGIES:
+                raise ValueError(
+                    "unknown topology {!r}, expected one of {}".format(
+                        topology, tuple(TOPOLOGIES)
+                    )
+                )
+            topology = TOPOLOGIES[topology]
+        self.topology = topology
+        if topology is None:
+            missing = {"m", "w0"} - set(self.variables)
+            if missing:
+                raise ValueError("missing variables {}".format(sorted(missing)))
+        self.specs = dict(specs or {})
+        allowed = set(metrics.NAMES[filter_type]) | {"gain", "m", "w0"}
+        unknown = set(self.specs) - allowed
+        if unknown:
+            raise ValueError(
+                "{} not defined for {} filters".format(sorted(unknown), filter_type)
+            )
+        self.masks = list(masks)
+        self._random = [
+            name
+            for name, variable in self.variables.items()
+            if isinstance(variable, (Uniform, Normal))
+        ]
+        self._cholesky = self._factor(correlation or {})
+
+    def _factor(self, correlation):
+        """return the Cholesky factor of the correlation matrix of the random variables"""
+        k = len(self._random)
+        matrix = np.eye(k)
+        for (a, b), rho in correlation.items():
+            if a not in self._random or b not in self._random:
+                raise ValueError(
+                    "correlation between {!r} and {!r}: both must be random variables".format(
+                        a, b
+                    )
+                )
+            i, j = self._random.index(a), self._random.index(b)
+            matrix[i, j] = matrix[j, i] = rho
+        try:
+            return np.linalg.cholesky(matrix)
+        except np.linalg.LinAlgError:
+            raise ValueError("the correlation matrix is not positive definite")
+
+    def sample(self, n, seed=None):
+        """draw n samples of the variables and derive the filter parameters
+
+        Args:
+            n (int): number of samples
+            seed (int or numpy.random.SeedSequence, optional): seed of the random generator. Defaults to None.
+
+        Returns:
+            dict: {name: array of length n} for every variable and for "gain", "m" and "w0"
+        """
+        rng = np.random.default_rng(seed)
+        z = rng.standard_normal((n, len(self._random))) @ self._cholesky.T
+        values = {}
+        for name, variable in self.variables.items():
+            if name in self._random:
+                values[name] = variable.transform(z[:, self._random.index(name)])
+            else:
+                values[name] = np.full(n, float(variable))
+        if "gain" not in values:
+            values["gain"] = np.ones(n)
+        if self.topology is not None:
+            components = {
+                name: value for name, value in values.items() if name != "gain"
+            }
+            m, w0 = self.topology(**components)
+            values["m"] = np.broadcast_to(m, (n,))
+            values["w0"] = np.broadcast_to(w0, (n,))
+        return values
+
+    def evaluate(self, values):
+        """return the margin of every sample to every spec and mask
+
+        Args:
+            values (dict): samples returned by sample (the spec values are added to it)
+
+        Returns:
+            dict: {name: margin}, negative (or NaN) where the spec is not met
+        """
+        figures = [name for name in self.specs if name not in values]
+        if figures:
+            values.update(
+                metrics.compute(
+                    self.filter_type, values["m"], values["w0"], names=figures
+                )
+            )
+        margins = {
+            name: _margin(values[name], low, high)
+            for name, (low, high) in self.specs.items()
+        }
+        for i, mask in enumerate(self.masks):
+            margins["mask{}".format(i)] = mask.margin(
+                self.filter_type, values["gain"], values["m"], values["w0"]
+            )
+        return margins
+
+    def run(self, n, seed=None, chunk_size=65536, max_workers=0, bins=50, n_worst=5):
+        """draw and evaluate n samples
+
+        Args:
+            n (int): number of samples
+            seed (int, optional): seed of the random generators. Defaults to None.
+            chunk_size (int, optional): number of samples evaluated at once (bounds the memory used). Defaults to 65536.
+            max_workers (int, optional): number of worker processes, 0 to compute in this process, None for the number of CPUs. Defaults to 0.
+            bins (int, optional): number of bins of the histograms. Defaults to 50.
+            n_worst (int, optional): number of worst cases kept per spec. Defaults to 5.
+
+        Returns:
+            ToleranceResult: yield, histograms and worst cases
+        """
+        n = int(n)
+        sizes = [min(chunk_size, n - start) for start in range(0, n, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if not sizes:
+            return ToleranceResult(0, 0, {}, {}, {})
+        # the first chunk sets the edges of the histograms
+        first = _run_chunk(self, seeds[0], sizes[0], None, bins, n_worst)
+        edges = first[2]
+        args = [
+            (seeds[i], sizes[i], edges, bins, n_worst) for i in range(1, len(sizes))
+        ]
+        if max_workers == 0 or not args:
+            partials = [_run_chunk(self, *arg) for arg in args]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(_run_chunk, self, *arg) for arg in args]
+                partials = [future.result() for future in futures]
+        passed = 0
+        spec_passed = dict.fromkeys(first[1], 0)
+        counts = {name: np.zeros(bins, dtype=np.int64) for name in edges}
+        worst = {name: [] for name in first[4]}
+        for chunk_passed, chunk_spec, _, chunk_counts, chunk_worst in [
+            first
+        ] + partials:
+            passed += chunk_passed
+            for name, count in chunk_spec.items():
+                spec_passed[name] += count
+            for name, count in chunk_counts.items():
+                counts[name] += count
+            for name, rows in chunk_worst.items():
+                worst[name].append(rows)
+        histograms = {name: (counts[name], edges[name]) for name in edges}
+        worst = {
+            name: _keep_worst(np.concatenate(rows), n_worst)
+            for name, rows in worst.items()
+        }
+        return ToleranceResult(n, passed, spec_passed, histograms, worst)
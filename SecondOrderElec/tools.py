@@ -3,6 +3,9 @@
 #
 # @authors: vincentchoqueuse, slashformotion
 ##
+import json
+import os
+
 import numpy as np
 
 
@@ -17,6 +20,178 @@ def export_csv(data_list, filename="data.csv", header="", delimiter=","):
     """
     if not filename.endswith(".csv"):
         filename += ".csv"
-    data_2D = np.vstack(data_list)
-    data_2D = np.transpose(data_2D)
-    np.savetxt(filename, data_2D, delimiter, header=header)
+    data_2D = np.column_stack(data_list)
+    np.savetxt(filename, data_2D, delimiter=delimiter, header=header)
+
+
+MAGIC = b"SOERES1\n"
+EXTENSION = ".soe"
+AXES = ("time", "frequency", None)
+
+
+def _store_filename(filename):
+    if not filename.endswith(EXTENSION):
+        filename += EXTENSION
+    return filename
+
+
+class ResultStore:
+    """
+    Binary result file with typed columns, appendable and lazily readable
+
+    Layout: the magic bytes, the header length (8 bytes, little endian), a
+    JSON header (filter type, parameters, axis kind and column dtypes) padded
+    to 64 bytes, then the rows as packed records. The rows are read back
+    with np.memmap, so only the columns and rows actually used are loaded.
+    """
+
+    def __init__(self, filename):
+        """
+        Open an existing result file
+
+        Args:
+            filename (str): path of the file (the .soe extension is added if missing)
+        """
+        self.filename = _store_filename(filename)
+        with open(self.filename, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError("{} is not a result file".format(self.filename))
+            length = int.from_bytes(f.read(8), "little")
+            self.header = json.loads(f.read(length).decode("utf-8"))
+        self.offset = len(MAGIC) + 8 + length
+        self.dtype = np.dtype([tuple(column) for column in self.header["columns"]])
+
+    @classmethod
+    def create(cls, filename, columns, filter_type=None, parameters=None, axis=None):
+        """create an empty result file (an existing file is overwritten)
+
+        Args:
+            filename (str): path of the file (the .soe extension is added if missing)
+            columns (list): (name, dtype) pairs, for instance [("w", "float64"), ("Tjw", "complex128")]
+            filter_type (str, optional): type of the filter the results come from. Defaults to None.
+            parameters (dict, optional): parameters of the filter. Defaults to None.
+            axis (str, optional): "time" or "frequency", kind of the first column. Defaults to None.
+
+        Returns:
+            ResultStore: the new store
+        """
+        if axis not in AXES:
+            raise ValueError("axis must be one of {}".format(AXES))
+        header = {
+            "filter_type": filter_type,
+            "parameters": parameters or {},
+            "axis": axis,
+            "columns": [[name, np.dtype(dtype).str] for name, dtype in columns],
+        }
+        content = json.dumps(header).encode("utf-8")
+        padding = -(len(MAGIC) + 8 + len(content)) % 64
+        content += b" " * padding
+        with open(_store_filename(filename), "wb") as f:
+            f.write(MAGIC)
+            f.write(len(content).to_bytes(8, "little"))
+            f.write(content)
+        return cls(filename)
+
+    @property
+    def columns(self):
+        return list(self.dtype.names)
+
+    def __len__(self):
+        return (os.path.getsize(self.filename) - self.offset) // self.dtype.itemsize
+
+    def append(self, *columns):
+        """append rows, one array per column (in the column order of the file)
+
+        Args:
+            *columns (array_like): 1-D arrays of equal length
+        """
+        if len(columns) != len(self.dtype.names):
+            raise ValueError(
+                "expected {} columns {}".format(len(self.dtype.names), self.columns)
+            )
+        records = np.empty(len(columns[0]), dtype=self.dtype)
+        for name, column in zip(self.dtype.names, columns):
+            records[name] = column
+        with open(self.filename, "ab") as f:
+            f.write(records.tobytes())
+
+    def read(self, mode="r"):
+        """return the rows as a memory-mapped record array
+
+        Args:
+            mode (str, optional): memory-map mode ("r" or "r+"). Defaults to "r".
+
+        Returns:
+            np.memmap: records, a column is accessed with data["name"]
+        """
+        if len(self) == 0:
+            return np.empty(0, dtype=self.dtype)
+        return np.memmap(
+            self.filename,
+            dtype=self.dtype,
+            mode=mode,
+            offset=self.offset,
+            shape=(len(self),),
+        )
+
+    def to_csv(self, filename, delimiter=",", chunk_size=100000):
+        """export the rows to a csv file, complex columns being split in real and imaginary parts
+
+        Args:
+            filename (str): filename (the .csv extension is added if missing)
+            delimiter (str, optional): delimiter for csv file. Defaults to ",".
+            chunk_size (int, optional): number of rows converted at once. Defaults to 100000.
+        """
+        if not filename.endswith(".csv"):
+            filename += ".csv"
+        names = []
+        for name in self.dtype.names:
+            if self.dtype[name].kind == "c":
+                names += [name + ".real", name + ".imag"]
+            else:
+                names.append(name)
+        data = self.read()
+        with open(filename, "w") as f:
+            f.write("# " + delimiter.join(names) + "\n")
+            for start in range(0, len(data), chunk_size):
+                chunk = data[start : start + chunk_size]
+                table = []
+                for name in self.dtype.names:
+                    if self.dtype[name].kind == "c":
+                        table += [chunk[name].real, chunk[name].imag]
+                    else:
+                        table.append(chunk[name])
+                np.savetxt(f, np.column_stack(table), delimiter=delimiter)
+
+
+def export_result(filename, filter_instance, x, y, axis="frequency"):
+    """store the result of freqresp (w, Tjw) or of step/impulse (t, s) in a binary result file
+
+    Args:
+        filename (str): path of the file (the .soe extension is added if missing)
+        filter_instance (Second_Order_LTI): filter the result comes from
+        x (array_like): angular frequencies or times
+        y (array_like): response (complex for freqresp)
+        axis (str, optional): "frequency" or "time". Defaults to "frequency".
+
+    Returns:
+        ResultStore: the store holding the result
+    """
+    y = np.asarray(y)
+    x_name = "w" if axis == "frequency" else "t"
+    y_name = "Tjw" if axis == "frequency" else "s"
+    y_dtype = "complex128" if np.iscomplexobj(y) else "float64"
+    parameters = {}
+    for name in filter_instance._parameters:
+        # scalars (T0, m, w0...) or coefficient arrays (num, den)
+        value = np.asarray(getattr(filter_instance, name), dtype=float)
+        parameters[name] = value.tolist() if value.ndim else float(value)
+    store = ResultStore.create(
+        filename,
+        [(x_name, "float64"), (y_name, y_dtype)],
+        filter_type=filter_instance.type,
+        parameters=parameters,
+        axis=axis,
+    )
+    store.append(x, y)
+    return store
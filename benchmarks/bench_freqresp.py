@@ -0,0 +1,58 @@
+"""Compare the closed-form frequency response with scipy.signal.lti.freqresp.
+
+Run from the repository root with: python -m benchmarks.bench_freqresp
+"""
+import timeit
+
+import numpy as np
+
+from SecondOrderElec import LP, HP, BP, Notch
+from SecondOrderElec import analytic
+
+
+def bench(filter_instance, n, repeat=5):
+    w = np.logspace(0, 6, n)
+    lti = filter_instance.lti
+    args = (filter_instance.type, filter_instance.gain, filter_instance.m)
+    out = np.empty(n, dtype=np.complex128)
+    number = max(1, 200000 // n)
+    scipy_time = min(
+        timeit.repeat(lambda: lti.freqresp(w=w), number=number, repeat=repeat)
+    )
+    analytic_time = min(
+        timeit.repeat(
+            lambda: analytic.freqresp(*args, filter_instance.w0, w, out=out),
+            number=number,
+            repeat=repeat,
+        )
+    )
+    return scipy_time / number, analytic_time / number
+
+
+def main():
+    print(
+        "{:<6} {:>8} {:>12} {:>12} {:>8}".format(
+            "type", "n", "scipy", "analytic", "ratio"
+        )
+    )
+    for filter_instance in (
+        LP(1, 0.2, 6000),
+        HP(1, 0.2, 6000),
+        BP(1, 0.2, 6000),
+        Notch(1, 0.2, 6000),
+    ):
+        for n in (100, 10000, 1000000):
+            scipy_time, analytic_time = bench(filter_instance, n)
+            print(
+                "{:<6} {:>8} {:>10.1f}us {:>10.1f}us {:>7.1f}x".format(
+                    filter_instance.type,
+                    n,
+                    scipy_time * 1e6,
+                    analytic_time * 1e6,
+                    scipy_time / analytic_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Benchmark suite of the analysis paths, with baselines for regression checks.
+
+Every case is timed (best of several runs) and its peak memory measured
+with tracemalloc in a separate run. Nothing is plotted.
+
+Run from the repository root with:
+
+    python -m benchmarks.suite                        # print the results
+    python -m benchmarks.suite --save baseline.json   # store them as a baseline
+    python -m benchmarks.suite --compare baseline.json
+
+--compare exits with status 1 when a case is slower than its baseline by
+more than --threshold (1.25 by default, i.e. 25 % slower).
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from SecondOrderElec import LP, BP, FilterBank
+from SecondOrderElec.tolerance import MonteCarlo, Normal, Uniform
+from SecondOrderElec.tools import export_csv
+
+# problem sizes of the full run; --quick divides them by QUICK_FACTOR
+SIZES = {
+    "grid": 1000000,
+    "signal": 100000,
+    "stream": 1000000,
+    "filters": 10000,
+    "rows": 100000,
+}
+QUICK_FACTOR = 100
+
+
+def _cases(sizes):
+    """yield (name, unit, count, function) of every benchmark case
+
+    'count' items of 'unit' are processed per call of 'function', which gives the throughput.
+    """
+    n_grid, n_signal, n_stream = sizes["grid"], sizes["signal"], sizes["stream"]
+    n_filters, n_rows = sizes["filters"], sizes["rows"]
+
+    yield "freqresp_single", "filters", 1, lambda: LP(1, 0.2, 6000).freqresp(plot=False)
+    w = np.logspace(0, 6, n_grid)
+    yield "freqresp_grid", "points", n_grid, lambda: BP(1, 0.2, 6000).freqresp(
+        w=w, plot=False
+    )
+    yield "step_single", "filters", 1, lambda: LP(1, 0.2, 6000).step(plot=False)
+    yield "step_grid", "points", n_grid, lambda: LP(1, 0.2, 6000).step(
+        N=n_grid, plot=False
+    )
+    yield "impulse_grid", "points", n_grid, lambda: BP(1, 0.2, 6000).impulse(
+        N=n_grid, plot=False
+    )
+    yield "pzmap_single", "filters", 1, lambda: LP(1, 0.2, 6000).pzmap(plot=False)
+
+    T = np.linspace(0, 0.01, n_signal)
+    U = np.sign(np.sin(2 * np.pi * 500 * T))
+    yield "output_signal", "samples", n_signal, lambda: LP(1, 0.2, 6000).output(
+        U, T, plot=False
+    )
+    U_channels = np.tile(U, (64, 1))
+    yield "output_channels", "samples", U_channels.size, lambda: LP(
+        1, 0.2, 6000
+    ).output_channels(U_channels, T, plot=False)
+    U_stream = np.sign(np.sin(2 * np.pi * 500 * np.arange(n_stream) * 1e-7))
+    yield "stream_signal", "samples", n_stream, lambda: LP(1, 0.2, 6000).stream(
+        1e-7
+    ).process(U_stream)
+    fft_lp = LP(1, 0.2, 6000)
+    yield "fft_signal", "samples", n_stream, lambda: fft_lp.fft_filter(1e6).process(
+        U_stream
+    )
+
+    bank = FilterBank(
+        "LP", 1.0, np.linspace(0.05, 2, n_filters), np.logspace(2, 4, n_filters)
+    )
+    w_sweep = np.logspace(0, 6, 100)
+    yield "sweep_freqresp", "filters", n_filters, lambda: bank.freqresp(w=w_sweep)
+    yield "sweep_step", "filters", n_filters, lambda: bank.step(N=100)
+    yield "sweep_metrics", "filters", n_filters, lambda: bank.metrics()
+
+    analysis = MonteCarlo(
+        "BP",
+        {"m": Normal(0.2, 0.05), "w0": Uniform(6000, 0.02)},
+        specs={"wc1": (5000, None), "wc2": (None, 7500), "R": (None, 5)},
+    )
+    yield "montecarlo", "samples", n_rows, lambda: analysis.run(n_rows, seed=0)
+
+    data = np.random.default_rng(0).standard_normal((3, n_rows))
+    filename = os.path.join(tempfile.gettempdir(), "secondorderelec-bench.csv")
+    yield "export_csv", "rows", n_rows, lambda: export_csv(
+        data, filename, header="w,re,im"
+    )
+
+
+def _peak_memory(function):
+    """return the peak memory allocated while running 'function' (bytes)"""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(quick=False, repeat=5, min_time=0.2, names=None):
+    """run the benchmark cases
+
+    Args:
+        quick (bool, optional): use problem sizes divided by QUICK_FACTOR. Defaults to False.
+        repeat (int, optional): number of timed runs, the best one is kept. Defaults to 5.
+        min_time (float, optional): minimum duration of a timed run (s), short cases are looped. Defaults to 0.2.
+        names (iterable, optional): cases to run. Defaults to all of them.
+
+    Returns:
+        dict: {"environment": {...}, "results": {name: {"seconds", "unit", "count", "throughput", "peak_bytes"}}}
+    """
+    sizes = SIZES
+    if quick:
+        sizes = {key: max(1, value // QUICK_FACTOR) for key, value in SIZES.items()}
+    results = {}
+    for name, unit, count, function in _cases(sizes):
+        if names is not None and name not in names:
+            continue
+        function()  # warm up
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()
+        number = max(1, int(number * min_time / 0.2))
+        seconds = min(timer.repeat(repeat=repeat, number=number)) / number
+        results[name] = {
+            "seconds": seconds,
+            "unit": unit,
+            "count": count,
+            "throughput": count / seconds,
+            "peak_bytes": _peak_memory(function),
+        }
+    environment = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "quick": quick,
+        "matplotlib_loaded": "matplotlib" in sys.modules,
+    }
+    return {"environment": environment, "results": results}
+
+
+def compare(report, baseline, threshold=1.25):
+    """compare a report with a baseline
+
+    Args:
+        report (dict): result of run
+        baseline (dict): result of run stored earlier
+        threshold (float, optional): time ratio above which a case is a regression. Defaults to 1.25.
+
+    Returns:
+        dict: {name: time ratio (current / baseline)} of the regressed cases
+    """
+    regressions = {}
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or reference["count"] != result["count"]:
+            continue
+        ratio = result["seconds"] / reference["seconds"]
+        if ratio > threshold:
+            regressions[name] = ratio
+    return regressions
+
+
+def _format(report, baseline=None):
+    lines = [
+        "{:<16} {:>12} {:>20} {:>12} {:>8}".format(
+            "case", "time", "throughput", "peak memory", "ratio"
+        )
+    ]
+    for name, result in report["results"].items():
+        ratio = ""
+        if baseline is not None and name in baseline["results"]:
+            ratio = "{:.2f}x".format(
+                result["seconds"] / baseline["results"][name]["seconds"]
+            )
+        lines.append(
+            "{:<16} {:>10.3f}ms {:>10.3g} {:<9} {:>10.1f}MB {:>8}".format(
+                name,
+                result["seconds"] * 1e3,
+                result["throughput"],
+                result["unit"] + "/s",
+                result["peak_bytes"] / 2 ** 20,
+                ratio,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small problem sizes")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="FILE", help="write the results as JSON")
+    parser.add_argument("--compare", metavar="FILE", help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("cases", nargs="*", help="cases to run (default: all)")
+    args = parser.parse_args(argv)
+
+    report = run(quick=args.quick, repeat=args.repeat, names=args.cases or None)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print(_format(report, baseline))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        for name, ratio in sorted(regressions.items()):
+            print(
+                "regression: {} is {:.2f}x slower than the baseline".format(name, ratio)
+            )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,7 @@
+"""Filters shared by the unit tests."""
+from SecondOrderElec import LP, BP, HP, Notch
+
+
+def named_filters(m, gain=1.2, w0=6000):
+    """return LP, HP, BP and Notch filters for every damping coefficient in m"""
+    return [Filter(gain, value, w0) for Filter in (LP, HP, BP, Notch) for value in m]
@@ -0,0 +1,120 @@
+"""Unit tests."""
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from SecondOrderElec import LP, BP, HP, Recorder
+from SecondOrderElec import aio
+
+
+class test_aio(unittest.TestCase):
+    def test_results(self):
+        f = BP(1, 0.2, 100)
+        T = np.linspace(0, 0.5, 200)
+        U = np.sin(2 * np.pi * 10 * T)
+
+        async def main():
+            return await asyncio.gather(
+                f.afreqresp(n=300),
+                f.astep(N=100),
+                f.aimpulse(T=T),
+                f.aoutput(U, T),
+                f.apzmap(),
+            )
+
+        results = asyncio.run(main())
+        expected = (
+            f.freqresp(n=300, plot=False),
+            f.step(N=100, plot=False),
+            f.impulse(T=T, plot=False),
+            f.output(U, T, plot=False),
+            f.pzmap(plot=False),
+        )
+        for result, reference in zip(results, expected):
+            for array, reference_array in zip(result, reference):
+                np.testing.assert_array_equal(array, reference_array)
+                self.assertFalse(array.flags.writeable)
+
+    def test_coalescing(self):
+        w = np.logspace(0, 4, 1000)
+
+        async def main():
+            requests = [LP(1, 0.2, 100).afreqresp(w=w) for _ in range(5)]
+            requests.append(LP(1, 0.3, 100).afreqresp(w=w))
+            return await asyncio.gather(*requests)
+
+        with Recorder() as recorder:
+            results = asyncio.run(main())
+        self.assertEqual(recorder.stages["freqresp.solve"]["calls"], 2)
+        for result in results[1:5]:
+            np.testing.assert_array_equal(result[1], results[0][1])
+        self.assertFalse(np.allclose(results[0][1], results[5][1]))
+        self.assertEqual(aio._inflight, {})
+        # the caller's grid stays writable
+        self.assertTrue(w.flags.writeable)
+
+    def test_fingerprint_off_loop(self):
+        threads = []
+        original = aio.fingerprint
+
+        def fingerprint(value):
+            threads.append(threading.get_ident())
+            return original(value)
+
+        aio.fingerprint = fingerprint
+        self.addCleanup(setattr, aio, "fingerprint", original)
+        T = np.linspace(0, 0.5, 200)
+
+        async def main():
+            await LP(1, 0.2, 100).aoutput(np.ones_like(T), T)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(main())
+        self.assertEqual(len(threads), 3)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_cancellation(self):
+        release = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=1)
+        aio.configure(executor=executor)
+        self.addCleanup(aio.configure)
+        self.addCleanup(executor.shutdown)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            # occupy the only worker so that the next computations stay queued
+            blocker = loop.run_in_executor(executor, release.wait)
+            f = LP(1, 0.2, 100)
+            first = asyncio.ensure_future(f.afreqresp(n=100))
+            second = asyncio.ensure_future(f.afreqresp(n=100))
+            alone = asyncio.ensure_future(HP(1, 0.2, 100).afreqresp(n=100))
+            await asyncio.sleep(0.01)
+            shared = [entry[0] for entry in aio._inflight.values()]
+            first.cancel()
+            alone.cancel()
+            # joins right after the last waiter of its computation was cancelled
+            late = asyncio.ensure_future(HP(1, 0.2, 100).afreqresp(n=100))
+            await asyncio.sleep(0.01)
+            release.set()
+            await blocker
+            result = await second
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+            with self.assertRaises(asyncio.CancelledError):
+                await alone
+            return shared, result, await late
+
+        shared, result, late = asyncio.run(main())
+        # the computation of the cancelled request without other waiter was dropped
+        self.assertEqual([future.cancelled() for future in shared], [False, True])
+        self.assertEqual(len(result[0]), 100)
+        # and the late request started a new one
+        np.testing.assert_array_equal(
+            late[1], HP(1, 0.2, 100).freqresp(n=100, plot=False)[1]
+        )
+        self.assertEqual(aio._inflight, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,282 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+import scipy.signal
+from SecondOrderElec import LP, BP, HP, Notch
+from SecondOrderElec import analytic
+
+
+class test_freqresp(unittest.TestCase):
+    def setUp(self):
+        self.w = np.logspace(1, 6, 500)
+        self.filters = [
+            Filter(gain, m, 6000)
+            for Filter in (LP, HP, BP, Notch)
+            for gain in (1.3, -0.7)
+            for m in (0.05, 0.7, 1, 3)
+        ]
+
+    def test_against_scipy(self):
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                _, expected = filter_instance.lti.freqresp(w=self.w)
+                Tjw = analytic.freqresp(
+                    filter_instance.type,
+                    filter_instance.gain,
+                    filter_instance.m,
+                    filter_instance.w0,
+                    self.w,
+                )
+                np.testing.assert_allclose(Tjw, expected, rtol=1e-9, atol=1e-12)
+
+    def test_broadcast(self):
+        m = np.array([[0.1], [0.5], [2]])
+        Tjw = analytic.freqresp("BP", 1, m, 6000, self.w)
+        self.assertEqual(Tjw.shape, (3, len(self.w)))
+        for row, m_value in zip(Tjw, m[:, 0]):
+            _, expected = BP(1, m_value, 6000).lti.freqresp(w=self.w)
+            np.testing.assert_allclose(row, expected, rtol=1e-9, atol=1e-12)
+
+    def test_out_and_dtype(self):
+        out = np.empty(len(self.w), dtype=np.complex64)
+        Tjw = analytic.freqresp("LP", 1, 0.2, 6000, self.w, out=out)
+        self.assertIs(Tjw, out)
+        mag, phase = analytic.bode("LP", 1, 0.2, 6000, self.w, dtype=np.float32)
+        self.assertEqual(mag.dtype, np.float32)
+        self.assertEqual(phase.dtype, np.float32)
+
+    def test_bode(self):
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                _, expected = filter_instance.lti.freqresp(w=self.w)
+                mag, phase = analytic.bode(
+                    filter_instance.type,
+                    filter_instance.gain,
+                    filter_instance.m,
+                    filter_instance.w0,
+                    self.w,
+                )
+                np.testing.assert_allclose(mag, 20 * np.log10(np.abs(expected)))
+                np.testing.assert_allclose(
+                    np.exp(1j * phase), expected / np.abs(expected), atol=1e-9
+                )
+                if filter_instance.type != "Notch":
+                    self.assertLess(np.max(np.abs(np.diff(phase))), np.pi / 2)
+
+    def test_magnitude_db(self):
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                args = (
+                    filter_instance.type,
+                    filter_instance.gain,
+                    filter_instance.m,
+                    filter_instance.w0,
+                    self.w,
+                )
+                np.testing.assert_allclose(
+                    analytic.magnitude_db(*args), analytic.bode(*args)[0], atol=1e-9
+                )
+
+    def test_magnitude_db_broadcast(self):
+        for filter_type in analytic.FILTER_TYPES:
+            with self.subTest(type=filter_type):
+                expected = analytic.bode(filter_type, 1.3, 0.2, 6000, 5000.0)[0]
+                mag = analytic.magnitude_db(filter_type, 1.3, 0.2, 6000, 5000.0)
+                self.assertEqual(np.shape(mag), ())
+                self.assertAlmostEqual(float(mag), float(expected))
+                # broadcast through the gain alone
+                gain = np.array([[0.5], [1.0], [2.0]])
+                mag = analytic.magnitude_db(filter_type, gain, 0.2, 6000, self.w[:5])
+                self.assertEqual(mag.shape, (3, 5))
+                np.testing.assert_allclose(
+                    mag,
+                    analytic.bode(filter_type, gain, 0.2, 6000, self.w[:5])[0],
+                    atol=1e-9,
+                )
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            analytic.freqresp("XX", 1, 0.2, 6000, self.w)
+
+
+class test_time_response(unittest.TestCase):
+    def setUp(self):
+        self.t = np.linspace(0, 0.01, 1000)
+
+    def test_against_scipy(self):
+        for Filter in (LP, HP, BP, Notch):
+            for m in (0.05, 0.7, 1, 1 + 1e-9, 1.3, 30, -0.3):
+                filter_instance = Filter(1.2, m, 6000)
+                with self.subTest(type=filter_instance.type, m=m):
+                    _, expected_s = filter_instance.lti.step(T=self.t)
+                    _, expected_h = filter_instance.lti.impulse(T=self.t)
+                    s = analytic.step(filter_instance.type, 1.2, m, 6000, self.t)
+                    h = analytic.impulse(filter_instance.type, 1.2, m, 6000, self.t)
+                    scale = max(1, np.max(np.abs(expected_s)))
+                    np.testing.assert_allclose(s, expected_s, atol=1e-7 * scale)
+                    scale = np.max(np.abs(expected_h))
+                    np.testing.assert_allclose(h, expected_h, atol=1e-7 * scale)
+
+    def test_large_damping(self):
+        t = np.linspace(0, 10, 100)
+        s = analytic.step("LP", 1, 1e4, 6000, t)
+        self.assertTrue(np.all(np.isfinite(s)))
+
+    def test_negative_time(self):
+        t = np.linspace(-1, 1, 11)
+        s = analytic.step("LP", 1, 0.2, 10, t)
+        np.testing.assert_array_equal(s[t < 0], 0)
+
+    def test_out(self):
+        out = np.empty((3, len(self.t)))
+        s = analytic.step("BP", 1, [0.1, 1, 2], 6000, self.t, out=out)
+        self.assertIs(s, out)
+        with self.assertRaises(ValueError):
+            analytic.step("BP", 1, [0.1, 1, 2], 6000, self.t, out=out[:2])
+
+    def test_settling_time(self):
+        t = np.linspace(0, 0.05, 50001)
+        ts = analytic.settling_time("LP", 1, [0.1, 0.2], 6000, t)
+        # envelope estimate -ln(tol) / (m w0), within one oscillation period
+        np.testing.assert_allclose(
+            ts, -np.log(0.02) / (np.array([0.1, 0.2]) * 6000), rtol=0.2
+        )
+        self.assertTrue(np.isnan(analytic.settling_time("LP", 1, 0.01, 6000, t[:10])))
+
+
+class test_poles_zeros(unittest.TestCase):
+    def test_poles(self):
+        m = np.array([0.0, 0.05, 0.7, 1.0, 1.5, 40.0, -0.3, -3.0])
+        poles = analytic.poles(m, 6000.0)
+        self.assertEqual(poles.shape, (len(m), 2))
+        for mi, p in zip(m, poles):
+            expected = np.roots([1, 2 * mi * 6000.0, 6000.0 ** 2])
+            np.testing.assert_allclose(
+                np.sort_complex(p), np.sort_complex(expected), rtol=1e-7
+            )
+        # sum and product of the roots of s^2 + 2 m w0 s + w0^2
+        np.testing.assert_allclose(poles.sum(axis=1), -2 * m * 6000.0, atol=1e-9)
+        np.testing.assert_allclose(poles.prod(axis=1), 6000.0 ** 2, rtol=1e-12)
+
+    def test_large_damping(self):
+        # the slow pole is -w0 / (2m) for m >> 1, lost by the direct formula
+        poles = analytic.poles(1e9, 1.0)
+        np.testing.assert_allclose(poles[0], -0.5e-9, rtol=1e-12)
+        np.testing.assert_allclose(poles[0] * poles[1], 1.0, rtol=1e-12)
+
+    def test_broadcast(self):
+        poles = analytic.poles(np.linspace(0.1, 2, 5)[:, np.newaxis], [10.0, 100.0])
+        self.assertEqual(poles.shape, (5, 2, 2))
+
+    def test_zeros(self):
+        for Filter in (LP, HP, BP, Notch):
+            f = Filter(2, 0.3, 600)
+            zeros = analytic.zeros(f.type, [600.0, 600.0])
+            self.assertEqual(zeros.shape, (2, len(f.lti.zeros)))
+            np.testing.assert_allclose(
+                np.sort_complex(zeros[0]), np.sort_complex(f.lti.zeros), atol=1e-9
+            )
+
+
+class test_adaptive_grid(unittest.TestCase):
+    def test_tolerance(self):
+        w_dense = np.logspace(np.log10(60), np.log10(6e5), 100000)
+        for filter_type in analytic.FILTER_TYPES:
+            for m in (0.005, 0.05, 0.5, 2):
+                with self.subTest(type=filter_type, m=m):
+                    w = analytic.adaptive_grid(filter_type, 1, m, 6000, tol_db=0.1)
+                    self.assertTrue(np.all(np.diff(w) > 0))
+                    self.assertLess(len(w), 500)
+                    expected, _ = analytic.bode(filter_type, 1, m, 6000, w_dense)
+                    mag, _ = analytic.bode(filter_type, 1, m, 6000, w)
+                    interpolated = np.interp(np.log10(w_dense), np.log10(w), mag)
+                    finite = expected > -150
+                    error = np.abs(interpolated - expected)[finite]
+                    self.assertLess(np.max(error), 0.2)
+
+    def test_resonance_in_grid(self):
+        filter_instance = LP(1, 0.05, 6000)
+        w = analytic.adaptive_grid("LP", 1, 0.05, 6000)
+        closest = w[np.argmin(np.abs(w - filter_instance.wr))]
+        self.assertAlmostEqual(closest, filter_instance.wr, places=6)
+        self.assertTrue(np.all(np.diff(w) > 0))
+
+    def test_max_points(self):
+        w = analytic.adaptive_grid("Notch", 1, 0.01, 6000, tol_db=1e-6, max_points=300)
+        self.assertEqual(len(w), 300)
+
+    def test_freqresp(self):
+        filter_instance = BP(1, 0.01, 6000)
+        w, Tjw = filter_instance.freqresp(plot=False, adaptive=True)
+        w_default, _ = filter_instance.freqresp(plot=False)
+        self.assertLess(len(w), len(w_default) / 50)
+        self.assertAlmostEqual(w[0], w_default[0])
+        self.assertAlmostEqual(w[-1], w_default[-1])
+        self.assertAlmostEqual(np.max(np.abs(Tjw)), 1, places=6)
+
+
+class test_general(unittest.TestCase):
+    num = np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 2.0], [1.0, 0.0, 0.0], [0.0, 0.3, 1.0]])
+    den = np.array([[1.0, 0.4, 4.0], [0.5, 3.0, 1.0], [1.0, 2.0, 1.0], [2.0, 0.1, 5.0]])
+
+    def test_normalize(self):
+        num, den, m, w0 = analytic.normalize(
+            [[2.0], [1.0]], [[1.0, 0.4, 4.0], [2.0, 1, 2]]
+        )
+        np.testing.assert_allclose(num, [[0, 0, 0.5], [0, 0, 0.5]])
+        np.testing.assert_allclose(den[:, -1], 1)
+        np.testing.assert_allclose(w0, [2, 1])
+        np.testing.assert_allclose(m, [0.1, 0.25])
+        self.assertTrue(np.isnan(analytic.normalize([1], [1, 0, -1])[3]))
+        with self.assertRaises(ValueError):
+            analytic.normalize([1], [1, 1])
+        with self.assertRaises(ValueError):
+            analytic.normalize([1], [1, 1, 0])
+
+    def test_batch(self):
+        t = np.linspace(0, 5, 300)
+        w = np.logspace(-2, 2, 200)
+        H = analytic.general_freqresp(self.num, self.den, w)
+        h = analytic.general_impulse(self.num, self.den, t)
+        s = analytic.general_step(self.num, self.den, t)
+        self.assertEqual(H.shape, (4, 200))
+        self.assertEqual(s.shape, (4, 300))
+        for i in range(4):
+            system = scipy.signal.lti(np.trim_zeros(self.num[i], "f"), self.den[i])
+            np.testing.assert_allclose(H[i], system.freqresp(w=w)[1], atol=1e-12)
+            np.testing.assert_allclose(h[i], system.impulse(T=t)[1], atol=1e-12)
+            np.testing.assert_allclose(s[i], system.step(T=t)[1], atol=1e-12)
+        s = analytic.general_step(self.num, self.den, [-1.0, -0.1])
+        np.testing.assert_array_equal(s, 0)
+
+    def test_normalized(self):
+        t = np.linspace(0, 5, 300)
+        num, den, _, _ = analytic.normalize(self.num, self.den)
+        np.testing.assert_array_equal(
+            analytic.general_step(num, den, t, normalized=True),
+            analytic.general_step(self.num, self.den, t),
+        )
+        np.testing.assert_array_equal(
+            analytic.general_freqresp(num, den, t, normalized=True),
+            analytic.general_freqresp(self.num, self.den, t),
+        )
+
+    def test_settling_time(self):
+        t = np.linspace(0, 0.05, 20001)
+        for Filter in (LP, HP, BP, Notch):
+            f = Filter(2, 0.3, 600)
+            with self.subTest(type=f.type):
+                self.assertEqual(
+                    analytic.general_settling_time(np.atleast_1d(f.num), f.den, t),
+                    analytic.settling_time(f.type, 2, 0.3, 600, t),
+                )
+
+    def test_named(self):
+        t = np.linspace(0, 0.01, 100)
+        for Filter in (LP, HP, BP, Notch):
+            f = Filter(2, 0.3, 600)
+            np.testing.assert_allclose(
+                analytic.general_step(np.atleast_1d(f.num), f.den, t),
+                analytic.step(f.type, 2, 0.3, 600, t),
+                atol=1e-12,
+            )
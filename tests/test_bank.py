@@ -0,0 +1,119 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, HP, Notch, FilterBank
+
+
+class Common_FilterBank(object):
+    m = np.array([0.05, 0.2, 0.7, 1.0, 1.5, 4.0])
+
+    def get_bank(self):
+        return FilterBank(self.filter_class.type, 1.2, self.m, 6000)
+
+    def get_filters(self):
+        return [self.filter_class(1.2, m, 6000) for m in self.m]
+
+    def test_len_getitem(self):
+        bank = self.get_bank()
+        self.assertEqual(len(bank), len(self.m))
+        self.assertIsInstance(bank[2], self.filter_class)
+        self.assertEqual(bank[2].m, self.m[2])
+        self.assertEqual(len(bank[1:3]), 2)
+
+    def test_from_filters(self):
+        bank = FilterBank.from_filters(self.get_filters())
+        np.testing.assert_array_equal(bank.m, self.m)
+        self.assertEqual(bank.type, self.filter_class.type)
+
+    def test_freqresp(self):
+        w = np.logspace(2, 5, 300)
+        _, Tjw = self.get_bank().freqresp(w=w)
+        self.assertEqual(Tjw.shape, (len(self.m), len(w)))
+        for row, filter_instance in zip(Tjw, self.get_filters()):
+            _, expected = filter_instance.lti.freqresp(w=w)
+            np.testing.assert_allclose(row, expected, rtol=1e-9, atol=1e-12)
+
+    def test_step_impulse(self):
+        T = np.linspace(0, 0.01, 500)
+        bank = self.get_bank()
+        _, steps = bank.step(T=T)
+        _, impulses = bank.impulse(T=T)
+        self.assertEqual(steps.shape, (len(self.m), len(T)))
+        for s, h, filter_instance in zip(steps, impulses, self.get_filters()):
+            _, expected_s = filter_instance.lti.step(T=T)
+            _, expected_h = filter_instance.lti.impulse(T=T)
+            np.testing.assert_allclose(s, expected_s, atol=1e-7)
+            np.testing.assert_allclose(
+                h, expected_h, atol=1e-7 * np.max(np.abs(expected_h))
+            )
+
+    def test_default_times(self):
+        T, s = self.get_bank().step(N=50)
+        self.assertEqual(len(T), 50)
+        self.assertEqual(s.shape, (len(self.m), 50))
+
+    def test_pzmap(self):
+        poles, zeros = self.get_bank().pzmap()
+        self.assertEqual(poles.shape, (len(self.m), 2))
+        for p, z, filter_instance in zip(poles, zeros, self.get_filters()):
+            np.testing.assert_allclose(
+                np.sort_complex(p), np.sort_complex(filter_instance.poles)
+            )
+            self.assertEqual(len(z), len(filter_instance.zeros))
+
+    def test_metrics(self):
+        bank = self.get_bank()
+        for name in ("wp", "Tp", "R", "Q"):
+            values = getattr(bank, name)
+            for value, filter_instance in zip(values, self.get_filters()):
+                expected = getattr(filter_instance, name)
+                if expected is None:
+                    self.assertTrue(np.isnan(value))
+                else:
+                    self.assertAlmostEqual(value, expected)
+
+
+class test_LP_bank(unittest.TestCase, Common_FilterBank):
+    filter_class = LP
+
+    def test_wr(self):
+        wr = self.get_bank().wr
+        self.assertAlmostEqual(wr[1], LP(1.2, 0.2, 6000).wr)
+        self.assertTrue(np.isnan(wr[-1]))
+
+    def test_wc(self):
+        with self.assertRaises(AttributeError):
+            self.get_bank().wc
+
+
+class test_HP_bank(unittest.TestCase, Common_FilterBank):
+    filter_class = HP
+
+
+class test_BP_bank(unittest.TestCase, Common_FilterBank):
+    filter_class = BP
+
+    def test_wc(self):
+        wc = self.get_bank().wc
+        self.assertEqual(wc.shape, (len(self.m), 2))
+        np.testing.assert_allclose(wc[2], BP(1.2, 0.7, 6000).wc)
+        np.testing.assert_allclose(self.get_bank().delta_w, 2 * self.m * 6000)
+
+
+class test_Notch_bank(unittest.TestCase, Common_FilterBank):
+    filter_class = Notch
+
+
+class test_FilterBank(unittest.TestCase):
+    def test_mixed_types(self):
+        with self.assertRaises(ValueError):
+            FilterBank.from_filters([LP(1, 0.2, 10), HP(1, 0.2, 10)])
+
+    def test_unknown_type(self):
+        with self.assertRaises(ValueError):
+            FilterBank("XX", 1, 0.2, 10)
+
+    def test_broadcast(self):
+        bank = FilterBank("LP", 1, [[0.1], [0.2]], [10, 20, 30])
+        self.assertEqual(len(bank), 6)
+        self.assertTrue(bank.m.flags.c_contiguous)
@@ -0,0 +1,35 @@
+"""Smoke tests of the benchmark suite."""
+import unittest
+
+from benchmarks import suite
+
+
+class test_benchmarks(unittest.TestCase):
+    def test_run(self):
+        names = ("freqresp_grid", "sweep_metrics", "export_csv")
+        report = suite.run(quick=True, repeat=1, min_time=0.01, names=names)
+        self.assertEqual(tuple(report["results"]), names)
+        for result in report["results"].values():
+            self.assertGreater(result["seconds"], 0)
+            self.assertGreater(result["throughput"], 0)
+            self.assertGreaterEqual(result["peak_bytes"], 0)
+
+    def test_compare(self):
+        def report(**seconds):
+            return {
+                "results": {
+                    name: {"seconds": value, "count": 10}
+                    for name, value in seconds.items()
+                }
+            }
+
+        baseline = report(a=1.0, b=1.0, c=1.0)
+        current = report(a=1.1, b=2.0, d=5.0)
+        self.assertEqual(suite.compare(current, baseline), {"b": 2.0})
+        self.assertEqual(
+            suite.compare(current, baseline, threshold=1.05), {"a": 1.1, "b": 2.0}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
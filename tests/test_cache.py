@@ -0,0 +1,82 @@
+"""Unit tests."""
+import tempfile
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, ResponseCache
+from SecondOrderElec import cache
+
+
+class test_cache(unittest.TestCase):
+    def tearDown(self):
+        cache.disable()
+
+    def test_disabled(self):
+        self.assertIsNone(cache.active())
+        w, H = LP(1, 0.5, 100).freqresp(w=[1.0, 2.0], plot=False)
+        self.assertTrue(H.flags.writeable)
+
+    def test_hits(self):
+        store = cache.enable()
+        w = np.logspace(0, 4, 100)
+        _, H1 = LP(1, 0.5, 100).freqresp(w=w, plot=False)
+        _, H2 = LP(1, 0.5, 100).freqresp(w=w.copy(), plot=False)
+        _, H3 = LP(1, 0.5, 200).freqresp(w=w, plot=False)
+        self.assertIs(H1, H2)
+        self.assertFalse(np.allclose(H1, H3))
+        self.assertEqual((store.hits, store.misses), (1, 2))
+        with self.assertRaises(ValueError):
+            H1[0] = 0
+        # n/N grids and time responses are keyed too
+        BP(1, 0.2, 10).step(N=50, plot=False)
+        t, s = BP(1, 0.2, 10).step(N=50, plot=False)
+        BP(1, 0.2, 10).impulse(N=60, plot=False)
+        self.assertEqual(len(t), 53)
+        self.assertEqual(store.stats["hits"], 2)
+        self.assertEqual(store.stats["misses"], 4)
+
+    def test_result(self):
+        f = BP(2, 0.3, 50)
+        expected = f.freqresp(n=200, plot=False)
+        with ResponseCache() as store:
+            self.assertIs(cache.active(), store)
+            result = f.freqresp(n=200, plot=False)
+            result = f.freqresp(n=200, plot=False)
+        self.assertIsNone(cache.active())
+        np.testing.assert_array_equal(result[0], expected[0])
+        np.testing.assert_array_equal(result[1], expected[1])
+
+    def test_invalidation(self):
+        cache.enable()
+        f = LP(1, 0.5, 100)
+        _, H1 = f.freqresp(w=[10.0], plot=False)
+        f.w0 = 200
+        _, H2 = f.freqresp(w=[10.0], plot=False)
+        self.assertNotEqual(H1[0], H2[0])
+
+    def test_eviction(self):
+        w = np.logspace(0, 4, 1000)
+        # two responses (w and H) take 24 kB
+        store = cache.enable(max_bytes=50000)
+        for w0 in (1.0, 2.0, 3.0):
+            LP(1, 0.5, w0).freqresp(w=w, plot=False)
+        self.assertEqual(store.evictions, 1)
+        self.assertEqual(len(store), 2)
+        self.assertLessEqual(store.nbytes, 50000)
+        LP(1, 0.5, 3.0).freqresp(w=w, plot=False)
+        LP(1, 0.5, 1.0).freqresp(w=w, plot=False)
+        self.assertEqual((store.hits, store.misses), (1, 4))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with ResponseCache(directory=directory) as store:
+                _, s1 = LP(1, 0.5, 100).step(T=np.linspace(0, 1, 10), plot=False)
+            with ResponseCache(directory=directory) as store:
+                _, s2 = LP(1, 0.5, 100).step(T=np.linspace(0, 1, 10), plot=False)
+            self.assertEqual(store.disk_hits, 1)
+            self.assertEqual(store.misses, 0)
+            np.testing.assert_array_equal(s1, s2)
+            self.assertFalse(s2.flags.writeable)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import numpy as np
+import scipy.signal
+from SecondOrderElec import LP, HP, BP, Cascade
+from SecondOrderElec.cascade import CascadeBank, First_Order, prototype
+
+
+def reference(family, order, wc, kind):
+    btype = "high" if kind == "HP" else "low"
+    if family == "butterworth":
+        b, a = scipy.signal.butter(order, wc, btype=btype, analog=True)
+    elif family == "chebyshev":
+        b, a = scipy.signal.cheby1(order, 1.0, wc, btype=btype, analog=True)
+    else:
+        b, a = scipy.signal.bessel(order, wc, btype=btype, analog=True, norm="mag")
+    return scipy.signal.lti(b, a)
+
+
+class test_prototype(unittest.TestCase):
+    def test_butterworth(self):
+        gain, sections, first_order = prototype("butterworth", 4)
+        self.assertAlmostEqual(gain, 1.0)
+        self.assertIsNone(first_order)
+        np.testing.assert_allclose(
+            [m for m, _ in sections], [np.cos(np.pi / 8), np.cos(3 * np.pi / 8)]
+        )
+        np.testing.assert_allclose([w0 for _, w0 in sections], 1.0)
+
+    def test_odd(self):
+        gain, sections, first_order = prototype("bessel", 5)
+        self.assertEqual(len(sections), 2)
+        self.assertGreater(first_order, 0)
+
+    def test_chebyshev_gain(self):
+        gain, _, _ = prototype("chebyshev", 4, ripple_db=2.0)
+        self.assertAlmostEqual(gain, 10 ** (-2.0 / 20))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            prototype("elliptic", 4)
+        with self.assertRaises(ValueError):
+            prototype("butterworth", 0)
+
+
+class test_Cascade(unittest.TestCase):
+    def test_sections(self):
+        cascade = Cascade.from_prototype("butterworth", 5, 1000.0)
+        self.assertEqual(cascade.order, 5)
+        self.assertIsInstance(cascade.sections[0], First_Order)
+        self.assertIsInstance(cascade.sections[1], LP)
+        # increasing quality factor
+        self.assertGreater(cascade.sections[1].m, cascade.sections[2].m)
+        cascade = Cascade.from_prototype("butterworth", 4, 1000.0, kind="HP")
+        self.assertIsInstance(cascade.sections[0], HP)
+
+    def test_freqresp(self):
+        w = np.logspace(1, 5, 500)
+        for family in ("butterworth", "chebyshev", "bessel"):
+            for order in (4, 5, 8):
+                for kind in ("LP", "HP"):
+                    cascade = Cascade.from_prototype(family, order, 1000.0, 2, kind)
+                    system = reference(family, order, 1000.0, kind)
+                    np.testing.assert_allclose(
+                        cascade.freqresp(w=w, plot=False)[1],
+                        2 * system.freqresp(w=w)[1],
+                        rtol=1e-9,
+                        atol=1e-12,
+                    )
+
+    def test_cutoff(self):
+        cascade = Cascade.from_prototype("butterworth", 6, 1000.0)
+        _, Tjw = cascade.freqresp(w=[1000.0], plot=False)
+        self.assertAlmostEqual(20 * np.log10(np.abs(Tjw[0])), -3.0103, places=3)
+
+    def test_time(self):
+        t = np.linspace(0, 0.02, 4000)
+        for family in ("butterworth", "chebyshev", "bessel"):
+            for kind in ("LP", "HP"):
+                cascade = Cascade.from_prototype(family, 5, 1000.0, kind=kind)
+                system = reference(family, 5, 1000.0, kind)
+                _, s = cascade.step(T=t, plot=False)
+                _, h = cascade.impulse(T=t, plot=False)
+                np.testing.assert_allclose(s, system.step(T=t)[1], atol=1e-9)
+                np.testing.assert_allclose(
+                    h, system.impulse(T=t)[1], atol=1e-9 * np.abs(h).max()
+                )
+
+    def test_high_order_default_times(self):
+        # the default grid is set by the slowest pole, far coarser than the fastest one
+        for family in ("chebyshev", "butterworth"):
+            for kind in ("LP", "HP"):
+                with self.subTest(family=family, kind=kind):
+                    cascade = Cascade.from_prototype(family, 8, 1000.0, kind=kind)
+                    btype = "high" if kind == "HP" else "low"
+                    if family == "chebyshev":
+                        zpk = scipy.signal.cheby1(
+                            8, 1.0, 1000.0, btype, analog=True, output="zpk"
+                        )
+                    else:
+                        zpk = scipy.signal.butter(
+                            8, 1000.0, btype, analog=True, output="zpk"
+                        )
+                    system = scipy.signal.lti(*scipy.signal.zpk2tf(*zpk))
+                    t, s = cascade.step(plot=False)
+                    _, h = cascade.impulse(plot=False)
+                    np.testing.assert_allclose(s, system.step(T=t)[1], atol=1e-9)
+                    np.testing.assert_allclose(
+                        h, system.impulse(T=t)[1], atol=1e-9 * np.abs(h).max()
+                    )
+
+    def test_default_times(self):
+        cascade = Cascade([LP(1, 0.3, 100), BP(1, 0.5, 1000)])
+        t, s = cascade.step(plot=False)
+        self.assertEqual(len(t), 1000)
+        self.assertEqual(t[0], 0)
+        with self.assertRaises(ValueError):
+            cascade.step(T=[0, 1, 3], plot=False)
+        with self.assertRaises(ValueError):
+            cascade.step(T=[1, 2, 3], plot=False)
+
+    def test_output(self):
+        cascade = Cascade.from_prototype("chebyshev", 4, 1000.0)
+        system = reference("chebyshev", 4, 1000.0, "LP")
+        t = np.linspace(0, 0.02, 4000)
+        u = 1 + np.sin(3000 * t)
+        _, y = cascade.output(u, t, plot=False)
+        np.testing.assert_allclose(y, scipy.signal.lsim(system, u, t)[1], atol=1e-4)
+
+    def test_stream(self):
+        cascade = Cascade.from_prototype("bessel", 5, 1000.0)
+        t = np.linspace(0, 0.02, 1000)
+        u = np.sign(np.sin(2000 * t))
+        _, y = cascade.output(u, t, plot=False)
+        simulator = cascade.stream(t[1] - t[0])
+        blocks = [simulator.process(block) for block in np.array_split(u, 7)]
+        np.testing.assert_allclose(np.concatenate(blocks), y, atol=1e-12)
+        self.assertEqual(simulator.n_samples, len(u))
+        simulator.reset()
+        np.testing.assert_allclose(simulator.process(u), y, atol=1e-12)
+
+    def test_pzmap(self):
+        cascade = Cascade.from_prototype("butterworth", 3, 1000.0, kind="HP")
+        poles, zeros = cascade.pzmap(plot=False)
+        np.testing.assert_allclose(np.abs(poles), 1000.0)
+        np.testing.assert_allclose(zeros, 0)
+        self.assertEqual(len(zeros), 3)
+
+
+class test_CascadeBank(unittest.TestCase):
+    def test_freqresp(self):
+        wc = np.array([100.0, 1000.0, 5000.0])
+        for order in (4, 5):
+            bank = CascadeBank.from_prototype("chebyshev", order, wc, gain=[1, 2, 3])
+            self.assertEqual(len(bank), 3)
+            w, Tjw = bank.freqresp(n=200)
+            self.assertEqual(Tjw.shape, (3, 200))
+            for i in range(3):
+                np.testing.assert_allclose(
+                    Tjw[i],
+                    Cascade.from_prototype("chebyshev", order, wc[i], i + 1).freqresp(
+                        w=w, plot=False
+                    )[1],
+                    rtol=1e-12,
+                )
+
+    def test_step(self):
+        bank = CascadeBank.from_prototype("butterworth", 5, [500.0, 1000.0], kind="HP")
+        T, s = bank.step(N=200)
+        self.assertEqual(s.shape, (2, 200))
+        np.testing.assert_allclose(
+            s[1], bank[1].step(T=T, plot=False)[1], rtol=1e-12, atol=1e-15
+        )
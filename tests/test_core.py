@@ -1,7 +1,9 @@
 import unittest
 import scipy
+import scipy.signal
 import numpy as np
 from SecondOrderElec import LP, BP, HP, Notch
+from SecondOrderElec.core import General_Second_Order
 
 # we can't really test Second_Order_LTI so we will check the inheriting class
 
@@ -53,6 +55,42 @@ class Common_Second_Order_LTI(object):
         self.assertIsInstance(poles, np.ndarray)
         self.assertIsInstance(zeros, np.ndarray)
 
+    def test_settling_time(self):
+        filter_instance = self.get_one()
+        settling_time = filter_instance.settling_time()
+        self.assertGreater(settling_time, 0)
+
+    def test_cache(self):
+        filter_instance = self.get_one()
+        self.assertIs(filter_instance.lti, filter_instance.lti)
+        self.assertIs(filter_instance.ss, filter_instance.ss)
+        self.assertIs(filter_instance.den, filter_instance.den)
+        self.assertFalse(filter_instance.den.flags.writeable)
+
+    def test_closed_form_poles(self):
+        filter_instance = self.get_one()
+        poles, zeros = filter_instance.pzmap(plot=False)
+        self.assertNotIn("lti", filter_instance._cache)
+        np.testing.assert_allclose(
+            np.sort_complex(poles), np.sort_complex(filter_instance.lti.poles)
+        )
+        np.testing.assert_allclose(
+            np.sort_complex(zeros),
+            np.sort_complex(filter_instance.lti.zeros),
+            atol=1e-9,
+        )
+
+    def test_cache_invalidation(self):
+        filter_instance = self.get_one()
+        lti = filter_instance.lti
+        poles = filter_instance.poles
+        filter_instance.m = 2
+        self.assertIsNot(filter_instance.lti, lti)
+        self.assertTrue(np.all(filter_instance.poles.imag == 0))
+        self.assertFalse(np.allclose(filter_instance.poles, poles))
+        filter_instance.w0 = 10
+        self.assertAlmostEqual(filter_instance.den[0], 1 / 100)
+
 
 class Common_General_Second_Order(Common_Second_Order_LTI):
     def test_lti(self):
@@ -238,3 +276,101 @@ class test_Notch(unittest.TestCase, Common_Second_Order_LTI):
         filter_instance = self.get_one()
         delta_w = filter_instance.delta_w
         self.assertIsInstance(delta_w, (int, float))
+
+
+class test_General_Second_Order(unittest.TestCase):
+    def get_one(self):
+        return General_Second_Order(
+            [0, 0, 2 * 6000 ** 2], [2, 4 * 0.4 * 6000, 2 * 6000 ** 2]
+        )
+
+    def test_normalize(self):
+        filter_instance = self.get_one()
+        np.testing.assert_allclose(filter_instance.den, [1 / 6000 ** 2, 0.8 / 6000, 1])
+        np.testing.assert_allclose(filter_instance.num, [0, 0, 1])
+        self.assertAlmostEqual(filter_instance.m, 0.4)
+        self.assertAlmostEqual(filter_instance.w0, 6000)
+        with self.assertRaises(ValueError):
+            filter_instance.num[0] = 1
+
+    def test_same_as_LP(self):
+        filter_instance = self.get_one()
+        reference = LP(1, 0.4, 6000)
+        np.testing.assert_allclose(
+            filter_instance.freqresp(plot=False)[1],
+            reference.freqresp(w=filter_instance.freqresp(plot=False)[0], plot=False)[
+                1
+            ],
+        )
+        T = np.linspace(0, 0.005, 200)
+        np.testing.assert_allclose(
+            filter_instance.step(T=T, plot=False)[1][3:],
+            reference.step(T=T, plot=False)[1][3:],
+            atol=1e-12,
+        )
+
+    def test_scipy(self):
+        T = np.linspace(0, 0.01, 300)
+        w = np.logspace(2, 5, 100)
+        for num, den in (
+            ([1, 0, 3], [1, 0.2, 4]),
+            ([2, 1], [1, 5, 4]),
+            ([1], [1, -0.5, 4]),
+        ):
+            filter_instance = General_Second_Order(num, den)
+            system = scipy.signal.lti(num, den)
+            np.testing.assert_allclose(
+                filter_instance.freqresp(w=w, plot=False)[1],
+                system.freqresp(w=w)[1],
+                rtol=1e-10,
+            )
+            np.testing.assert_allclose(
+                filter_instance.impulse(T=T, plot=False)[1][-len(T) :],
+                system.impulse(T=T)[1],
+                rtol=1e-8,
+                atol=1e-8,
+            )
+            np.testing.assert_allclose(
+                filter_instance.step(T=T, plot=False)[1][3:],
+                system.step(T=T)[1],
+                rtol=1e-8,
+                atol=1e-8,
+            )
+
+    def test_real_poles_of_opposite_sign(self):
+        filter_instance = General_Second_Order([1], [1, 0, -4])
+        self.assertTrue(np.isnan(filter_instance.w0))
+        T = np.linspace(0, 1, 50)
+        np.testing.assert_allclose(
+            filter_instance.step(T=T, plot=False)[1][3:],
+            scipy.signal.lti([1], [1, 0, -4]).step(T=T)[1],
+            rtol=1e-6,
+        )
+
+    def test_settling_time(self):
+        filter_instance = self.get_one()
+        self.assertAlmostEqual(
+            filter_instance.settling_time(), LP(1, 0.4, 6000).settling_time()
+        )
+        reference = BP(2, 0.3, 600)
+        self.assertAlmostEqual(
+            General_Second_Order(reference.num, reference.den).settling_time(),
+            reference.settling_time(),
+        )
+        self.assertTrue(np.isnan(General_Second_Order([1], [1, 0, -4]).settling_time()))
+
+    def test_batch(self):
+        den = np.array([[1, 0.2, 4], [1, 5, 4], [2, 1, 8]])
+        systems = General_Second_Order.batch([[0, 0, 1]] * 3, den)
+        self.assertEqual(len(systems), 3)
+        for system, d in zip(systems, den):
+            single = General_Second_Order([0, 0, 1], d)
+            np.testing.assert_allclose(system.den, single.den)
+            self.assertAlmostEqual(system.m, single.m)
+            self.assertAlmostEqual(system.w0, single.w0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            General_Second_Order([1], [0, 1, 1])
+        with self.assertRaises(ValueError):
+            General_Second_Order([1, 2, 3, 4], [1, 1, 1])
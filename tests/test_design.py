@@ -0,0 +1,90 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+from SecondOrderElec import BP, Notch
+from SecondOrderElec import analytic, design
+
+
+class test_design(unittest.TestCase):
+    def test_series(self):
+        for name, size in (("E12", 12), ("E24", 24), ("E96", 96)):
+            values = design.series(name, range(3, 5))
+            self.assertEqual(len(values), 2 * size)
+            self.assertTrue(np.all(np.diff(values) > 0))
+            self.assertEqual(values[0], 1000)
+
+    def test_cutoff(self):
+        m = np.array([0.1, 0.5, 1 / np.sqrt(2), 1.0, 3.0])
+        for filter_type in ("LP", "HP"):
+            gain, m_out, w0 = design.solve(filter_type, gain=2, m=m, wc=1000)
+            H = analytic.freqresp(filter_type, gain, m_out, w0, np.array([1000.0]))
+            np.testing.assert_allclose(np.abs(H), 2 / np.sqrt(2))
+
+    def test_peak(self):
+        gain, m, w0 = design.solve("LP", peak=[1.0, 1.5, 4.0], w0=1.0)
+        w = np.logspace(-2, 2, 100001)
+        H = np.abs(analytic.freqresp("LP", 1, m[:, np.newaxis], w0, w))
+        np.testing.assert_allclose(H.max(axis=1), [1.0, 1.5, 4.0], rtol=1e-6)
+
+    def test_overshoot(self):
+        gain, m, w0 = design.solve("LP", overshoot=0.2, w0=10.0)
+        t = np.linspace(0, 5, 50001)
+        s = analytic.step("LP", 1, m, w0, t)
+        self.assertAlmostEqual(s.max(), 1.2, places=6)
+
+    def test_band(self):
+        for Filter in (BP, Notch):
+            gain, m, w0 = design.solve(Filter.type, wc=[[100.0, 400.0], [10.0, 20.0]])
+            for i, (wc1, wc2) in enumerate(((100.0, 400.0), (10.0, 20.0))):
+                np.testing.assert_allclose(Filter(1, m[i], w0[i]).wc, (wc1, wc2))
+            gain, m, w0 = design.solve(Filter.type, w0=1000.0, delta_w=50.0)
+            self.assertAlmostEqual(Filter(1, m, w0).delta_w, 50.0)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            design.solve("LP", wc=1000.0)
+        with self.assertRaises(ValueError):
+            design.solve("LP", m=0.5, w0=1.0, wc=1.0)
+        with self.assertRaises(ValueError):
+            design.solve("HP", overshoot=0.1, w0=1.0)
+        with self.assertRaises(ValueError):
+            design.solve("LP", peak=0.5, w0=1.0)
+        with self.assertRaises(ValueError):
+            design.search("pi", 0.5, 1.0, [1.0], [1.0])
+
+    def test_search_rlc(self):
+        R = design.series("E24", range(0, 5))
+        C = design.series("E12", range(-9, -5))
+        L = design.series("E12", range(-4, 0))
+        m, w0 = 0.5, 2 * np.pi * 1000
+        best = design.search("rlc", m, w0, R, C, inductors=L, n_best=5)
+        self.assertEqual(len(best), 5)
+        self.assertTrue(np.all(np.diff(best["error"]) >= 0))
+        m_real, w0_real = design.rlc(best["R"], best["L"], best["C"])
+        np.testing.assert_allclose(m_real, best["m"])
+        np.testing.assert_allclose(w0_real, best["w0"])
+        # same optimum as the exhaustive search
+        R_, L_, C_ = np.meshgrid(R, L, C, indexing="ij")
+        m_all, w0_all = design.rlc(R_, L_, C_)
+        error = np.hypot(m_all / m - 1, w0_all / w0 - 1)
+        self.assertAlmostEqual(best["error"][0], error.min())
+
+    def test_search_sallen_key(self):
+        R = design.series("E24", range(2, 6))
+        C = design.series("E12", range(-10, -6))
+        m, w0 = 0.35, 2 * np.pi * 500
+        best = design.search("sallen_key", m, w0, R, C)
+        self.assertLess(best["error"][0], 0.01)
+        R1, R2, C1, C2 = (best[name][0] for name in ("R1", "R2", "C1", "C2"))
+        m_real, w0_real = design.sallen_key(R1, R2, C1, C2)
+        self.assertAlmostEqual(m_real, best["m"][0])
+        self.assertAlmostEqual(w0_real, best["w0"][0])
+        # same optimum as the exhaustive search
+        grids = np.meshgrid(R, R, C, C, indexing="ij", sparse=True)
+        m_all, w0_all = design.sallen_key(*grids)
+        error = np.hypot(m_all / m - 1, w0_all / w0 - 1)
+        self.assertAlmostEqual(best["error"][0], error.min())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, HP, Biquad
+from SecondOrderElec.discrete import discretize, _real_gain
+from tests.fixtures import named_filters
+
+
+class test_discretize(unittest.TestCase):
+    fs = 48000.0
+
+    def setUp(self):
+        self.filters = named_filters((0.1, 1, 3))
+
+    def test_methods(self):
+        w = np.array([600.0, 3000.0])
+        for filter_instance in self.filters:
+            _, expected = filter_instance.lti.freqresp(w=w)
+            for method in ("zoh", "foh", "bilinear", "matched"):
+                with self.subTest(type=filter_instance.type, method=method):
+                    biquad = filter_instance.to_biquad(self.fs, method=method)
+                    self.assertIsInstance(biquad, Biquad)
+                    self.assertEqual(biquad.a[0], 1)
+                    # zoh is only accurate without direct feedthrough
+                    if method != "zoh" or filter_instance.type in ("LP", "BP"):
+                        np.testing.assert_allclose(
+                            biquad.freqresp(w), expected, rtol=0.05
+                        )
+
+    def test_prewarp(self):
+        for filter_instance in self.filters:
+            if filter_instance.type == "Notch":
+                continue
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                biquad = filter_instance.to_biquad(
+                    self.fs, method="bilinear", prewarp=True
+                )
+                _, expected = filter_instance.lti.freqresp(w=[filter_instance.w0])
+                np.testing.assert_allclose(
+                    biquad.freqresp([filter_instance.w0]), expected, rtol=1e-9
+                )
+
+    def test_foh_matches_lsim(self):
+        T = np.arange(2000) / self.fs
+        U = np.sign(np.sin(2 * np.pi * 900 * T))
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                _, expected, _ = filter_instance.output(U, T, plot=False)
+                y = filter_instance.to_biquad(self.fs, method="foh").filter(U)
+                np.testing.assert_allclose(
+                    y, expected, atol=1e-9 * np.max(np.abs(expected))
+                )
+
+    def test_matched_gain_sign(self):
+        self.assertEqual(_real_gain(2.0 + 0j), 2.0)
+        self.assertEqual(_real_gain(-2.0 + 0j), -2.0)
+        # a purely imaginary ratio keeps the magnitude instead of a zero numerator
+        self.assertEqual(_real_gain(2j), 2.0)
+        self.assertEqual(_real_gain(-0.0 - 2j), 2.0)
+        biquad = HP(-1.2, 0.3, 6000).to_biquad(self.fs, method="matched")
+        _, expected = HP(-1.2, 0.3, 6000).lti.freqresp(w=[6000.0])
+        np.testing.assert_allclose(biquad.freqresp([6000.0]), expected, rtol=0.05)
+
+    def test_unknown_method(self):
+        with self.assertRaises(ValueError):
+            discretize(LP(1, 0.2, 6000), self.fs, method="euler")
+
+
+class test_Biquad(unittest.TestCase):
+    def setUp(self):
+        self.biquad = BP(1, 0.2, 6000).to_biquad(48000.0, method="bilinear")
+        self.x = np.random.default_rng(0).normal(size=(4, 3000))
+
+    def test_multichannel(self):
+        y = self.biquad.filter(self.x)
+        for row, x_row in zip(y, self.x):
+            self.biquad.reset()
+            np.testing.assert_allclose(self.biquad.filter(x_row), row)
+
+    def test_axis(self):
+        y = self.biquad.filter(self.x)
+        self.biquad.reset()
+        np.testing.assert_allclose(self.biquad.filter(self.x.T, axis=0), y.T)
+
+    def test_state_between_calls(self):
+        expected = self.biquad.filter(self.x)
+        self.biquad.reset()
+        blocks = [self.biquad.filter(x) for x in np.array_split(self.x, 7, axis=1)]
+        np.testing.assert_array_equal(np.hstack(blocks), expected)
+        with self.assertRaises(ValueError):
+            self.biquad.filter(self.x[:2])
+
+    def test_sos(self):
+        self.assertEqual(self.biquad.sos.shape, (1, 6))
@@ -0,0 +1,98 @@
+"""Unit tests."""
+import os
+import tempfile
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, HP, Notch
+from SecondOrderElec import fftfilter
+from tests.fixtures import named_filters
+
+
+class test_FFTFilter(unittest.TestCase):
+    def setUp(self):
+        self.fs = 1e6
+        rng = np.random.default_rng(0)
+        # non-zero first sample: the signal starts from a zero state
+        self.U = 1 + rng.normal(size=30000)
+        self.filters = named_filters((0.2, 2))
+
+    def test_against_output(self):
+        for filter_instance in self.filters:
+            for method in fftfilter.METHODS:
+                with self.subTest(
+                    type=filter_instance.type, m=filter_instance.m, method=method
+                ):
+                    error = fftfilter.crosscheck(
+                        filter_instance, self.U, self.fs, method=method
+                    )
+                    self.assertLess(error, 1e-8)
+
+    def test_blocks(self):
+        filter_instance = BP(1, 0.3, 6000)
+        expected = filter_instance.fft_filter(self.fs).process(self.U)
+        for method in fftfilter.METHODS:
+            with self.subTest(method=method):
+                # blocks shorter than the impulse response, split unevenly
+                engine = filter_instance.fft_filter(
+                    self.fs, block_size=1000, method=method
+                )
+                y = np.concatenate(
+                    [engine.process(u) for u in np.split(self.U, [7, 2500, 2501])]
+                )
+                np.testing.assert_allclose(y, expected, atol=1e-12)
+                self.assertEqual(engine.n_samples, len(self.U))
+                engine.reset()
+                np.testing.assert_allclose(engine.process(self.U), expected, atol=1e-12)
+
+    def test_bandlimited(self):
+        # a well sampled sinusoid reaches the steady state |H| sin(w t + arg H)
+        w = 2 * np.pi * 1000
+        t = np.arange(200000) / self.fs
+        filter_instance = LP(1.2, 0.3, 6000)
+        y = filter_instance.fft_filter(self.fs, model="bandlimited").process(
+            np.sin(w * t)
+        )
+        H = filter_instance._closed_form_freqresp(np.array([w]))[0]
+        expected = np.abs(H) * np.sin(w * t + np.angle(H))
+        np.testing.assert_allclose(y[-1000:], expected[-1000:], atol=1e-6)
+
+    def test_cached_spectrum(self):
+        filter_instance = HP(1, 0.3, 6000)
+        engine = filter_instance.fft_filter(self.fs, block_size=4096)
+        again = filter_instance.fft_filter(self.fs, block_size=4096)
+        self.assertIs(engine._spectrum, again._spectrum)
+        keys = [key for key in filter_instance._cache if key.startswith("fft.")]
+        self.assertEqual(len(keys), 1)
+        filter_instance.m = 0.5
+        self.assertIsNot(
+            filter_instance.fft_filter(self.fs, block_size=4096)._spectrum,
+            engine._spectrum,
+        )
+
+    def test_filter_file(self):
+        filter_instance = Notch(1, 0.3, 6000)
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "input.npy")
+            destination = os.path.join(directory, "output.npy")
+            np.save(source, self.U.astype(np.float32))
+            y = fftfilter.filter_file(
+                filter_instance, source, destination, self.fs, block_size=4096
+            )
+            self.assertIsInstance(y, np.memmap)
+            expected = filter_instance.fft_filter(self.fs).process(
+                self.U.astype(np.float32)
+            )
+            np.testing.assert_allclose(y, expected, atol=1e-12)
+            del y
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            LP(1, -0.2, 6000).fft_filter(self.fs)
+        with self.assertRaises(ValueError):
+            LP(1, 0.2, 6000).fft_filter(self.fs, method="overlap")
+        with self.assertRaises(ValueError):
+            LP(1, 0.2, 6000).fft_filter(self.fs, model="zoh")
+
+
+if __name__ == "__main__":
+    unittest.main()
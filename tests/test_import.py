@@ -0,0 +1,31 @@
+"""Import-time benchmark tests."""
+import json
+import subprocess
+import sys
+import unittest
+
+# time allowed for 'import SecondOrderElec' once numpy and scipy.signal are loaded
+IMPORT_BUDGET = 0.25
+
+SCRIPT = """
+import json, sys, time
+import numpy, scipy.signal
+start = time.perf_counter()
+import SecondOrderElec
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "matplotlib": "matplotlib" in sys.modules}))
+"""
+
+
+def measure_import():
+    output = subprocess.check_output([sys.executable, "-c", SCRIPT])
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+class test_import(unittest.TestCase):
+    def test_matplotlib_not_imported(self):
+        self.assertFalse(measure_import()["matplotlib"])
+
+    def test_import_budget(self):
+        elapsed = min(measure_import()["elapsed"] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET)
@@ -0,0 +1,132 @@
+"""Unit tests."""
+import threading
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, Recorder
+from SecondOrderElec import cache, instrument
+
+
+class test_instrument(unittest.TestCase):
+    def test_disabled(self):
+        self.assertFalse(instrument.enabled())
+        self.assertIs(instrument.stage("a"), instrument.stage("b"))
+        with instrument.stage("a") as record:
+            record.size = 10
+        self.assertIsNone(instrument.stage("b").size)
+
+    def test_stages(self):
+        records = []
+        with Recorder(callback=records.append) as recorder:
+            self.assertTrue(instrument.enabled())
+            LP(1, 0.2, 100).freqresp(n=500, plot=False)
+            BP(1, 0.2, 100).step(N=200, plot=False)
+            BP(1, 0.2, 100).impulse(N=100, plot=False)
+            LP(1, 0.2, 100).pzmap(plot=False)
+            LP(1, 0.2, 100).output(np.ones(50), np.linspace(0, 0.1, 50), plot=False)
+        self.assertFalse(instrument.enabled())
+        stages = recorder.stages
+        for name in (
+            "freqresp",
+            "freqresp.grid",
+            "freqresp.solve",
+            "step",
+            "step.solve",
+            "impulse",
+            "impulse.solve",
+            "pzmap",
+            "output",
+        ):
+            self.assertIn(name, stages)
+            self.assertEqual(stages[name]["calls"], 1)
+            self.assertGreaterEqual(stages[name]["seconds"], 0)
+        self.assertIn("build.lti", stages)
+        self.assertEqual(stages["freqresp"]["size"], 500)
+        self.assertEqual(stages["step"]["size"], 203)
+        self.assertEqual(stages["output"]["size"], 50)
+        # the total of an analysis includes its inner stages
+        self.assertGreaterEqual(
+            stages["freqresp"]["seconds"], stages["freqresp.solve"]["seconds"]
+        )
+        self.assertEqual(len(records), sum(c["calls"] for c in stages.values()))
+        report = recorder.report()
+        self.assertIn("freqresp.solve", report)
+        self.assertEqual(len(report.splitlines()), len(stages) + 1)
+
+    def test_cache_events(self):
+        with cache.ResponseCache(), Recorder() as recorder:
+            for _ in range(3):
+                LP(1, 0.2, 100).freqresp(w=[1.0, 2.0], plot=False)
+        self.assertEqual(recorder.stages["cache.miss"]["calls"], 1)
+        self.assertEqual(recorder.stages["cache.hit"]["calls"], 2)
+        self.assertEqual(recorder.stages["freqresp.solve"]["calls"], 1)
+
+    def test_memory(self):
+        with Recorder(memory=True) as recorder:
+            LP(1, 0.2, 100).freqresp(n=100000, plot=False)
+        # the response (1.6 MB) is allocated inside the solve stage
+        self.assertGreater(recorder.stages["freqresp.solve"]["peak_bytes"], 1.6e6)
+        self.assertGreaterEqual(
+            recorder.stages["freqresp"]["peak_bytes"],
+            recorder.stages["freqresp.solve"]["peak_bytes"],
+        )
+
+    def test_allocations(self):
+        with Recorder(memory=True) as recorder:
+            with instrument.stage("empty"):
+                pass
+            with instrument.stage("arrays"):
+                data = [np.ones(10) for _ in range(50)]
+        self.assertEqual(recorder.stages["empty"]["allocations"], 0)
+        self.assertGreaterEqual(recorder.stages["arrays"]["allocations"], 50)
+        self.assertIn("allocations", recorder.report())
+        with Recorder() as recorder:
+            with instrument.stage("arrays"):
+                data = [np.ones(10) for _ in range(50)]
+        self.assertIsNone(recorder.stages["arrays"]["allocations"])
+
+    def test_threads(self):
+        # stages of two threads interleaved: A opens, B opens, A closes, B closes
+        steps = [threading.Event() for _ in range(3)]
+        stacks = {}
+
+        def first():
+            with instrument.stage("first"):
+                data = np.ones(250000)
+                steps[0].set()
+                steps[1].wait(5)
+                # the peak was reset when the other stage opened
+                del data
+            stacks["first"] = list(instrument._open_stages())
+            steps[2].set()
+
+        def second():
+            steps[0].wait(5)
+            with instrument.stage("second"):
+                steps[1].set()
+                steps[2].wait(5)
+            stacks["second"] = list(instrument._open_stages())
+
+        with Recorder(memory=True) as recorder:
+            threads = [threading.Thread(target=f) for f in (first, second)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(stacks, {"first": [], "second": []})
+        self.assertGreater(recorder.stages["first"]["peak_bytes"], 2e6)
+        self.assertLess(recorder.stages["second"]["peak_bytes"], 1e6)
+
+    def test_hook(self):
+        records = []
+        instrument.add_hook(records.append)
+        try:
+            instrument.event("custom", size=3)
+        finally:
+            instrument.remove_hook(records.append)
+        self.assertEqual(len(records), 1)
+        self.assertEqual((records[0].stage, records[0].size), ("custom", 3))
+        self.assertIsNone(records[0].seconds)
+
+
+if __name__ == "__main__":
+    unittest.main()
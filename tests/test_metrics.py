@@ -0,0 +1,68 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, HP, Notch, FilterBank
+from SecondOrderElec import analytic, design, metrics
+
+
+class test_metrics(unittest.TestCase):
+    m = np.array([0.05, 0.2, 0.6, 0.9, 1.0, 1.5, 4.0])
+
+    def check(self, Filter, names):
+        columns = metrics.compute(Filter.type, self.m, 6000)
+        self.assertEqual(tuple(columns), metrics.NAMES[Filter.type])
+        for i, m in enumerate(self.m):
+            filter_instance = Filter(1, m, 6000)
+            for name in names:
+                with self.subTest(type=Filter.type, m=m, name=name):
+                    if name in ("wc1", "wc2"):
+                        expected = filter_instance.wc[int(name[-1]) - 1]
+                    else:
+                        with np.errstate(invalid="ignore"):
+                            expected = getattr(filter_instance, name)
+                    if expected is None or np.isnan(expected):
+                        self.assertTrue(np.isnan(columns[name][i]))
+                    else:
+                        self.assertAlmostEqual(columns[name][i], expected)
+
+    def test_LP(self):
+        self.check(LP, metrics.NAMES["LP"])
+
+    def test_HP(self):
+        self.check(HP, metrics.NAMES["HP"])
+
+    def test_BP(self):
+        self.check(BP, metrics.NAMES["BP"])
+
+    def test_Notch(self):
+        self.check(Notch, metrics.NAMES["Notch"])
+
+    def test_overshoot_and_peak(self):
+        m = np.array([0.05, 0.2, 0.5, 0.7])
+        t = np.linspace(0, 0.05, 200001)
+        s = analytic.step("LP", 1, m, 6000, t)
+        np.testing.assert_allclose(metrics.R(m), s.max(axis=-1) - 1, rtol=1e-6)
+        np.testing.assert_allclose(design.m_from_overshoot(metrics.R(m)), m)
+        w = 6000 * np.linspace(0.05, 1, 200001)
+        mag = analytic.magnitude_db("HP", 1, m[:, np.newaxis], 6000, 6000 ** 2 / w)
+        np.testing.assert_allclose(metrics.MdB(m), mag.max(axis=-1), atol=1e-6)
+        np.testing.assert_array_equal(metrics.R([1, 2]), 0)
+        np.testing.assert_array_equal(metrics.MdB([0.75, 2]), 0)
+
+    def test_broadcast(self):
+        columns = metrics.compute("LP", self.m[:, np.newaxis], [1000, 6000])
+        for column in columns.values():
+            self.assertEqual(column.shape, (len(self.m), 2))
+
+    def test_records(self):
+        table = metrics.compute("BP", self.m, 6000, names=("Q", "wc1"), records=True)
+        self.assertEqual(table.dtype.names, ("Q", "wc1"))
+        np.testing.assert_allclose(table["Q"], 1 / (2 * self.m))
+
+    def test_undefined(self):
+        with self.assertRaises(ValueError):
+            metrics.compute("LP", self.m, 6000, names=("delta_w",))
+
+    def test_bank(self):
+        bank = FilterBank("Notch", 1, self.m, 6000)
+        np.testing.assert_allclose(bank.metrics()["wc2"], bank.wc[:, 1])
@@ -0,0 +1,76 @@
+"""Unit tests."""
+import pickle
+import sys
+import unittest
+import numpy as np
+from SecondOrderElec import LP, HP, BP, Notch, FilterBank, FilterParams
+from SecondOrderElec import params
+
+
+class test_params(unittest.TestCase):
+    def test_value_semantics(self):
+        a = FilterParams("LP", 1, 0.2, 100)
+        b = FilterParams("LP", 1.0, 0.2, 100.0)
+        c = FilterParams("HP", 1, 0.2, 100)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(len({a, b, c}), 2)
+        self.assertEqual({a: 1}[b], 1)
+        self.assertNotEqual(a, a.astuple())
+
+    def test_immutable(self):
+        p = FilterParams("BP", 2, 0.3, 50)
+        with self.assertRaises(AttributeError):
+            p.m = 0.5
+        with self.assertRaises(AttributeError):
+            del p.w0
+        with self.assertRaises(AttributeError):
+            p.other = 1
+        self.assertFalse(hasattr(p, "__dict__"))
+        with self.assertRaises(ValueError):
+            FilterParams("XX", 1, 0.2, 100)
+
+    def test_filters(self):
+        for Filter in (LP, HP, BP, Notch):
+            p = FilterParams.from_filter(Filter(2, 0.3, 50))
+            self.assertEqual(p, FilterParams(Filter.type, 2, 0.3, 50))
+            f = p.to_filter()
+            self.assertIsInstance(f, Filter)
+            self.assertEqual((f.gain, f.m, f.w0), (2, 0.3, 50))
+
+    def test_pickle(self):
+        p = FilterParams("Notch", 1, 0.2, 100)
+        data = pickle.dumps(p, protocol=pickle.HIGHEST_PROTOCOL)
+        self.assertEqual(pickle.loads(data), p)
+
+    def test_size(self):
+        self.assertLess(sys.getsizeof(FilterParams("LP", 1, 0.2, 100)), 80)
+
+    def test_records(self):
+        items = [FilterParams("LP", 1, m, 100) for m in (0.1, 0.2, 0.3)]
+        items.append(HP(2, 0.5, 10))
+        records = params.to_records(items)
+        self.assertEqual(records.dtype, params.DTYPE)
+        self.assertEqual(records[3]["type"], "HP")
+        back = params.from_records(records)
+        self.assertEqual(back[:3], items[:3])
+        self.assertEqual(back[3], FilterParams("HP", 2, 0.5, 10))
+
+    def test_bank(self):
+        records = params.to_records(
+            [FilterParams("BP", 1, m, 100) for m in np.linspace(0.1, 1, 10)]
+        )
+        bank = FilterBank.from_records(records)
+        self.assertEqual(bank.type, "BP")
+        # the bank views the record fields
+        self.assertTrue(np.shares_memory(bank.m, records))
+        records["m"][0] = 0.05
+        self.assertEqual(bank.m[0], 0.05)
+        np.testing.assert_array_equal(bank.to_records(), records)
+        with self.assertRaises(ValueError):
+            FilterBank.from_records(params.to_records([LP(1, 0.2, 1), HP(1, 0.2, 1)]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from SecondOrderElec import LP, BP, FilterBank
+from SecondOrderElec import plot
+from SecondOrderElec.render import Renderer
+
+
+class test_thin_points(unittest.TestCase):
+    def test_cloud(self):
+        rng = np.random.default_rng(0)
+        z = rng.standard_normal(100000) + 1j * rng.standard_normal(100000)
+        keep = plot.thin_points(z, budget=50)
+        self.assertLessEqual(len(keep), 50 * 50)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+        # extreme points are isolated, hence kept
+        self.assertIn(np.argmax(z.real), keep)
+        self.assertIn(np.argmin(z.imag), keep)
+        self.assertIsNone(plot.thin_points(z[:40], budget=50))
+
+    def test_locus(self):
+        poles, zeros = FilterBank("LP", 1, np.linspace(0.01, 3, 50000), 1000).pzmap()
+        plt.figure()
+        plot.plot_pzmap(poles, zeros, locus=True)
+        lines = plt.gca().get_lines()
+        # one line per branch, plus the zeros
+        self.assertEqual(len(lines), 3)
+        self.assertLessEqual(len(lines[0].get_xdata()), 4 * plot.PIXEL_BUDGET)
+        plt.close("all")
+
+
+class test_decimate(unittest.TestCase):
+    def test_small(self):
+        self.assertIsNone(plot.decimate(100, (np.zeros(100),), budget=25))
+        self.assertIsNone(plot.decimate(10 ** 6, (np.zeros(10 ** 6),), budget=0))
+
+    def test_peaks(self):
+        rng = np.random.default_rng(0)
+        y = rng.standard_normal((100003, 2))
+        z = rng.standard_normal(100003)
+        keep = plot.decimate(len(y), (y, z), budget=100)
+        self.assertLessEqual(len(keep), 100 * 2 + 100 * 2 * 3)
+        self.assertTrue(np.all(np.diff(keep) > 0))
+        self.assertEqual((keep[0], keep[-1]), (0, len(y) - 1))
+        # extrema of every bucket are kept
+        size = -(-len(y) // 100)
+        for start in range(0, len(y), size):
+            for curve in (y[:, 0], y[:, 1], z):
+                bucket = curve[start : start + size]
+                self.assertIn(start + np.argmax(bucket), keep)
+                self.assertIn(start + np.argmin(bucket), keep)
+
+    def test_resonance(self):
+        f = LP(1, 0.05, 6000)
+        w, H = f.freqresp(n=100000, plot=False)
+        keep = plot.decimate(len(w), (np.abs(H),), budget=500)
+        self.assertEqual(np.abs(H)[keep].max(), np.abs(H).max())
+
+
+class test_plot(unittest.TestCase):
+    def tearDown(self):
+        plt.close("all")
+
+    def test_time(self):
+        f = LP(1, 0.1, 6000)
+        t, s = f.step(N=100000, plot=True)
+        lines = plt.gca().get_lines()
+        self.assertEqual(len(lines), 2)
+        self.assertLessEqual(len(lines[0].get_xdata()), 4 * plot.PIXEL_BUDGET)
+        self.assertEqual(lines[0].get_ydata().max(), s.max())
+        plt.close("all")
+        plot.plot_time(t, s, budget=0)
+        self.assertEqual(len(plt.gca().get_lines()[0].get_xdata()), len(t))
+        plt.close("all")
+        f.step(N=100000, plot=True, budget=0)
+        self.assertEqual(len(plt.gca().get_lines()[0].get_xdata()), len(t))
+        self.assertEqual(plot.PIXEL_BUDGET, 2000)
+
+    def test_bode(self):
+        w, H = BP(1, 0.01, 100).freqresp(n=50000, plot=True)
+        for name in ("mag", "phase"):
+            line = plt.figure(name).gca().get_lines()[0]
+            self.assertLessEqual(len(line.get_xdata()), 4 * plot.PIXEL_BUDGET)
+        mag = plt.figure("mag").gca().get_lines()[0].get_ydata()
+        self.assertEqual(mag.max(), np.abs(H).max())
+        plt.close("all")
+        BP(1, 0.01, 100).freqresp(n=50000, plot=True, budget=100)
+        line = plt.figure("mag").gca().get_lines()[0]
+        self.assertLessEqual(len(line.get_xdata()), 4 * 100)
+
+    def test_renderer(self):
+        renderer = Renderer("step", budget=100, N=100000)
+        renderer.draw(LP(1, 0.1, 6000))
+        self.assertLessEqual(len(renderer.lines[0].get_xdata()), 100 * 2 * 3)
+        self.assertEqual(
+            len(renderer.lines[0].get_xdata()), len(renderer.lines[1].get_xdata())
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Unit tests."""
+import os
+import tempfile
+import unittest
+import numpy as np
+from SecondOrderElec import LP, HP, BP, Notch
+from SecondOrderElec.render import Renderer, render_batch
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+class test_render(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_kinds(self):
+        for kind in ("bode", "step", "impulse", "pzmap"):
+            for fmt in ("png", "svg"):
+                with self.subTest(kind=kind, fmt=fmt):
+                    filename = Renderer(kind).render(
+                        BP(1, 0.2, 100), self.path(kind + "." + fmt)
+                    )
+                    with open(filename, "rb") as f:
+                        head = f.read(64)
+                    if fmt == "png":
+                        self.assertTrue(head.startswith(PNG))
+                    else:
+                        self.assertIn(b"<?xml", head)
+        with self.assertRaises(ValueError):
+            Renderer("nyquist")
+
+    def test_reuse(self):
+        renderer = Renderer("bode", w=np.logspace(0, 4, 200))
+        lines = list(renderer.lines)
+        for m in (0.1, 0.5, 2.0):
+            renderer.render(LP(1, m, 100), self.path("bode.png"))
+            self.assertEqual(renderer.lines, lines)
+            self.assertEqual([len(ax.lines) for ax in renderer.axes], [1, 1])
+        # the lines hold the data of the last filter and the axes follow it
+        w, H = LP(1, 2.0, 100).freqresp(w=np.logspace(0, 4, 200), plot=False)
+        np.testing.assert_allclose(lines[0].get_ydata(), np.abs(H))
+        ymin, ymax = renderer.axes[0].get_ylim()
+        self.assertLessEqual(ymin, np.abs(H).min())
+        self.assertGreaterEqual(ymax, np.abs(H).max())
+
+    def test_batch(self):
+        filters = [LP(1, 0.2, 100), HP(1, 0.3, 50), BP(2, 0.1, 10), Notch(1, 0.5, 1)]
+        for max_workers in (0, 2):
+            with self.subTest(max_workers=max_workers):
+                directory = self.path("batch{}".format(max_workers))
+                paths = render_batch(
+                    filters,
+                    directory,
+                    kind="step",
+                    max_workers=max_workers,
+                    chunk_size=3,
+                    T=np.linspace(0, 1, 100),
+                )
+                self.assertEqual(
+                    [os.path.basename(path) for path in paths],
+                    ["0_LP.png", "1_HP.png", "2_BP.png", "3_Notch.png"],
+                )
+                for path in paths:
+                    with open(path, "rb") as f:
+                        self.assertEqual(f.read(8), PNG)
+        with self.assertRaises(ValueError):
+            render_batch(
+                filters, self.directory.name, filenames=["a.png"], max_workers=0
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Unit tests."""
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP, Simulator
+from tests.fixtures import named_filters
+
+
+class test_Simulator(unittest.TestCase):
+    def setUp(self):
+        self.T = np.linspace(0, 0.02, 5001)
+        self.dt = self.T[1] - self.T[0]
+        rng = np.random.default_rng(0)
+        self.U = np.sin(2 * np.pi * 800 * self.T) + rng.normal(size=len(self.T))
+        self.filters = named_filters((0.1, 1, 3))
+
+    def test_against_lsim(self):
+        X0 = [0.3, -0.2]
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                _, s, x = filter_instance.output(self.U, self.T, X0=X0, plot=False)
+                simulator = filter_instance.stream(self.dt, X0=X0, return_state=True)
+                y, state = simulator.process(self.U)
+                np.testing.assert_allclose(y, s, atol=1e-9 * np.max(np.abs(s)))
+                np.testing.assert_allclose(state, x, atol=1e-9 * np.max(np.abs(x)))
+
+    def test_default_state(self):
+        # zero initial state with an input already non-zero at the first sample
+        U = np.ones(len(self.T))
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                _, s, _ = filter_instance.output(U, self.T, plot=False)
+                y = filter_instance.stream(self.dt).process(U)
+                np.testing.assert_allclose(y, s, atol=1e-9 * np.max(np.abs(s)))
+
+    def test_chunks_are_bit_consistent(self):
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                simulator = Simulator(filter_instance, self.dt, X0=[0.1, 0.1])
+                expected = simulator.process(self.U)
+                simulator.reset([0.1, 0.1])
+                blocks = [simulator.process(U) for U in np.array_split(self.U, 13)]
+                np.testing.assert_array_equal(np.concatenate(blocks), expected)
+                self.assertEqual(simulator.n_samples, len(self.U))
+
+    def test_state_is_optional(self):
+        simulator = LP(1, 0.2, 6000).stream(self.dt)
+        y = simulator.process(self.U)
+        self.assertEqual(y.shape, self.U.shape)
+        self.assertEqual(len(simulator.process([])), 0)
+
+
+class test_channels(unittest.TestCase):
+    def setUp(self):
+        self.T = np.linspace(0, 0.01, 2001)
+        rng = np.random.default_rng(1)
+        # non-zero first samples: each channel starts from a zero state
+        self.U = 1 + rng.normal(size=(6, len(self.T)))
+        self.filters = named_filters((0.1, 2))
+
+    def test_against_output(self):
+        for filter_instance in self.filters:
+            with self.subTest(type=filter_instance.type, m=filter_instance.m):
+                t, Y = filter_instance.output_channels(self.U, self.T, plot=False)
+                np.testing.assert_array_equal(t, self.T)
+                self.assertEqual(Y.shape, self.U.shape)
+                for u, y in zip(self.U, Y):
+                    _, s, _ = filter_instance.output(u, self.T, plot=False)
+                    np.testing.assert_allclose(y, s, atol=1e-9 * np.max(np.abs(s)))
+
+    def test_layout_and_threads(self):
+        filter_instance = LP(1, 0.3, 6000)
+        _, Y = filter_instance.output_channels(self.U, self.T, plot=False)
+        _, Y0 = filter_instance.output_channels(self.U.T, self.T, axis=0, plot=False)
+        np.testing.assert_allclose(Y0, Y.T, atol=1e-12)
+        _, Y3 = filter_instance.output_channels(
+            self.U.reshape(2, 3, -1), self.T, max_workers=2, plot=False
+        )
+        np.testing.assert_allclose(Y3.reshape(Y.shape), Y, atol=1e-12)
+
+    def test_cached_discretisation(self):
+        filter_instance = BP(1, 0.3, 6000)
+        filter_instance.output_channels(self.U, self.T, plot=False)
+        coefficients = filter_instance._cache["foh"]
+        filter_instance.output_channels(self.U[:2], self.T, plot=False)
+        self.assertIs(filter_instance._cache["foh"], coefficients)
+        # another time step replaces the entry instead of adding one
+        _, y = filter_instance.output_channels(self.U, 2 * self.T, plot=False)
+        self.assertEqual(
+            [key for key in filter_instance._cache if key.startswith("foh")], ["foh"]
+        )
+        np.testing.assert_allclose(
+            y, BP(1, 0.3, 6000).output_channels(self.U, 2 * self.T, plot=False)[1]
+        )
+
+    def test_invalid(self):
+        filter_instance = LP(1, 0.3, 6000)
+        with self.assertRaises(ValueError):
+            filter_instance.output_channels(self.U, self.T[:-1], plot=False)
+        with self.assertRaises(ValueError):
+            filter_instance.output_channels(self.U[:, :3], [0, 1, 3], plot=False)
@@ -0,0 +1,82 @@
+"""Unit tests."""
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from numpy.lib.format import open_memmap
+from SecondOrderElec import FilterBank
+from SecondOrderElec.sweep import Sweep
+
+
+class test_Sweep(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.w = np.logspace(2, 5, 50)
+        self.T = np.linspace(0, 0.01, 40)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def get_sweep(self, filter_type="LP", **kwargs):
+        return Sweep(
+            filter_type,
+            gain=[1, 2],
+            m=np.linspace(0.1, 2, 7),
+            w0=[1000, 6000, 20000],
+            analyses=("freqresp", "step", "pzmap", "metrics"),
+            w=self.w,
+            T=self.T,
+            directory=self.directory,
+            chunk_size=5,
+            **kwargs
+        )
+
+    def check(self, sweep, results):
+        bank = FilterBank(sweep.spec["filter_type"], *sweep.parameters)
+        self.assertEqual(len(bank), 42)
+        np.testing.assert_allclose(results["freqresp"], bank.freqresp(w=self.w)[1])
+        np.testing.assert_allclose(results["step"], bank.step(T=self.T)[1])
+        np.testing.assert_allclose(results["poles"], bank.pzmap()[0])
+        np.testing.assert_allclose(results["Q"], bank.Q)
+        self.assertTrue(np.all(sweep.done))
+
+    def test_in_process(self):
+        sweep = self.get_sweep()
+        calls = []
+        results = sweep.run(max_workers=0, progress=lambda *args: calls.append(args))
+        self.check(sweep, results)
+        self.assertEqual(calls[-1], (42, 42))
+        self.assertEqual(len(calls), sweep.n_chunks)
+
+    def test_process_pool(self):
+        sweep = self.get_sweep("BP")
+        results = sweep.run(max_workers=2)
+        self.check(sweep, results)
+        np.testing.assert_allclose(
+            results["wc2"], FilterBank("BP", *sweep.parameters).wc[:, 1]
+        )
+
+    def test_resume(self):
+        sweep = self.get_sweep()
+        sweep.run(max_workers=0)
+        # simulate an interruption during chunk 3
+        done = open_memmap(sweep.directory + "/done.npy", mode="r+")
+        done[3] = False
+        done.flush()
+        results = sweep.results(mode="r+")
+        results["freqresp"][15:20] = 0
+        results["freqresp"].flush()
+        calls = []
+        resumed = self.get_sweep()
+        results = resumed.run(max_workers=0, progress=lambda *args: calls.append(args))
+        self.assertEqual(calls, [(42, 42)])
+        self.check(resumed, results)
+
+    def test_other_sweep_in_directory(self):
+        self.get_sweep()
+        with self.assertRaises(ValueError):
+            self.get_sweep("BP")
+
+    def test_missing_grid(self):
+        with self.assertRaises(ValueError):
+            Sweep("LP", 1, 0.2, 6000, analyses=("step",))
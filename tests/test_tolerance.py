@@ -0,0 +1,121 @@
+import unittest
+import numpy as np
+from SecondOrderElec import analytic, design, metrics
+from SecondOrderElec.tolerance import Mask, MonteCarlo, Normal, Uniform
+
+
+class test_distributions(unittest.TestCase):
+    def test_uniform(self):
+        analysis = MonteCarlo("LP", {"m": Uniform(0.5, 0.1), "w0": 1000.0})
+        values = analysis.sample(100000, seed=0)
+        self.assertGreaterEqual(values["m"].min(), 0.45)
+        self.assertLessEqual(values["m"].max(), 0.55)
+        self.assertAlmostEqual(np.std(values["m"]), 0.05 / np.sqrt(3), places=3)
+        np.testing.assert_array_equal(values["w0"], 1000.0)
+        np.testing.assert_array_equal(values["gain"], 1.0)
+
+    def test_normal(self):
+        analysis = MonteCarlo("LP", {"m": 0.5, "w0": Normal(1000.0, 0.03)})
+        values = analysis.sample(100000, seed=0)
+        self.assertAlmostEqual(np.mean(values["w0"]), 1000.0, delta=0.5)
+        self.assertAlmostEqual(np.std(values["w0"]), 10.0, delta=0.2)
+
+    def test_correlation(self):
+        analysis = MonteCarlo(
+            "LP",
+            {"m": Normal(0.5, 0.1), "w0": Uniform(1000.0, 0.1)},
+            correlation={("m", "w0"): 0.8},
+        )
+        values = analysis.sample(100000, seed=0)
+        self.assertGreater(np.corrcoef(values["m"], values["w0"])[0, 1], 0.7)
+        with self.assertRaises(ValueError):
+            MonteCarlo(
+                "LP",
+                {"m": Normal(0.5, 0.1), "w0": 1000.0},
+                correlation={("m", "w0"): 0.5},
+            )
+
+    def test_seed(self):
+        analysis = MonteCarlo("LP", {"m": Normal(0.5, 0.1), "w0": 1000.0})
+        np.testing.assert_array_equal(
+            analysis.sample(10, seed=3)["m"], analysis.sample(10, seed=3)["m"]
+        )
+
+
+class test_MonteCarlo(unittest.TestCase):
+    def test_yield(self):
+        analysis = MonteCarlo(
+            "BP",
+            {"m": Uniform(0.5, 0.1), "w0": 1000.0},
+            specs={"m": (0.5, None), "delta_w": (None, 1040.0)},
+        )
+        result = analysis.run(200000, seed=1, chunk_size=30000)
+        self.assertEqual(result.n, 200000)
+        # m in [0.5, 0.52]: 20 % of the samples
+        self.assertAlmostEqual(result.spec_yield["m"], 0.5, delta=0.01)
+        self.assertAlmostEqual(result.yield_, 0.2, delta=0.01)
+        self.assertEqual(result.histograms["m"][0].sum(), 200000)
+
+    def test_topology(self):
+        components = {"R": Normal(100.0, 0.05), "L": 1e-3, "C": Uniform(1e-6, 0.1)}
+        analysis = MonteCarlo(
+            "LP", components, specs={"m": (0.45, 0.55)}, topology="rlc"
+        )
+        values = analysis.sample(1000, seed=0)
+        m, w0 = design.rlc(values["R"], values["L"], values["C"])
+        np.testing.assert_allclose(values["m"], m)
+        np.testing.assert_allclose(values["w0"], w0)
+
+    def test_worst(self):
+        analysis = MonteCarlo(
+            "LP", {"m": Normal(0.5, 0.1), "w0": 1000.0}, specs={"R": (None, 0.2)}
+        )
+        result = analysis.run(50000, seed=2, chunk_size=7000, n_worst=3)
+        rows = result.worst["R"]
+        self.assertEqual(len(rows), 3)
+        self.assertTrue(np.all(np.diff(rows["margin"]) >= 0))
+        # largest overshoot: smallest m
+        values = analysis.sample(7000, seed=np.random.SeedSequence(2).spawn(8)[0])
+        np.testing.assert_allclose(rows["R"], metrics.R(rows["m"]))
+        self.assertLessEqual(rows["m"][0], values["m"].min())
+        # 0.2 overshoot for m = 0.456, 2.6 sigma below the mean
+        self.assertAlmostEqual(result.spec_yield["R"], 0.9955, delta=0.002)
+
+    def test_mask(self):
+        w = np.logspace(2, 4, 20)
+        analysis = MonteCarlo(
+            "LP",
+            {"m": Uniform(0.3, 0.5), "w0": 1000.0},
+            masks=[Mask(w, high=np.where(w < 2000, 3.0, -10.0))],
+        )
+        result = analysis.run(20000, seed=0)
+        values = analysis.sample(20000, seed=np.random.SeedSequence(0).spawn(1)[0])
+        mag = analytic.magnitude_db("LP", 1.0, values["m"][:, np.newaxis], 1000.0, w)
+        expected = np.all(mag <= np.where(w < 2000, 3.0, -10.0), axis=1).mean()
+        self.assertGreater(expected, 0)
+        self.assertLess(expected, 1)
+        self.assertAlmostEqual(result.yield_, expected)
+
+    def test_empty_and_invalid(self):
+        analysis = MonteCarlo("LP", {"m": 0.5, "w0": 1000.0}, specs={"m": (0, 1)})
+        self.assertEqual(analysis.run(0).n, 0)
+        with self.assertRaises(ValueError):
+            MonteCarlo("LP", {"m": 0.5})
+        with self.assertRaises(ValueError):
+            MonteCarlo("LP", {"m": 0.5, "w0": 1.0}, specs={"delta_w": (0, 1)})
+        with self.assertRaises(ValueError):
+            MonteCarlo("LP", {"R": 1.0}, topology="pi")
+
+    def test_process_pool(self):
+        analysis = MonteCarlo(
+            "Notch",
+            {"m": Normal(0.2, 0.1), "w0": Uniform(1000.0, 0.05)},
+            specs={"wc1": (900.0, None)},
+        )
+        local = analysis.run(30000, seed=4, chunk_size=10000)
+        pooled = analysis.run(30000, seed=4, chunk_size=10000, max_workers=2)
+        self.assertEqual(local.passed, pooled.passed)
+        np.testing.assert_array_equal(
+            local.histograms["wc1"][0], pooled.histograms["wc1"][0]
+        )
+        np.testing.assert_array_equal(local.worst["wc1"], pooled.worst["wc1"])
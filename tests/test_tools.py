@@ -0,0 +1,89 @@
+"""Unit tests."""
+import os
+import shutil
+import tempfile
+import unittest
+import numpy as np
+from SecondOrderElec import LP, BP
+from SecondOrderElec.core import General_Second_Order
+from SecondOrderElec.tools import ResultStore, export_csv, export_result
+
+
+class test_export_csv(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_export_csv(self):
+        t, s = LP(1, 0.2, 6000).step(plot=False)
+        filename = os.path.join(self.directory, "step")
+        export_csv([t, s], filename, header="t,s")
+        data = np.loadtxt(filename + ".csv", delimiter=",")
+        np.testing.assert_allclose(data, np.column_stack((t, s)))
+
+
+class test_ResultStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, "result")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_export_result(self):
+        filter_instance = BP(1.1, 0.2, 6000)
+        w, Tjw = filter_instance.freqresp(plot=False)
+        export_result(self.filename, filter_instance, w, Tjw)
+        store = ResultStore(self.filename)
+        self.assertEqual(store.header["filter_type"], "BP")
+        self.assertEqual(store.header["parameters"], {"Tm": 1.1, "m": 0.2, "w0": 6000})
+        self.assertEqual(store.header["axis"], "frequency")
+        data = store.read()
+        self.assertIsInstance(data, np.memmap)
+        np.testing.assert_array_equal(data["w"], w)
+        np.testing.assert_array_equal(data["Tjw"], Tjw)
+        self.assertEqual(data["Tjw"].dtype, np.complex128)
+
+    def test_export_general(self):
+        filter_instance = General_Second_Order([1, 0, 3], [1, 0.2, 4])
+        w, Tjw = filter_instance.freqresp(plot=False)
+        export_result(self.filename, filter_instance, w, Tjw)
+        store = ResultStore(self.filename)
+        self.assertEqual(store.header["filter_type"], "second_order")
+        rebuilt = General_Second_Order(**store.header["parameters"])
+        np.testing.assert_array_equal(rebuilt.num, filter_instance.num)
+        np.testing.assert_array_equal(rebuilt.den, filter_instance.den)
+        np.testing.assert_allclose(
+            rebuilt.freqresp(w=store.read()["w"], plot=False)[1], store.read()["Tjw"]
+        )
+
+    def test_append(self):
+        store = ResultStore.create(
+            self.filename, [("t", "float64"), ("s", "float64")], axis="time"
+        )
+        self.assertEqual(len(store), 0)
+        self.assertEqual(len(store.read()), 0)
+        t = np.linspace(0, 1, 1000)
+        for chunk in np.array_split(np.arange(1000), 4):
+            store.append(t[chunk], np.sin(t[chunk]))
+        store = ResultStore(self.filename)
+        self.assertEqual(len(store), 1000)
+        np.testing.assert_array_equal(store.read()["s"], np.sin(t))
+        with self.assertRaises(ValueError):
+            store.append(t)
+
+    def test_to_csv(self):
+        filter_instance = LP(1, 0.2, 6000)
+        w, Tjw = filter_instance.freqresp(w=np.logspace(2, 5, 100), plot=False)
+        store = export_result(self.filename, filter_instance, w, Tjw)
+        store.to_csv(self.filename, chunk_size=30)
+        data = np.loadtxt(self.filename + ".csv", delimiter=",")
+        np.testing.assert_allclose(data, np.column_stack((w, Tjw.real, Tjw.imag)))
+
+    def test_not_a_store(self):
+        with open(self.filename + ".soe", "wb") as f:
+            f.write(b"something else")
+        with self.assertRaises(ValueError):
+            ResultStore(self.filename)